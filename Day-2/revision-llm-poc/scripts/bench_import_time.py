@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+"""
+Import-time benchmark for the API entrypoint.
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter,
+parses the per-module timings written to stderr, and fails if the total
+cold-start import time exceeds a budget or a provider SDK sneaks into the
+import graph.
+
+Run from project root:
+
+    python scripts/bench_import_time.py
+    python scripts/bench_import_time.py --budget-ms 800 --top 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# SDKs that must only be imported when their provider is selected.
+FORBIDDEN_MODULES = ("openai", "httpx")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure(module: str = "app.main") -> list[tuple[str, int, int]]:
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+
+    Returns (module_name, cumulative_us, depth) for every imported module.
+    Depth 0 rows are the top-level imports, so summing their cumulative
+    times gives the total import cost.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(PROJECT_ROOT / "src"), env.get("PYTHONPATH", "")]
+    ).rstrip(os.pathsep)
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=PROJECT_ROOT,
+        check=True,
+    )
+
+    rows: list[tuple[str, int, int, int]] = []  # (name, self_us, cumulative_us, indent)
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent)))
+
+    # Interpreter startup (site, encodings, ...) is reported first; keep only
+    # what our import statement triggered. The shallowest indent is top level.
+    min_indent = min((row[3] for row in rows), default=0)
+    site_idx = [i for i, row in enumerate(rows) if row[0] == "site" and row[3] == min_indent]
+    if site_idx:
+        rows = rows[site_idx[-1] + 1 :]
+    return [(name, cumulative, (indent - min_indent) // 2) for name, _, cumulative, indent in rows]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the API entrypoint.")
+    parser.add_argument("--module", default="app.main", help="Module to import.")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500")),
+        help="Fail if total import time exceeds this many milliseconds.",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest imports.")
+    args = parser.parse_args()
+
+    rows = measure(args.module)
+    top_level = [row for row in rows if row[2] == 0]
+    total_ms = sum(cumulative for _, cumulative, _ in top_level) / 1000
+
+    print(f"Import of {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, cumulative, _ in sorted(top_level, key=lambda r: r[1], reverse=True)[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    leaked = sorted({name.split(".")[0] for name, _, _ in rows} & set(FORBIDDEN_MODULES))
+    if leaked:
+        print(f"FAIL: provider SDKs imported eagerly: {', '.join(leaked)}")
+        return 1
+    if total_ms > args.budget_ms:
+        print("FAIL: import time over budget.")
+        return 1
+
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,21 +18,84 @@ and that your .env is set up:
 """
 
 import logging
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI
+from fastapi.responses import StreamingResponse
 
 from config.logging import setup_logging
 from config.settings import Settings, get_settings
+from core.cache import get_explanation_cache
 from core.llm_client import LLMClient
-from core.models import ExplainRequest, ExplainResponse
+from core.models import ExplainBatchRequest, ExplainRequest, ExplainResponse
 from core.services import ExplanationService
 
 
-# Initialize settings and logging once at import time.
-_settings: Settings = get_settings()
-setup_logging(_settings)
+def _start_warmup(settings: Settings) -> threading.Event | None:
+    """
+    Load the precomputed explanation snapshot into the cache and, if enabled,
+    keep filling it from the topic catalogue in a background thread.
+
+    Returns a stop event for the background warmup (None if not started).
+    """
+    if not settings.explain_cache_snapshot_path:
+        return None
+
+    # Imported here so the warmup machinery is only loaded when configured.
+    from core.warmup import WarmupCheckpoint, load_catalogue, run_warmup
+
+    cache = get_explanation_cache()
+    checkpoint = WarmupCheckpoint(settings.explain_cache_snapshot_path)
+    loaded = checkpoint.load_into(cache, max_age_seconds=settings.explain_cache_ttl_seconds)
+    logging.getLogger(__name__).info("Loaded %d precomputed explanations into cache.", loaded)
+
+    if not (settings.warmup_on_startup and settings.warmup_catalogue_path):
+        return None
+
+    stop_event = threading.Event()
+    llm_client = LLMClient(settings=settings)
+    service = ExplanationService(llm_client=llm_client, cache=cache)
+    thread = threading.Thread(
+        target=run_warmup,
+        kwargs={
+            "service": service,
+            "provider_name": llm_client.provider_name(),
+            "topics": load_catalogue(settings.warmup_catalogue_path),
+            "checkpoint": checkpoint,
+            "detail_levels": [lvl.strip() for lvl in settings.warmup_detail_levels.split(",")],
+            "max_concurrency": settings.warmup_max_concurrency,
+            "rate_per_second": settings.warmup_rate_per_second,
+            "stop_event": stop_event,
+            "max_age_seconds": settings.explain_cache_ttl_seconds,
+        },
+        name="explanation-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return stop_event
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """
+    Initialize settings and logging once when the server starts.
+
+    This used to run at import time; doing it at startup keeps `import app.main`
+    cheap for container cold starts and test collection.
+    Also loads/starts the optional explanation cache warmup.
+    """
+    settings = get_settings()
+    setup_logging(settings)
+    stop_warmup = _start_warmup(settings)
+    yield
+    if stop_warmup is not None:
+        stop_warmup.set()
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="Revision LLM PoC",
     version="0.1.0",
     description=(
@@ -42,15 +105,20 @@ app = FastAPI(
 )
 
 
-def get_explanation_service() -> ExplanationService:
+def get_explanation_service(settings: Settings = Depends(get_settings)) -> ExplanationService:
     """
     FastAPI dependency that provides an ExplanationService instance.
 
     We build it from environment-based settings so configuration is centralized
     and consistent with the rest of the app.
     """
-    llm_client = LLMClient(settings=_settings)
-    return ExplanationService(llm_client=llm_client)
+    llm_client = LLMClient(settings=settings)
+    return ExplanationService(
+        llm_client=llm_client,
+        cache=get_explanation_cache(),
+        batch_max_concurrency=settings.batch_max_concurrency,
+        batch_pack_size=settings.batch_pack_size,
+    )
 
 
 @app.post(
@@ -78,6 +146,32 @@ def explain_topic(
     return service.generate_explanation(request)
 
 
+@app.post(
+    "/api/v1/explain/batch",
+    summary="Generate explanations for a list of topics, streamed as NDJSON.",
+    response_class=StreamingResponse,
+)
+def explain_topics_batch(
+    request: ExplainBatchRequest,
+    service: ExplanationService = Depends(get_explanation_service),
+) -> StreamingResponse:
+    """
+    Accept a list of topics and stream one ExplainResponse JSON object per line.
+
+    - Duplicate topics are explained once.
+    - Cached topics are streamed first, without an LLM call.
+    - The rest run with bounded parallelism; short explanations are packed
+      several topics per LLM call. Lines arrive in completion order.
+    """
+    logging.getLogger(__name__).info(
+        "HTTP request received for /api/v1/explain/batch topics=%d detail_level=%s",
+        len(request.topics),
+        request.detail_level,
+    )
+    lines = (item.model_dump_json() + "\n" for item in service.generate_batch(request))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
 @app.get("/health", tags=["health"])
 def health() -> dict:
     """
@@ -38,6 +38,22 @@ class Settings(BaseSettings):
     hf_token: Optional[str] = None
     grok_model: Optional[str] = None
 
+    # Explanation cache (in-process)
+    explain_cache_max_entries: int = 1024
+    explain_cache_ttl_seconds: int = 86400
+
+    # Batch explain endpoint
+    batch_max_concurrency: int = 4
+    batch_pack_size: int = 5
+
+    # Cache warmup / precompute (see core/warmup.py)
+    explain_cache_snapshot_path: Optional[str] = None
+    warmup_on_startup: bool = False
+    warmup_catalogue_path: Optional[str] = None
+    warmup_detail_levels: str = "short"
+    warmup_max_concurrency: int = 2
+    warmup_rate_per_second: float = 1.0
+
     class Config:
         # Load variables from .env file in local/dev environments.
         env_file = ".env"
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+"""
+In-process explanation cache.
+
+ExplanationCache is a small thread-safe LRU + TTL cache for ExplainResponse
+objects. It lets repeated topics (and topics pasted twice into a batch)
+skip the LLM call entirely.
+
+Keys are built from the normalized topic, the detail level and the provider
+name, so switching providers never serves another provider's answer.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable
+
+from config.settings import get_settings
+from core.models import ExplainResponse
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_topic(topic: str) -> str:
+    """Normalize a topic for dedupe/cache purposes (trim, collapse spaces, casefold)."""
+    return " ".join(topic.split()).casefold()
+
+
+class ExplanationCache:
+    """Bounded LRU cache with a per-entry TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, ExplainResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(topic: str, detail_level: str, provider: str) -> str:
+        """Build a cache key for a topic / detail level / provider triple."""
+        return f"{provider}:{detail_level}:{normalize_topic(topic)}"
+
+    def get(self, key: str) -> ExplainResponse | None:
+        """Return the cached response, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: ExplainResponse, ttl_seconds: float | None = None) -> None:
+        """
+        Store a response, evicting the least recently used entry when full.
+
+        ttl_seconds overrides the cache-wide TTL for this entry (e.g. the
+        remaining lifetime of a response restored from disk); a non-positive
+        value means the entry is already expired and is not stored.
+        """
+        ttl = self._ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+@lru_cache
+def get_explanation_cache() -> ExplanationCache:
+    """
+    Return the process-wide ExplanationCache.
+
+    Like get_settings(), lru_cache makes this a per-process singleton so every
+    request (and the batch endpoint) shares the same cache.
+    """
+    settings = get_settings()
+    logger.info(
+        "Initializing ExplanationCache max_entries=%s ttl_seconds=%s",
+        settings.explain_cache_max_entries,
+        settings.explain_cache_ttl_seconds,
+    )
+    return ExplanationCache(
+        max_entries=settings.explain_cache_max_entries,
+        ttl_seconds=settings.explain_cache_ttl_seconds,
+    )
@@ -11,15 +11,20 @@ This module defines:
 - LLMClient: facade that chooses a provider based on Settings.
 
 The rest of the app talks only to LLMClient.generate_text(), not directly
-to provider-specific SDKs. This is exactly the OOP + abstraction pattern
+to provider-specific SDKs. A failed provider call raises LLMProviderError,
+which carries a deterministic fallback answer the caller may show but must
+not cache. This is exactly the OOP + abstraction pattern
 you want in LLM-heavy backends.
+
+Providers are registered by name in a small registry. Provider SDKs
+(openai, httpx) are imported inside the provider that needs them, so
+importing this module - or running with the mock provider - never pays
+for an SDK import. This keeps container cold starts and test collection fast.
 """
 
 import logging
 from abc import ABC, abstractmethod
-
-import httpx
-from openai import OpenAI
+from typing import Callable
 
 from config.settings import Settings, get_settings
 
@@ -27,22 +32,68 @@ from config.settings import Settings, get_settings
 logger = logging.getLogger(__name__)
 
 
+# Completion budget when the caller does not ask for one (a single explanation).
+DEFAULT_MAX_TOKENS = 256
+
+# Registry of provider name -> provider class. Populated via @register_provider.
+_PROVIDERS: dict[str, type["BaseLLMProvider"]] = {}
+
+
+def register_provider(name: str) -> Callable[[type["BaseLLMProvider"]], type["BaseLLMProvider"]]:
+    """
+    Class decorator that registers a provider under a short name.
+
+    The name is what LLMClient selects on and what provider_name() reports.
+    """
+
+    def decorator(cls: type["BaseLLMProvider"]) -> type["BaseLLMProvider"]:
+        cls.name = name
+        _PROVIDERS[name] = cls
+        return cls
+
+    return decorator
+
+
+class LLMProviderError(RuntimeError):
+    """
+    A provider call failed (network, auth, server down, ...).
+
+    `fallback_text` is a safe mock-style answer callers can return instead,
+    so the API stays usable; it must never be cached or checkpointed.
+    """
+
+    def __init__(self, message: str, fallback_text: str) -> None:
+        super().__init__(message)
+        self.fallback_text = fallback_text
+
+
+def available_providers() -> list[str]:
+    """Return the names of all registered providers."""
+    return sorted(_PROVIDERS)
+
+
 class BaseLLMProvider(ABC):
     """Abstract base class for all LLM providers."""
 
+    name: str = "unknown"
+    # True if the provider reliably follows "answer as JSON" instructions,
+    # which lets callers pack several short requests into one call.
+    supports_json_output: bool = False
+
     @abstractmethod
-    def generate_text(self, prompt: str) -> str:
-        """Generate text from the given prompt."""
+    def generate_text(self, prompt: str, max_tokens: int | None = None) -> str:
+        """Generate text from the given prompt (at most `max_tokens`, default DEFAULT_MAX_TOKENS)."""
         raise NotImplementedError
 
 
+@register_provider("mock")
 class MockLLMProvider(BaseLLMProvider):
     """Simple deterministic LLM provider for local/dev use."""
 
-    def __init__(self, logger: logging.Logger | None = None) -> None:
+    def __init__(self, settings: Settings | None = None, logger: logging.Logger | None = None) -> None:
         self._logger = logger or logging.getLogger(self.__class__.__name__)
 
-    def generate_text(self, prompt: str) -> str:
+    def generate_text(self, prompt: str, max_tokens: int | None = None) -> str:
         """
         Return a deterministic response which is safe for local runs and tests.
 
@@ -52,30 +103,36 @@ class MockLLMProvider(BaseLLMProvider):
         return f"MOCK_LLM_RESPONSE for: {prompt[:80]}"
 
 
+@register_provider("openai")
 class OpenAILLMProvider(BaseLLMProvider):
     """OpenAI-backed LLM provider implementation."""
 
+    supports_json_output = True
+
     def __init__(self, settings: Settings, logger: logging.Logger | None = None) -> None:
         if not settings.openai_api_key:
             raise ValueError("OpenAI API key is required for OpenAILLMProvider.")
         self._logger = logger or logging.getLogger(self.__class__.__name__)
+        # Imported lazily: the openai SDK is heavy and only needed for this provider.
+        from openai import OpenAI
+
         # OpenAI client from the openai>=1.x SDK
         self._client = OpenAI(api_key=settings.openai_api_key)
         self._model = settings.openai_model
 
-    def generate_text(self, prompt: str) -> str:
+    def generate_text(self, prompt: str, max_tokens: int | None = None) -> str:
         """
         Call OpenAI Chat Completions API with basic parameters.
 
-        Any error during the call is logged and we fall back to a deterministic
-        mock-style response to keep the service reliable.
+        Any error during the call is logged and raised as LLMProviderError,
+        carrying a deterministic mock-style fallback answer.
         """
         self._logger.info("Calling OpenAI model %s", self._model)
         try:
             response = self._client.chat.completions.create(
                 model=self._model,
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=256,
+                max_tokens=max_tokens or DEFAULT_MAX_TOKENS,
                 temperature=0.2,
             )
             message = response.choices[0].message
@@ -87,9 +144,13 @@ class OpenAILLMProvider(BaseLLMProvider):
             return str(content)
         except Exception as exc:  # noqa: BLE001
             self._logger.error("OpenAI call failed, falling back to mock. Error: %s", exc)
-            return f"MOCK_LLM_RESPONSE (fallback-openai) for: {prompt[:80]}"
+            raise LLMProviderError(
+                f"OpenAI call failed: {exc}",
+                fallback_text=f"MOCK_LLM_RESPONSE (fallback-openai) for: {prompt[:80]}",
+            ) from exc
 
 
+@register_provider("ollama")
 class LocalOllamaProvider(BaseLLMProvider):
     """
     Provider implementation for a local Ollama server.
@@ -98,20 +159,24 @@ class LocalOllamaProvider(BaseLLMProvider):
     and exposes the /api/generate endpoint.
     """
 
+    supports_json_output = True
+
     def __init__(self, settings: Settings, logger: logging.Logger | None = None) -> None:
         self._logger = logger or logging.getLogger(self.__class__.__name__)
         self._base_url = settings.ollama_base_url
         self._model = settings.ollama_model
 
-    def generate_text(self, prompt: str) -> str:
+    def generate_text(self, prompt: str, max_tokens: int | None = None) -> str:
         """
         Call the local Ollama HTTP API to generate text.
 
         If the call fails (server not running, network error, etc.), we log the
-        error and fall back to a deterministic mock-style response.
+        error and raise LLMProviderError with a deterministic fallback answer.
         """
         self._logger.info("Calling local Ollama model %s at %s", self._model, self._base_url)
         try:
+            import httpx  # imported lazily, only when Ollama is actually used
+
             with httpx.Client(base_url=self._base_url, timeout=60.0) as client:
                 response = client.post(
                     "/api/generate",
@@ -119,6 +184,7 @@ class LocalOllamaProvider(BaseLLMProvider):
                         "model": self._model,
                         "prompt": prompt,
                         "stream": False,
+                        "options": {"num_predict": max_tokens or DEFAULT_MAX_TOKENS},
                     },
                 )
                 response.raise_for_status()
@@ -127,7 +193,10 @@ class LocalOllamaProvider(BaseLLMProvider):
                 return str(text)
         except Exception as exc:  # noqa: BLE001
             self._logger.error("Ollama call failed, falling back to mock. Error: %s", exc)
-            return f"MOCK_LLM_RESPONSE (fallback-ollama) for: {prompt[:80]}"
+            raise LLMProviderError(
+                f"Ollama call failed: {exc}",
+                fallback_text=f"MOCK_LLM_RESPONSE (fallback-ollama) for: {prompt[:80]}",
+            ) from exc
 
 
 class LLMClient:
@@ -148,32 +217,40 @@ class LLMClient:
         self._logger = logger or logging.getLogger(self.__class__.__name__)
         self._provider: BaseLLMProvider = self._select_provider()
 
-    def _select_provider(self) -> BaseLLMProvider:
-        """Select the appropriate provider based on configuration."""
+    def _select_provider_name(self) -> str:
+        """Select the provider name based on configuration."""
         # Prefer Ollama explicitly if configured
         if getattr(self._settings, "use_ollama", False):
-            self._logger.info("Initializing LocalOllamaProvider (USE_OLLAMA=true).")
-            return LocalOllamaProvider(settings=self._settings, logger=self._logger)
+            self._logger.info("Selecting ollama provider (USE_OLLAMA=true).")
+            return "ollama"
 
         # Otherwise prefer OpenAI when key is available
         if self._settings.openai_api_key:
-            self._logger.info("Initializing OpenAILLMProvider (OPENAI_API_KEY present).")
-            return OpenAILLMProvider(settings=self._settings, logger=self._logger)
+            self._logger.info("Selecting openai provider (OPENAI_API_KEY present).")
+            return "openai"
 
         # Fallback: mock provider
         self._logger.warning(
             "No provider configured (no USE_OLLAMA and no OPENAI_API_KEY); "
             "using MockLLMProvider instead."
         )
-        return MockLLMProvider(logger=self._logger)
+        return "mock"
+
+    def _select_provider(self) -> BaseLLMProvider:
+        """Instantiate the selected provider from the registry."""
+        name = self._select_provider_name()
+        provider_cls = _PROVIDERS[name]
+        self._logger.info("Initializing %s.", provider_cls.__name__)
+        return provider_cls(settings=self._settings, logger=self._logger)
 
-    def generate_text(self, prompt: str) -> str:
+    def generate_text(self, prompt: str, max_tokens: int | None = None) -> str:
         """
         Generate text from the given prompt using the selected provider.
 
         Callers do not need to know which provider is used underneath.
+        Raises LLMProviderError if the provider call failed.
         """
-        return self._provider.generate_text(prompt)
+        return self._provider.generate_text(prompt, max_tokens=max_tokens)
 
     def provider_name(self) -> str:
         """
@@ -181,11 +258,8 @@ class LLMClient:
 
         This is useful for logging, metrics, and API responses.
         """
-        # Imports above in this file define these classes already.
-        if isinstance(self._provider, LocalOllamaProvider):
-            return "ollama"
-        if isinstance(self._provider, OpenAILLMProvider):
-            return "openai"
-        if isinstance(self._provider, MockLLMProvider):
-            return "mock"
-        return "unknown"
+        return self._provider.name
+
+    def supports_json_output(self) -> bool:
+        """Return True if the selected provider can answer packed JSON prompts."""
+        return self._provider.supports_json_output
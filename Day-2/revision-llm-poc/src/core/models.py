@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Literal
+from typing import List, Literal
 
 from pydantic import BaseModel, Field
 
@@ -27,11 +27,34 @@ class ExplainResponse(BaseModel):
     Response payload from the explanation endpoint.
 
     It contains the topic, generated explanation text, and the provider name.
+    `fallback` is True when the provider failed and the explanation is a
+    placeholder (such answers are never cached).
     """
 
     topic: str
     explanation: str
     provider: str
+    cached: bool = False
+    fallback: bool = False
+
+
+class ExplainBatchRequest(BaseModel):
+    """
+    Request payload for the batch explanation endpoint.
+
+    Topics are deduplicated (case/whitespace-insensitive) before any LLM call.
+    """
+
+    topics: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="List of Python/GenAI topics to explain.",
+    )
+    detail_level: Literal["short", "detailed"] = Field(
+        "short",
+        description="Controls how verbose each explanation should be.",
+    )
 
 @dataclass
 class ExplanationContext:
@@ -12,16 +12,28 @@ It:
 - builds a prompt for the LLM,
 - calls LLMClient,
 - wraps the result into a response model.
+
+It also serves batches of topics: duplicates are removed, cached topics are
+returned immediately, and the rest run with bounded parallelism. For short
+explanations several topics are packed into one LLM call.
 """
 
+import json
 import logging
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from core.llm_client import LLMClient
-from core.models import ExplainRequest, ExplainResponse, ExplanationContext
+from core.cache import ExplanationCache, normalize_topic
+from core.llm_client import DEFAULT_MAX_TOKENS, LLMClient, LLMProviderError
+from core.models import ExplainBatchRequest, ExplainRequest, ExplainResponse, ExplanationContext
 
 
 logger = logging.getLogger(__name__)
 
+# Completion budget for a packed call: 3-4 short bullets per topic plus the JSON wrapper.
+_PACKED_TOKENS_PER_ITEM = 80
+_PACKED_TOKENS_OVERHEAD = 20
+
 
 class ExplanationService:
     """
@@ -32,14 +44,24 @@ class ExplanationService:
     interpret responses.
     """
 
-    def __init__(self, llm_client: LLMClient) -> None:
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        cache: ExplanationCache | None = None,
+        batch_max_concurrency: int = 4,
+        batch_pack_size: int = 5,
+    ) -> None:
         """
         Initialize the service with a concrete LLMClient instance.
 
         In production, the LLMClient is built from environment-based settings.
         In tests, we can inject a fake or preconfigured LLMClient.
+        The cache is optional; without it every call goes to the LLM.
         """
         self._llm_client = llm_client
+        self._cache = cache
+        self._batch_max_concurrency = max(1, batch_max_concurrency)
+        self._batch_pack_size = max(1, batch_pack_size)
         self._logger = logging.getLogger(self.__class__.__name__)
 
     def generate_explanation(self, request: ExplainRequest) -> ExplainResponse:
@@ -51,6 +73,8 @@ class ExplanationService:
         - Build a prompt based on the context (topic + detail level).
         - Call the LLM client to get the explanation text.
         - Wrap the result into an ExplainResponse, including provider name.
+          If the provider failed, its fallback text is returned with
+          fallback=True and is not cached.
         """
         # Map external request model to internal context object.
         ctx = ExplanationContext(
@@ -58,20 +82,128 @@ class ExplanationService:
             detail_level=request.detail_level,
         )
 
+        cached = self._get_cached(ctx)
+        if cached is not None:
+            return cached
+
         prompt = self._build_prompt(ctx)
         self._logger.info("Generating explanation for topic=%s", ctx.topic)
 
-        explanation_text = self._llm_client.generate_text(prompt)
+        return self._store(ctx, *self._generate(prompt))
+
+    def generate_batch(self, request: ExplainBatchRequest) -> Iterator[ExplainResponse]:
+        """
+        Generate explanations for a list of topics, yielding each as soon as it is ready.
+
+        Flow:
+        - Dedupe topics (case/whitespace-insensitive, first spelling wins).
+        - Yield cached topics immediately.
+        - Run the rest on a bounded thread pool. For detail_level="short" and a
+          provider that supports JSON output, several topics share one LLM call.
+        """
+        pending: list[ExplanationContext] = []
+        seen: set[str] = set()
+        for topic in request.topics:
+            normalized = normalize_topic(topic)
+            if not normalized or normalized in seen:
+                continue
+            seen.add(normalized)
+            ctx = ExplanationContext(topic=topic.strip(), detail_level=request.detail_level)
+            cached = self._get_cached(ctx)
+            if cached is not None:
+                yield cached
+            else:
+                pending.append(ctx)
+
+        if not pending:
+            return
+
+        pack = (
+            request.detail_level == "short"
+            and self._batch_pack_size > 1
+            and self._llm_client.supports_json_output()
+        )
+        size = self._batch_pack_size if pack else 1
+        chunks = [pending[i : i + size] for i in range(0, len(pending), size)]
+        self._logger.info(
+            "Batch explain: %d unique topics, %d cached, %d LLM tasks (packed=%s)",
+            len(seen),
+            len(seen) - len(pending),
+            len(chunks),
+            pack,
+        )
+
+        with ThreadPoolExecutor(max_workers=self._batch_max_concurrency) as pool:
+            futures = [pool.submit(self._explain_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    # Internal helpers
+    # ----------------
+
+    def _cache_key(self, ctx: ExplanationContext) -> str:
+        return ExplanationCache.make_key(ctx.topic, ctx.detail_level, self._llm_client.provider_name())
+
+    def _get_cached(self, ctx: ExplanationContext) -> ExplainResponse | None:
+        if self._cache is None:
+            return None
+        cached = self._cache.get(self._cache_key(ctx))
+        if cached is None:
+            return None
+        self._logger.info("Explanation cache HIT for topic=%s", ctx.topic)
+        return cached.model_copy(update={"topic": ctx.topic, "cached": True})
+
+    def _generate(self, prompt: str, max_tokens: int | None = None) -> tuple[str, bool]:
+        """Return (text, fallback); a failed provider call yields its fallback text."""
+        try:
+            return self._llm_client.generate_text(prompt, max_tokens=max_tokens), False
+        except LLMProviderError as exc:
+            return exc.fallback_text, True
+
+    def _store(self, ctx: ExplanationContext, explanation_text: str, fallback: bool = False) -> ExplainResponse:
         provider_name = self._llm_client.provider_name()
 
         # For observability, only log a short preview.
         self._logger.debug("Explanation provider=%s preview=%s", provider_name, explanation_text[:80])
 
-        return ExplainResponse(
+        response = ExplainResponse(
             topic=ctx.topic,
             explanation=explanation_text,
             provider=provider_name,
+            fallback=fallback,
         )
+        # A fallback must not sit in the cache under the real provider's key
+        # for the whole TTL: the next request should try the provider again.
+        if self._cache is not None and not fallback:
+            self._cache.set(self._cache_key(ctx), response)
+        return response
+
+    def _explain_chunk(self, chunk: list[ExplanationContext]) -> list[ExplainResponse]:
+        """Explain one chunk of topics: a single call, or one packed call with per-topic fallback."""
+        if len(chunk) == 1:
+            ctx = chunk[0]
+            return [self._store(ctx, *self._generate(self._build_prompt(ctx)))]
+
+        # A single-topic budget would cut the JSON object off mid-way, and every
+        # topic would then be retried on its own (N+1 calls instead of 1).
+        max_tokens = max(DEFAULT_MAX_TOKENS, _PACKED_TOKENS_PER_ITEM * len(chunk) + _PACKED_TOKENS_OVERHEAD)
+        raw, fallback = self._generate(self._build_packed_prompt(chunk), max_tokens=max_tokens)
+        if fallback:
+            # The provider is failing: per-topic retries would fail too, so every
+            # topic gets the provider's fallback text (never cached).
+            return [self._store(ctx, raw, fallback=True) for ctx in chunk]
+        parsed = self._parse_packed_response(raw, len(chunk))
+
+        results: list[ExplainResponse] = []
+        for index, ctx in enumerate(chunk, start=1):
+            text = parsed.get(index)
+            if text is None:
+                # Missing/invalid item in the packed answer: explain it on its own.
+                self._logger.warning("Packed response missing topic=%s; retrying individually", ctx.topic)
+                results.append(self._store(ctx, *self._generate(self._build_prompt(ctx))))
+            else:
+                results.append(self._store(ctx, text))
+        return results
 
     @staticmethod
     def _build_prompt(ctx: ExplanationContext) -> str:
@@ -95,3 +227,48 @@ class ExplanationService:
             f"Instruction: {detail_instruction}\n\n"
             "Answer clearly and in plain language."
         )
+
+    @staticmethod
+    def _build_packed_prompt(chunk: list[ExplanationContext]) -> str:
+        """
+        Build one prompt that asks for short explanations of several topics.
+
+        Topics are numbered so the answer can be split back per topic.
+        """
+        numbered = "\n".join(f"{i}. {ctx.topic}" for i, ctx in enumerate(chunk, start=1))
+        return (
+            "You are a senior Python and GenAI mentor.\n\n"
+            f"Topics:\n{numbered}\n\n"
+            "Instruction: Explain each topic in 3–4 concise bullet points, "
+            "clearly and in plain language.\n\n"
+            "Return ONLY a JSON object mapping each topic number (as a string) to its "
+            'explanation text, for example {"1": "...", "2": "..."}.'
+        )
+
+    @staticmethod
+    def _parse_packed_response(raw: str, expected: int) -> dict[int, str]:
+        """
+        Split a packed JSON answer back into {topic_number: explanation}.
+
+        Tolerates surrounding prose or code fences. Items that are missing,
+        empty or not strings are left out so the caller can retry them.
+        """
+        start, end = raw.find("{"), raw.rfind("}")
+        if start == -1 or end <= start:
+            return {}
+        try:
+            data = json.loads(raw[start : end + 1])
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(data, dict):
+            return {}
+
+        parsed: dict[int, str] = {}
+        for key, value in data.items():
+            try:
+                index = int(key)
+            except (TypeError, ValueError):
+                continue
+            if 1 <= index <= expected and isinstance(value, str) and value.strip():
+                parsed[index] = value.strip()
+        return parsed
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+"""
+Explanation cache warmup (precompute) for a known topic catalogue.
+
+Interview topics are known in advance, so we can pay the LLM latency once,
+before users arrive, instead of on their first request.
+
+Pieces:
+- load_catalogue(): read topics from a .txt (one per line, '#' comments) or
+  .json (list of strings) file.
+- WarmupCheckpoint: append-only JSONL file of generated explanations. It is
+  both the resume checkpoint (fresh topics already in it are skipped) and the
+  persistent snapshot the API loads into its cache on startup. Each run
+  compacts it first, dropping expired and superseded lines.
+- RateLimiter: spaces LLM calls out to at most N per second across threads.
+- run_warmup(): generate missing explanations with bounded concurrency.
+
+CLI (from project root, with src on PYTHONPATH):
+
+    python -m core.warmup --catalogue topics.txt --checkpoint .cache/explanations.jsonl \
+        --detail-level short --concurrency 4 --rate 2
+
+Re-running the same command resumes where the last run stopped.
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from core.cache import ExplanationCache, normalize_topic
+from core.models import ExplainRequest, ExplainResponse
+from core.services import ExplanationService
+
+
+logger = logging.getLogger(__name__)
+
+
+def load_catalogue(path: str | Path) -> list[str]:
+    """
+    Load topics from a catalogue file.
+
+    - *.json: a JSON list of topic strings.
+    - anything else: one topic per line; blank lines and '#' comments are ignored.
+    Duplicates (case/whitespace-insensitive) are dropped, first spelling wins.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        raw_topics = json.loads(text)
+        if not isinstance(raw_topics, list):
+            raise ValueError(f"Catalogue {path} must contain a JSON list of topics.")
+    else:
+        raw_topics = [line for line in text.splitlines() if not line.lstrip().startswith("#")]
+
+    topics: list[str] = []
+    seen: set[str] = set()
+    for topic in raw_topics:
+        topic = str(topic).strip()
+        normalized = normalize_topic(topic)
+        if normalized and normalized not in seen:
+            seen.add(normalized)
+            topics.append(topic)
+    return topics
+
+
+class RateLimiter:
+    """Thread-safe limiter allowing at most `rate_per_second` acquisitions per second."""
+
+    def __init__(self, rate_per_second: float) -> None:
+        self._interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the next call slot is available."""
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+_RECORD_FIELDS = ("topic", "detail_level", "explanation", "provider")
+
+
+class WarmupCheckpoint:
+    """
+    Append-only JSONL file of generated explanations.
+
+    Each line: {"topic", "detail_level", "explanation", "provider", "created_at"}.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(topic: str, detail_level: str, provider: str) -> str:
+        return ExplanationCache.make_key(topic, detail_level, provider)
+
+    def records(self, max_age_seconds: float | None = None) -> Iterable[dict]:
+        """Yield valid records, skipping corrupt lines and (optionally) stale ones."""
+        if not self._path.exists():
+            return
+        now = time.time()
+        with self._path.open(encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a partial last line; ignore it.
+                    continue
+                if not isinstance(record, dict) or not all(k in record for k in _RECORD_FIELDS):
+                    continue
+                if max_age_seconds is not None and now - record.get("created_at", 0) > max_age_seconds:
+                    continue
+                yield record
+
+    def done_keys(self, max_age_seconds: float | None = None) -> set[str]:
+        """
+        Return cache keys of everything already generated (and, optionally, not stale).
+
+        Use the same max age as load_into(): an entry too old to be loaded
+        into the cache must be regenerated, not skipped.
+        """
+        return {
+            self._key(r["topic"], r["detail_level"], r["provider"])
+            for r in self.records(max_age_seconds=max_age_seconds)
+        }
+
+    def compact(self, max_age_seconds: float | None = None) -> int:
+        """
+        Rewrite the file with only the newest fresh record per key; returns how many were kept.
+
+        The new file is written next to the old one and swapped in with
+        os.replace(), so a crash mid-compaction leaves the old file intact.
+        """
+        latest: dict[str, dict] = {}
+        for record in self.records(max_age_seconds=max_age_seconds):
+            key = self._key(record["topic"], record["detail_level"], record["provider"])
+            if key not in latest or record.get("created_at", 0) >= latest[key].get("created_at", 0):
+                latest[key] = record
+        if not self._path.exists():
+            return 0
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        with self._lock:
+            with tmp_path.open("w", encoding="utf-8") as fh:
+                for record in latest.values():
+                    fh.write(json.dumps(record) + "\n")
+            os.replace(tmp_path, self._path)
+        return len(latest)
+
+    def append(self, response: ExplainResponse, detail_level: str) -> None:
+        """Append one generated explanation (flushed immediately for crash safety)."""
+        record = {
+            "topic": response.topic,
+            "detail_level": detail_level,
+            "explanation": response.explanation,
+            "provider": response.provider,
+            "created_at": time.time(),
+        }
+        with self._lock:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(record) + "\n")
+
+    def load_into(self, cache: ExplanationCache, max_age_seconds: float | None = None) -> int:
+        """
+        Load records into the cache; returns how many entries were loaded.
+
+        With max_age_seconds, each entry only lives for what is left of that
+        age (max_age - (now - created_at)), so a restart never extends the
+        lifetime of an old answer to a full TTL.
+        """
+        loaded = 0
+        now = time.time()
+        for record in self.records(max_age_seconds=max_age_seconds):
+            key = self._key(record["topic"], record["detail_level"], record["provider"])
+            ttl_seconds = None
+            if max_age_seconds is not None:
+                ttl_seconds = max_age_seconds - (now - record.get("created_at", 0))
+            cache.set(
+                key,
+                ExplainResponse(
+                    topic=record["topic"],
+                    explanation=record["explanation"],
+                    provider=record["provider"],
+                ),
+                ttl_seconds=ttl_seconds,
+            )
+            loaded += 1
+        return loaded
+
+
+@dataclass
+class WarmupReport:
+    """Summary of one warmup run."""
+
+    total: int = 0
+    skipped: int = 0
+    generated: int = 0
+    failed: int = 0
+
+
+def run_warmup(
+    service: ExplanationService,
+    provider_name: str,
+    topics: list[str],
+    checkpoint: WarmupCheckpoint,
+    detail_levels: Iterable[str] = ("short",),
+    max_concurrency: int = 2,
+    rate_per_second: float = 1.0,
+    stop_event: threading.Event | None = None,
+    max_age_seconds: float | None = None,
+) -> WarmupReport:
+    """
+    Generate explanations for every (topic, detail_level) not yet in the checkpoint.
+
+    Each result lands in the service's cache and is appended to the checkpoint
+    as soon as it is ready, so an interrupted run loses at most in-flight work.
+    Records older than `max_age_seconds` (the cache TTL) count as missing.
+    """
+    detail_levels = tuple(detail_levels)
+    kept = checkpoint.compact(max_age_seconds=max_age_seconds)
+    logger.info("Checkpoint compacted: %d fresh records kept", kept)
+    done = checkpoint.done_keys(max_age_seconds=max_age_seconds)
+    work = [
+        (topic, level)
+        for level in detail_levels
+        for topic in topics
+        if ExplanationCache.make_key(topic, level, provider_name) not in done
+    ]
+    report = WarmupReport(total=len(topics) * len(detail_levels))
+    report.skipped = report.total - len(work)
+    logger.info(
+        "Warmup starting: %d items, %d already in checkpoint, concurrency=%d rate=%.2f/s",
+        report.total,
+        report.skipped,
+        max_concurrency,
+        rate_per_second,
+    )
+
+    limiter = RateLimiter(rate_per_second)
+
+    def generate(topic: str, level: str) -> bool:
+        if stop_event is not None and stop_event.is_set():
+            return False
+        limiter.acquire()
+        response = service.generate_explanation(ExplainRequest(topic=topic, detail_level=level))
+        if response.fallback:
+            # Provider failed: leave it out of the checkpoint so the next run retries it.
+            raise RuntimeError("provider returned a fallback answer")
+        checkpoint.append(response, detail_level=level)
+        return True
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        futures = {pool.submit(generate, topic, level): topic for topic, level in work}
+        for future in as_completed(futures):
+            try:
+                if future.result():
+                    report.generated += 1
+            except Exception as exc:  # noqa: BLE001
+                report.failed += 1
+                logger.error("Warmup failed for topic=%s: %s", futures[future], exc)
+
+    if stop_event is not None and stop_event.is_set():
+        logger.info("Warmup stopped early; re-run to resume from the checkpoint.")
+    logger.info("Warmup finished: %s", report)
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI entrypoint: precompute explanations for a catalogue into a checkpoint file."""
+    from config.logging import setup_logging
+    from config.settings import get_settings
+    from core.cache import get_explanation_cache
+    from core.llm_client import LLMClient
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Precompute explanations for a topic catalogue.")
+    parser.add_argument("--catalogue", default=settings.warmup_catalogue_path, required=not settings.warmup_catalogue_path)
+    parser.add_argument(
+        "--checkpoint",
+        default=settings.explain_cache_snapshot_path,
+        required=not settings.explain_cache_snapshot_path,
+        help="JSONL checkpoint/snapshot file (resumable).",
+    )
+    parser.add_argument(
+        "--detail-level",
+        action="append",
+        choices=["short", "detailed"],
+        help="Detail level(s) to precompute; repeatable. Default: WARMUP_DETAIL_LEVELS.",
+    )
+    parser.add_argument("--concurrency", type=int, default=settings.warmup_max_concurrency)
+    parser.add_argument("--rate", type=float, default=settings.warmup_rate_per_second, help="Max LLM calls per second.")
+    args = parser.parse_args(argv)
+
+    setup_logging(settings)
+    llm_client = LLMClient(settings=settings)
+    service = ExplanationService(llm_client=llm_client, cache=get_explanation_cache())
+
+    report = run_warmup(
+        service=service,
+        provider_name=llm_client.provider_name(),
+        topics=load_catalogue(args.catalogue),
+        checkpoint=WarmupCheckpoint(args.checkpoint),
+        detail_levels=args.detail_level or [lvl.strip() for lvl in settings.warmup_detail_levels.split(",")],
+        max_concurrency=args.concurrency,
+        rate_per_second=args.rate,
+        max_age_seconds=settings.explain_cache_ttl_seconds,
+    )
+    print(
+        f"total={report.total} skipped={report.skipped} "
+        f"generated={report.generated} failed={report.failed}"
+    )
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+"""
+Tests for the batch explanation endpoint and ExplanationService.generate_batch.
+"""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from config.settings import Settings
+from core.cache import ExplanationCache
+from core.llm_client import LLMClient, LLMProviderError
+from core.models import ExplainBatchRequest
+from core.services import ExplanationService
+
+
+client = TestClient(app)
+
+
+class FakeJSONLLMClient:
+    """Fake LLMClient that answers packed prompts with JSON, dropping topic 2."""
+
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def provider_name(self) -> str:
+        return "fake"
+
+    def supports_json_output(self) -> bool:
+        return True
+
+    def generate_text(self, prompt: str, max_tokens: int | None = None) -> str:
+        self.prompts.append(prompt)
+        if "Return ONLY a JSON object" in prompt:
+            return '```json\n{"1": "first explained", "3": "third explained"}\n```'
+        return "individually explained"
+
+
+def test_batch_endpoint_streams_ndjson_and_dedupes() -> None:
+    """Duplicate topics (case/whitespace) should produce a single NDJSON line."""
+    payload = {
+        "topics": ["Python GIL", "  python   gil ", "Decorators"],
+        "detail_level": "short",
+    }
+
+    response = client.post("/api/v1/explain/batch", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert sorted(item["topic"] for item in lines) == ["Decorators", "Python GIL"]
+    assert all(item["explanation"] for item in lines)
+
+
+def test_batch_packs_short_topics_and_falls_back_per_topic() -> None:
+    """Three short topics share one packed call; the missing one is retried alone."""
+    llm = FakeJSONLLMClient()
+    service = ExplanationService(llm_client=llm, cache=ExplanationCache(), batch_pack_size=5)
+
+    request = ExplainBatchRequest(topics=["A topic", "B topic", "C topic"], detail_level="short")
+    results = {item.topic: item for item in service.generate_batch(request)}
+
+    assert results["A topic"].explanation == "first explained"
+    assert results["B topic"].explanation == "individually explained"
+    assert results["C topic"].explanation == "third explained"
+    assert len(llm.prompts) == 2  # one packed call + one fallback
+
+    # Second run is served fully from cache, without any LLM call.
+    again = list(service.generate_batch(request))
+    assert all(item.cached for item in again)
+    assert len(llm.prompts) == 2
+
+
+class TruncatingCompletions:
+    """Fake OpenAI chat.completions: long answers are cut at max_tokens (~4 chars per token)."""
+
+    def __init__(self, answers: int) -> None:
+        self.answers = answers
+        self.calls: list[int] = []
+
+    def create(self, model, messages, max_tokens, temperature):
+        self.calls.append(max_tokens)
+        bullets = "- a short, concrete bullet point about this topic\n" * 5  # ~65 tokens per topic
+        text = json.dumps({str(i): bullets for i in range(1, self.answers + 1)})[: max_tokens * 4]
+        message = type("Message", (), {"content": text})()
+        return type("Response", (), {"choices": [type("Choice", (), {"message": message})()]})()
+
+
+def test_packed_call_budget_scales_with_pack_size() -> None:
+    """Five short explanations do not fit in a single-topic budget; one call must still answer all."""
+    llm = LLMClient(settings=Settings(openai_api_key="test-key", use_ollama=False))
+    completions = TruncatingCompletions(answers=5)
+    llm._provider._client = type("Client", (), {"chat": type("Chat", (), {"completions": completions})()})()
+    service = ExplanationService(llm_client=llm, cache=ExplanationCache(), batch_pack_size=5)
+
+    topics = [f"{letter} topic" for letter in "ABCDE"]
+    results = list(service.generate_batch(ExplainBatchRequest(topics=topics, detail_level="short")))
+
+    assert len(results) == 5 and not any(r.fallback for r in results)
+    assert completions.calls == [420]  # 80 * 5 + 20, one call, no per-topic retries
+
+
+class DownLLMClient(FakeJSONLLMClient):
+    """Fake LLMClient whose provider is down."""
+
+    def generate_text(self, prompt: str, max_tokens: int | None = None) -> str:
+        self.prompts.append(prompt)
+        raise LLMProviderError("provider down", fallback_text="MOCK_LLM_RESPONSE (fallback-fake) for: packed")
+
+
+def test_failed_packed_call_returns_the_provider_fallback_without_retries() -> None:
+    llm = DownLLMClient()
+    cache = ExplanationCache()
+    service = ExplanationService(llm_client=llm, cache=cache, batch_pack_size=5)
+
+    results = list(service.generate_batch(ExplainBatchRequest(topics=["A topic", "B topic"], detail_level="short")))
+
+    assert [r.explanation for r in results] == ["MOCK_LLM_RESPONSE (fallback-fake) for: packed"] * 2
+    assert all(r.fallback for r in results)
+    assert len(llm.prompts) == 1 and len(cache) == 0
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+"""
+Cold-start guard: importing the API must not pull in provider SDKs.
+
+The full timing budget is checked by scripts/bench_import_time.py; this test
+only checks the import graph, which is stable across machines.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from core.llm_client import LLMClient, available_providers
+from config.settings import Settings
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def test_importing_app_does_not_import_provider_sdks() -> None:
+    """`import app.main` should leave openai and httpx unimported."""
+    code = (
+        "import sys; import app.main; "
+        "print(','.join(m for m in ('openai', 'httpx') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=SRC_DIR,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_providers_are_registered_by_name() -> None:
+    """All built-in providers are registered, and mock is selected without keys."""
+    assert {"mock", "openai", "ollama"} <= set(available_providers())
+
+    client = LLMClient(settings=Settings(openai_api_key=None, use_ollama=False))
+    assert client.provider_name() == "mock"
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+"""
+Tests for the explanation cache warmup (core/warmup.py).
+"""
+
+import json
+import time
+from pathlib import Path
+
+from core.cache import ExplanationCache
+from core.llm_client import LLMProviderError
+from core.models import ExplainRequest
+from core.services import ExplanationService
+from core.warmup import WarmupCheckpoint, load_catalogue, run_warmup
+
+
+class CountingLLMClient:
+    """Fake LLMClient that counts calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def provider_name(self) -> str:
+        return "fake"
+
+    def supports_json_output(self) -> bool:
+        return False
+
+    def generate_text(self, prompt: str, max_tokens: int | None = None) -> str:
+        self.calls += 1
+        return f"explanation #{self.calls}"
+
+
+class FailingLLMClient(CountingLLMClient):
+    """Fake LLMClient whose provider is down."""
+
+    def generate_text(self, prompt: str, max_tokens: int | None = None) -> str:
+        self.calls += 1
+        raise LLMProviderError("provider down", fallback_text="MOCK_LLM_RESPONSE (fallback-fake) for: ...")
+
+
+def test_load_catalogue_skips_comments_and_duplicates(tmp_path: Path) -> None:
+    catalogue = tmp_path / "topics.txt"
+    catalogue.write_text("# core python\nPython GIL\n\npython  gil\nDecorators\n", encoding="utf-8")
+
+    assert load_catalogue(catalogue) == ["Python GIL", "Decorators"]
+
+
+def test_warmup_is_resumable_and_snapshot_fills_a_fresh_cache(tmp_path: Path) -> None:
+    checkpoint = WarmupCheckpoint(tmp_path / "explanations.jsonl")
+    topics = ["Python GIL", "Decorators", "asyncio"]
+
+    llm = CountingLLMClient()
+    service = ExplanationService(llm_client=llm, cache=ExplanationCache())
+    first = run_warmup(service, "fake", topics[:2], checkpoint, rate_per_second=0)
+    assert (first.generated, first.skipped) == (2, 0)
+
+    # Second run over the full catalogue only generates the missing topic.
+    second = run_warmup(service, "fake", topics, checkpoint, rate_per_second=0)
+    assert (second.generated, second.skipped) == (1, 2)
+    assert llm.calls == 3
+
+    # A new process (fresh cache) serves every catalogue topic without an LLM call.
+    fresh_llm = CountingLLMClient()
+    fresh_cache = ExplanationCache()
+    assert checkpoint.load_into(fresh_cache) == 3
+    fresh_service = ExplanationService(llm_client=fresh_llm, cache=fresh_cache)
+    response = fresh_service.generate_explanation(ExplainRequest(topic="decorators"))
+    assert response.cached is True
+    assert fresh_llm.calls == 0
+
+
+def test_provider_fallbacks_are_not_cached_or_checkpointed(tmp_path: Path) -> None:
+    checkpoint = WarmupCheckpoint(tmp_path / "explanations.jsonl")
+    cache = ExplanationCache()
+    down = FailingLLMClient()
+    service = ExplanationService(llm_client=down, cache=cache)
+
+    response = service.generate_explanation(ExplainRequest(topic="Python GIL"))
+    assert response.fallback is True and "fallback-fake" in response.explanation
+
+    report = run_warmup(service, "fake", ["Python GIL", "Decorators"], checkpoint, rate_per_second=0)
+    assert (report.generated, report.failed) == (0, 2)
+    assert checkpoint.done_keys() == set()
+
+    # Once the provider is back, nothing stale is served: the next call reaches it.
+    up = CountingLLMClient()
+    recovered = ExplanationService(llm_client=up, cache=cache).generate_explanation(ExplainRequest(topic="Python GIL"))
+    assert recovered.cached is False and recovered.fallback is False and up.calls == 1
+
+
+def test_stale_checkpoint_records_are_regenerated_and_compacted(tmp_path: Path) -> None:
+    path = tmp_path / "explanations.jsonl"
+    old = time.time() - 2 * 86400
+    lines = [
+        {"topic": "Python GIL", "detail_level": "short", "explanation": "old", "provider": "fake", "created_at": old},
+        {"topic": "Decorators", "detail_level": "short", "explanation": "v1", "provider": "fake", "created_at": old},
+        {"topic": "Decorators", "detail_level": "short", "explanation": "v2", "provider": "fake", "created_at": time.time()},
+    ]
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines) + '{"topic": "trunc', encoding="utf-8")
+    checkpoint = WarmupCheckpoint(path)
+
+    # The expired GIL entry is not loaded into the cache, so it must not be skipped either.
+    llm = CountingLLMClient()
+    service = ExplanationService(llm_client=llm, cache=ExplanationCache())
+    report = run_warmup(service, "fake", ["Python GIL", "Decorators"], checkpoint, rate_per_second=0, max_age_seconds=86400)
+    assert (report.generated, report.skipped) == (1, 1)
+    assert llm.calls == 1
+
+    # Expired, superseded and corrupt lines are gone; one fresh record per key remains.
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    explanations = {r["topic"]: r["explanation"] for r in records}
+    assert len(records) == 2
+    assert explanations["Decorators"] == "v2" and explanations["Python GIL"] != "old"
+
+
+def test_loaded_entries_keep_only_their_remaining_lifetime(tmp_path: Path) -> None:
+    path = tmp_path / "explanations.jsonl"
+    record = {"topic": "Python GIL", "detail_level": "short", "explanation": "x", "provider": "fake"}
+    path.write_text(json.dumps({**record, "created_at": time.time() - 23 * 3600}) + "\n", encoding="utf-8")
+
+    now = [0.0]
+    cache = ExplanationCache(ttl_seconds=86400, clock=lambda: now[0])
+    assert WarmupCheckpoint(path).load_into(cache, max_age_seconds=86400) == 1
+    key = ExplanationCache.make_key("Python GIL", "short", "fake")
+
+    now[0] = 3000.0
+    assert cache.get(key) is not None
+    now[0] = 3700.0  # past the hour the record had left, far short of a full TTL
+    assert cache.get(key) is None
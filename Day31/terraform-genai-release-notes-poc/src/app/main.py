@@ -4,14 +4,18 @@ Run locally:
     uvicorn app.main:app --reload
 """
 
+import io
 import logging
+from collections.abc import AsyncIterator
 from typing import Annotated
 
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from config.settings import Settings, get_settings
 from core.llm_client import LLMClient
 from core.models import ReleaseNoteRequest, ReleaseNoteResponse
+from core.batch import SOURCES, generate_release_notes_stream, read_changes
 from core.services import generate_release_note
 
 logger = logging.getLogger(__name__)
@@ -85,3 +89,120 @@ def create_release_note(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate release note.",
         ) from exc
+
+
+@app.post(
+    "/api/v1/release-notes/batch",
+    tags=["release-notes"],
+    response_class=StreamingResponse,
+)
+async def create_release_notes_batch(
+    request: Request,
+    llm_client: LLMClientDep,
+    provider_name: ProviderDep,
+    settings: SettingsDep,
+    source: Annotated[str, Query(description=f"Input format: {', '.join(SOURCES)}.")] = "ndjson",
+    tone: Annotated[str, Query(description="Default tone for changes without one.")] = "neutral",
+) -> StreamingResponse:
+    """
+    Generate release notes for a whole batch of changes, streamed as NDJSON.
+
+    The request body is raw NDJSON, `git log` output or `terraform show -json`
+    output (see `source`). Similar changes are deduplicated, several
+    changes are packed into each LLM call (BATCH_PACK_SIZE), calls run with
+    bounded concurrency, and one ReleaseNoteBatchItem is streamed per line.
+
+    The body is read from the request stream with a hard cap: over
+    BATCH_MAX_BODY_BYTES the request fails with 413, and a line over
+    BATCH_MAX_LINE_BYTES is dropped without being buffered. (Starlette's
+    StreamingResponse listens on the same receive channel for disconnects,
+    so the body has to be in before the response starts; use the CLI for
+    inputs larger than the cap.)
+    """
+    if source not in SOURCES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown source '{source}'. Expected one of: {', '.join(SOURCES)}.",
+        )
+    declared_length = request.headers.get("content-length")
+    if declared_length and declared_length.isdigit() and int(declared_length) > settings.batch_max_body_bytes:
+        raise _body_too_large(settings.batch_max_body_bytes)
+
+    try:
+        if source == "terraform-plan":
+            # A plan is one JSON document: it has to be read (bounded) before parsing.
+            body = await _read_body(request, settings.batch_max_body_bytes)
+            changes = read_changes(source, io.StringIO(body.decode("utf-8")), tone=tone)
+        else:
+            body_lines = _iter_body_lines(request, settings.batch_max_body_bytes, settings.batch_max_line_bytes)
+            changes = read_changes(source, [line async for line in body_lines], tone=tone)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not parse {source} input: {exc}",
+        ) from exc
+    items = generate_release_notes_stream(
+        changes,
+        llm_client=llm_client,
+        provider_name=provider_name,
+        max_concurrency=settings.batch_max_concurrency,
+        pack_size=settings.batch_pack_size,
+    )
+    lines = (item.model_dump_json() + "\n" for item in items)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+# ------------------------
+# Internal helpers
+# ------------------------
+
+
+def _body_too_large(max_body_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,  # Content Too Large; Starlette renamed the constant, so no alias here.
+        detail=f"Request body exceeds {max_body_bytes} bytes.",
+    )
+
+
+async def _read_body(request: Request, max_body_bytes: int) -> bytes:
+    """Read the whole body, failing with 413 as soon as it exceeds `max_body_bytes`."""
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_body_bytes:
+            raise _body_too_large(max_body_bytes)
+    return bytes(body)
+
+
+async def _iter_body_lines(request: Request, max_body_bytes: int, max_line_bytes: int) -> AsyncIterator[str]:
+    """
+    Yield the request body line by line as it is received.
+
+    At most one partial line is buffered: a line longer than `max_line_bytes`
+    is dropped (with a warning) instead of being accumulated. Once more than
+    `max_body_bytes` have arrived, HTTPException(413) is raised.
+    """
+    buffer = bytearray()
+    received = 0
+    oversized = False
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_body_bytes:
+            raise _body_too_large(max_body_bytes)
+        buffer += chunk
+        while (newline := buffer.find(b"\n")) != -1:
+            line, oversized = bytes(buffer[:newline]), oversized or newline > max_line_bytes
+            del buffer[: newline + 1]
+            if oversized:
+                logger.warning("Skipping batch input line longer than %d bytes.", max_line_bytes)
+                oversized = False
+                continue
+            yield line.decode("utf-8", errors="replace")
+        if len(buffer) > max_line_bytes:
+            oversized = True
+            buffer.clear()
+    if oversized:
+        logger.warning("Skipping batch input line longer than %d bytes.", max_line_bytes)
+    elif buffer:
+        yield buffer.decode("utf-8", errors="replace")
+
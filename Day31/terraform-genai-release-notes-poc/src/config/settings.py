@@ -33,6 +33,12 @@ class Settings(BaseSettings):
     hf_token: Optional[str] = Field(default=None, alias="HF_TOKEN")
     grok_model: Optional[str] = Field(default=None, alias="GROK_MODEL")
 
+    # Batch release-note generation
+    batch_max_concurrency: int = Field(default=4, alias="BATCH_MAX_CONCURRENCY")
+    batch_pack_size: int = Field(default=5, alias="BATCH_PACK_SIZE")
+    batch_max_body_bytes: int = Field(default=10 * 1024 * 1024, alias="BATCH_MAX_BODY_BYTES")
+    batch_max_line_bytes: int = Field(default=64 * 1024, alias="BATCH_MAX_LINE_BYTES")
+
     # Optional DB configuration (not used directly yet, but ready for RDS)
     db_host: Optional[str] = Field(default=None, alias="DB_HOST")
     db_port: Optional[int] = Field(default=None, alias="DB_PORT")
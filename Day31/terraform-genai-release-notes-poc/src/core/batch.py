@@ -0,0 +1,287 @@
+"""
+Streaming batch release-note generation.
+
+Turns a stream of infrastructure changes into a stream of release notes:
+
+    changes (generator) -> dedupe -> pack K per call -> bounded-concurrency LLM calls
+        -> results (generator)
+
+Nothing here materializes the whole input or output: readers yield one change
+at a time, at most `max_in_flight` LLM calls are pending, and results are
+yielded (in input order) as soon as they are ready.
+
+Supported input sources:
+- "ndjson":         one JSON object per line ({"change_summary": ..., "tone": ...})
+                    or a bare JSON string per line.
+- "git-log":        `git log --oneline` or `git log --pretty=format:%s` output.
+- "terraform-plan": `terraform show -json <planfile>` output.
+
+CLI (from project root):
+
+    git log --pretty=format:%s v1.0..HEAD | \\
+        python -m core.batch --source git-log --output notes.ndjson
+
+    terraform show -json tfplan | python -m core.batch --source terraform-plan
+"""
+
+import argparse
+import json
+import logging
+import re
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Optional, TextIO
+
+from pydantic import ValidationError
+
+from .llm_client import LLMClient
+from .models import ReleaseNoteBatchItem, ReleaseNoteRequest
+from .services import generate_release_note, generate_release_notes_packed
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("ndjson", "git-log", "terraform-plan")
+
+_GIT_ONELINE_RE = re.compile(r"^[0-9a-f]{7,40}\s+(.*)$")
+_ISSUE_REF_RE = re.compile(r"\(?#\d+\)?")
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+
+
+# ------------------------
+# Input readers
+# ------------------------
+
+
+def iter_ndjson_changes(lines: Iterable[str], tone: str = "neutral") -> Iterator[dict]:
+    """Yield raw change dicts from NDJSON lines (objects or bare strings)."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning("Skipping invalid NDJSON line: %s", line[:80])
+            continue
+        if isinstance(data, str):
+            yield {"change_summary": data, "tone": tone}
+        elif isinstance(data, dict):
+            yield {"tone": tone, **data}
+
+
+def iter_git_log_changes(lines: Iterable[str], tone: str = "neutral") -> Iterator[dict]:
+    """Yield one change per commit subject (hash prefixes from --oneline are stripped)."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        match = _GIT_ONELINE_RE.match(line)
+        subject = match.group(1) if match else line
+        # Merge commits rarely describe a change on their own.
+        if subject.startswith("Merge "):
+            continue
+        yield {"change_summary": subject, "tone": tone}
+
+
+def iter_terraform_plan_changes(stream: TextIO, tone: str = "neutral") -> Iterator[dict]:
+    """
+    Yield one change per changed resource in `terraform show -json` output.
+
+    The plan is a single JSON document, so it is parsed eagerly (invalid JSON
+    raises ValueError right away); changes are still yielded lazily.
+    No-op and read-only resources are skipped.
+    """
+    plan = json.load(stream)
+    if not isinstance(plan, dict):
+        raise ValueError("Terraform plan JSON must be an object.")
+    return _plan_resource_changes(plan, tone)
+
+
+def _plan_resource_changes(plan: dict, tone: str) -> Iterator[dict]:
+    for resource in plan.get("resource_changes", []):
+        actions = resource.get("change", {}).get("actions", [])
+        if not actions or actions in (["no-op"], ["read"]):
+            continue
+        if actions in (["delete", "create"], ["create", "delete"]):
+            verb = "Replace"
+        else:
+            verb = actions[0].capitalize()
+        address = resource.get("address", "unknown resource")
+        yield {"change_summary": f"{verb} {address}", "tone": tone}
+
+
+def read_changes(source: str, stream: TextIO, tone: str = "neutral") -> Iterator[dict]:
+    """Dispatch to the reader for `source`."""
+    if source == "ndjson":
+        return iter_ndjson_changes(stream, tone=tone)
+    if source == "git-log":
+        return iter_git_log_changes(stream, tone=tone)
+    if source == "terraform-plan":
+        return iter_terraform_plan_changes(stream, tone=tone)
+    raise ValueError(f"Unknown source '{source}'. Expected one of: {', '.join(SOURCES)}.")
+
+
+# ------------------------
+# Dedupe + generation
+# ------------------------
+
+
+def similarity_key(change_summary: str) -> str:
+    """
+    Key under which two changes count as "the same" for dedupe.
+
+    Ignores case, punctuation, whitespace and PR/issue references, so e.g.
+    "Bump RDS to t3.small (#123)" and "bump rds to t3 small" collapse, while
+    "t3.small" vs "t3.medium" stay distinct.
+    """
+    text = _ISSUE_REF_RE.sub(" ", change_summary.lower())
+    text = _NON_WORD_RE.sub(" ", text)
+    return " ".join(text.split())
+
+
+def dedupe_changes(changes: Iterable[dict]) -> Iterator[dict]:
+    """Yield only the first change for each similarity key."""
+    seen: set[str] = set()
+    for change in changes:
+        key = similarity_key(str(change.get("change_summary", "")))
+        if key in seen:
+            logger.info("Skipping duplicate change: %s", change.get("change_summary"))
+            continue
+        seen.add(key)
+        yield change
+
+
+def _generate_chunk(
+    chunk: list[tuple[int, dict]],
+    llm_client: LLMClient,
+    provider_name: str,
+) -> list[ReleaseNoteBatchItem]:
+    """
+    Generate notes for a chunk of (index, change) pairs.
+
+    Invalid changes become error items. Valid ones share one packed LLM call
+    when there is more than one of them, otherwise a normal single call.
+    """
+    items: dict[int, ReleaseNoteBatchItem] = {}
+    valid: list[tuple[int, ReleaseNoteRequest]] = []
+    for index, change in chunk:
+        try:
+            valid.append((index, ReleaseNoteRequest(**change)))
+        except ValidationError as exc:
+            items[index] = ReleaseNoteBatchItem(
+                index=index,
+                change_summary=str(change.get("change_summary", "")),
+                error=str(exc.errors()[0]["msg"]),
+            )
+
+    payloads = [payload for _, payload in valid]
+    try:
+        if len(payloads) > 1:
+            responses = generate_release_notes_packed(payloads, llm_client=llm_client, provider_name=provider_name)
+        else:
+            responses = [
+                generate_release_note(payload, llm_client=llm_client, provider_name=provider_name)
+                for payload in payloads
+            ]
+    except Exception as exc:  # noqa: BLE001
+        logger.error("Failed to generate release notes for changes %s: %s", [i for i, _ in valid], exc)
+        responses = [None] * len(valid)
+
+    for (index, payload), response in zip(valid, responses):
+        items[index] = ReleaseNoteBatchItem(
+            index=index,
+            change_summary=payload.change_summary,
+            release_note=response.release_note if response else None,
+            provider=response.provider if response else None,
+            error=None if response else "generation failed",
+        )
+    return [items[index] for index, _ in chunk]
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def generate_release_notes_stream(
+    changes: Iterable[dict],
+    llm_client: LLMClient,
+    provider_name: str,
+    max_concurrency: int = 4,
+    pack_size: int = 1,
+) -> Iterator[ReleaseNoteBatchItem]:
+    """
+    Generate release notes for a stream of changes, yielding results in input order.
+
+    With pack_size > 1, up to `pack_size` changes share one LLM call (see
+    generate_release_notes_packed), cutting the number of calls by ~pack_size.
+
+    At most `2 * max_concurrency` chunks are read ahead of the output, so
+    memory stays bounded regardless of input size.
+    """
+    max_concurrency = max(1, max_concurrency)
+    max_in_flight = 2 * max_concurrency
+    pending: deque[Future] = deque()
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        for chunk in _chunked(enumerate(dedupe_changes(changes)), max(1, pack_size)):
+            pending.append(pool.submit(_generate_chunk, chunk, llm_client, provider_name))
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# ------------------------
+# CLI
+# ------------------------
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """CLI entrypoint: read changes from a file/stdin and write NDJSON release notes."""
+    from config.settings import get_settings
+
+    parser = argparse.ArgumentParser(description="Generate release notes for a batch of changes.")
+    parser.add_argument("--source", choices=SOURCES, default="ndjson")
+    parser.add_argument("--input", default="-", help="Input file (default: stdin).")
+    parser.add_argument("--output", default="-", help="Output NDJSON file (default: stdout).")
+    parser.add_argument("--tone", default="neutral")
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--pack-size", type=int, default=None, help="Changes per LLM call (1 disables packing).")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    llm_client = LLMClient(settings=settings)
+    concurrency = args.concurrency or settings.batch_max_concurrency
+    pack_size = args.pack_size or settings.batch_pack_size
+
+    in_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    failed = 0
+    try:
+        changes = read_changes(args.source, in_stream, tone=args.tone)
+        for item in generate_release_notes_stream(
+            changes,
+            llm_client=llm_client,
+            provider_name=llm_client.provider_name,
+            max_concurrency=concurrency,
+            pack_size=pack_size,
+        ):
+            failed += item.error is not None
+            out_stream.write(item.model_dump_json() + "\n")
+            out_stream.flush()
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,3 +1,4 @@
+import json
 import logging
 from typing import Optional
 
@@ -7,6 +8,44 @@ from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = (
+    "You are a concise release-note helper. "
+    "You produce one short sentence suitable for "
+    "a changelog visible to engineers."
+)
+
+# Packed calls answer several items at once, as a JSON array (see generate_text_packed).
+PACKED_SYSTEM_PROMPT = (
+    "You are a concise release-note helper. "
+    "For each numbered item you produce one short sentence suitable for "
+    "a changelog visible to engineers, and you reply with a JSON array of "
+    "strings only."
+)
+
+# Output budget per packed item (a single changelog sentence), plus JSON overhead.
+_PACKED_TOKENS_PER_ITEM = 80
+_PACKED_TOKENS_OVERHEAD = 20
+
+
+def parse_json_array(text: str, expected: int) -> list[Optional[str]]:
+    """
+    Parse a JSON array of strings returned for a packed request.
+
+    Tolerates surrounding prose or ```json fences. If the array is missing,
+    malformed or has the wrong length, every slot is None (positions cannot be
+    trusted). Individual non-string or empty entries are None.
+    """
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end <= start:
+        return [None] * expected
+    try:
+        data = json.loads(text[start : end + 1])
+    except json.JSONDecodeError:
+        return [None] * expected
+    if not isinstance(data, list) or len(data) != expected:
+        return [None] * expected
+    return [item.strip() if isinstance(item, str) and item.strip() else None for item in data]
+
 
 class LLMClient:
     """
@@ -58,14 +97,7 @@ class LLMClient:
             response = self._client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a concise release-note helper. "
-                            "You produce one short sentence suitable for "
-                            "a changelog visible to engineers."
-                        ),
-                    },
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt},
                 ],
                 max_tokens=80,
@@ -78,3 +110,52 @@ class LLMClient:
             # In a real system you might distinguish network errors, rate limits, etc.
             logger.error("OpenAI call failed: %s. Falling back to mock.", exc)
             return f"MOCK_LLM_RESPONSE for: {prompt}"
+
+    def generate_text_packed(self, items: list[str], instruction: str) -> list[Optional[str]]:
+        """
+        Answer several short items with ONE completion call.
+
+        The items are numbered in a single prompt and the model is asked for a
+        JSON array with one string per item, in order. This amortizes the
+        system prompt and HTTP round trip across K items.
+
+        Returns one entry per item; None marks items whose answer was missing
+        or invalid in an otherwise successful response, so the caller can fall
+        back to individual calls. If the call itself fails, every item gets the
+        deterministic MOCK_LLM_RESPONSE text (as in generate_text) instead of
+        triggering K more calls against a provider that is already failing.
+        """
+        if not items:
+            return []
+
+        if self._client is None:
+            logger.info("Using mock LLM response for %d packed items.", len(items))
+            return [f"MOCK_LLM_RESPONSE for: {item}" for item in items]
+
+        numbered = "\n".join(f"{i}. {item}" for i, item in enumerate(items, start=1))
+        prompt = (
+            f"{instruction}\n\n{numbered}\n\n"
+            f"Return ONLY a JSON array of exactly {len(items)} strings, "
+            "one per numbered item, in the same order."
+        )
+        try:
+            logger.info("Calling OpenAI chat completions for %d packed items.", len(items))
+            response = self._client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": PACKED_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                max_tokens=_PACKED_TOKENS_PER_ITEM * len(items) + _PACKED_TOKENS_OVERHEAD,
+                temperature=0.3,
+            )
+            text = response.choices[0].message.content or ""
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Packed OpenAI call failed: %s. Falling back to mock.", exc)
+            return [f"MOCK_LLM_RESPONSE for: {item}" for item in items]
+
+        results = parse_json_array(text, len(items))
+        missing = sum(result is None for result in results)
+        if missing:
+            logger.warning("Packed response invalid for %d of %d items.", missing, len(items))
+        return results
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -36,3 +38,33 @@ class ReleaseNoteResponse(BaseModel):
         ...,
         description="LLM provider used (e.g., 'openai' or 'mock').",
     )
+
+
+class ReleaseNoteBatchItem(BaseModel):
+    """
+    One line of a streamed batch result (NDJSON).
+
+    Either `release_note` + `provider` are set, or `error` explains why this
+    change could not be turned into a note (e.g. validation failed).
+    """
+
+    index: int = Field(
+        ...,
+        description="Position of the change in the deduplicated input stream.",
+    )
+    change_summary: str = Field(
+        ...,
+        description="The change this note was generated for.",
+    )
+    release_note: Optional[str] = Field(
+        default=None,
+        description="Generated release-note sentence.",
+    )
+    provider: Optional[str] = Field(
+        default=None,
+        description="LLM provider used (e.g., 'openai' or 'mock').",
+    )
+    error: Optional[str] = Field(
+        default=None,
+        description="Error message if generation failed for this change.",
+    )
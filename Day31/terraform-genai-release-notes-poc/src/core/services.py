@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from .llm_client import LLMClient
 from .models import ReleaseNoteRequest, ReleaseNoteResponse
@@ -42,13 +43,55 @@ def generate_release_note(
 
     text = llm_client.generate_text(prompt=prompt)
 
-    # A tiny safety/trimming step
+    return ReleaseNoteResponse(
+        release_note=_finalize_note(text),
+        provider=provider_name,
+    )
+
+
+def _finalize_note(text: str) -> str:
+    """A tiny safety/trimming step: one line, ending with a period."""
     release_note = text.replace("\n", " ").strip()
 
     if not release_note.endswith("."):
         release_note += "."
+    return release_note
 
-    return ReleaseNoteResponse(
-        release_note=release_note,
-        provider=provider_name,
-    )
+
+def _tone_label(payload: ReleaseNoteRequest) -> str:
+    tone = payload.tone.lower()
+    return "neutral, professional" if tone == "neutral" else tone
+
+
+PACKED_INSTRUCTION = (
+    "You are helping a platform team write concise release notes for "
+    "infrastructure changes (Terraform, AWS, Kubernetes, databases).\n"
+    "For each numbered change below, write exactly one sentence suitable for a "
+    "technical changelog, using the tone given in brackets."
+)
+
+
+def generate_release_notes_packed(
+    payloads: list[ReleaseNoteRequest],
+    llm_client: LLMClient,
+    provider_name: str,
+) -> list[ReleaseNoteResponse]:
+    """
+    Generate release notes for several changes with a single packed LLM call.
+
+    Items a successful packed answer did not cover (invalid JSON, wrong
+    length, empty entry) are regenerated one by one via generate_release_note().
+    A failed packed call already yields fallback text for every item, so an
+    outage costs one call, not K+1.
+    """
+    items = [f"[{_tone_label(p)} tone] {p.change_summary}" for p in payloads]
+    logger.info("Generating %d release notes (packed) using provider=%s.", len(items), provider_name)
+    texts: list[Optional[str]] = llm_client.generate_text_packed(items, instruction=PACKED_INSTRUCTION)
+
+    responses = []
+    for payload, text in zip(payloads, texts):
+        if text is None:
+            responses.append(generate_release_note(payload, llm_client=llm_client, provider_name=provider_name))
+        else:
+            responses.append(ReleaseNoteResponse(release_note=_finalize_note(text), provider=provider_name))
+    return responses
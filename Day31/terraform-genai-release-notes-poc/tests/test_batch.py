@@ -0,0 +1,180 @@
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from core.batch import iter_terraform_plan_changes, similarity_key
+
+client = TestClient(app)
+
+
+def test_batch_endpoint_git_log_dedupes_and_streams_in_order() -> None:
+    """Similar commit subjects collapse to one note; output keeps input order."""
+    git_log = (
+        "a1b2c3d Upgrade dev RDS instance to db.t3.small (#12)\n"
+        "d4e5f60 upgrade dev rds instance to db.t3.small\n"
+        "Merge branch 'main' into feature\n"
+        "0f1e2d3 Add S3 bucket for release docs\n"
+    )
+
+    response = client.post("/api/v1/release-notes/batch?source=git-log", content=git_log)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    items = [json.loads(line) for line in response.text.splitlines() if line]
+    assert [item["change_summary"] for item in items] == [
+        "Upgrade dev RDS instance to db.t3.small (#12)",
+        "Add S3 bucket for release docs",
+    ]
+    assert [item["index"] for item in items] == [0, 1]
+    assert all(item["release_note"] and item["error"] is None for item in items)
+
+
+def test_batch_endpoint_reports_per_item_validation_errors() -> None:
+    """A too-short change yields an error line without failing the whole batch."""
+    ndjson = '{"change_summary": "Hi"}\n"Rotate the dev database credentials"\n'
+
+    response = client.post("/api/v1/release-notes/batch?source=ndjson", content=ndjson)
+    assert response.status_code == 200
+
+    items = [json.loads(line) for line in response.text.splitlines() if line]
+    assert items[0]["error"] is not None
+    assert items[1]["release_note"]
+
+
+def test_batch_endpoint_rejects_invalid_terraform_plan() -> None:
+    response = client.post("/api/v1/release-notes/batch?source=terraform-plan", content="not json")
+    assert response.status_code == 400
+
+
+def test_batch_body_is_read_line_by_line_with_size_limits() -> None:
+    """Lines split across chunks are rejoined; an over-long line is dropped, not buffered."""
+    import anyio
+
+    from app.main import _iter_body_lines
+
+    class ChunkedRequest:
+        async def stream(self):
+            for chunk in (b'"Add S3 bu', b'cket"\n"' + b"x" * 40, b"x" * 40 + b'"\n"Rotate', b' keys"'):
+                yield chunk
+
+    async def read_all() -> list[str]:
+        return [line async for line in _iter_body_lines(ChunkedRequest(), max_body_bytes=1000, max_line_bytes=32)]
+
+    assert anyio.run(read_all) == ['"Add S3 bucket"', '"Rotate keys"']
+
+
+def test_batch_endpoint_rejects_oversized_body() -> None:
+    from config.settings import Settings, get_settings
+
+    app.dependency_overrides[get_settings] = lambda: Settings(BATCH_MAX_BODY_BYTES=64)
+    try:
+        ndjson = '"Rotate the dev database credentials"\n' * 3
+        assert client.post("/api/v1/release-notes/batch?source=ndjson", content=ndjson).status_code == 413
+        # Without a Content-Length (chunked upload) the cap applies while reading.
+        chunks = (line.encode() for line in [ndjson] * 2)
+        assert client.post("/api/v1/release-notes/batch?source=git-log", content=chunks).status_code == 413
+        assert client.post("/api/v1/release-notes/batch?source=ndjson", content=ndjson[:40]).status_code == 200
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_terraform_plan_reader_skips_no_op_and_detects_replace() -> None:
+    plan = {
+        "resource_changes": [
+            {"address": "aws_s3_bucket.docs", "change": {"actions": ["create"]}},
+            {"address": "aws_vpc.main", "change": {"actions": ["no-op"]}},
+            {"address": "aws_db_instance.app", "change": {"actions": ["delete", "create"]}},
+        ]
+    }
+
+    changes = list(iter_terraform_plan_changes(io.StringIO(json.dumps(plan))))
+    assert [c["change_summary"] for c in changes] == [
+        "Create aws_s3_bucket.docs",
+        "Replace aws_db_instance.app",
+    ]
+
+
+def test_similarity_key_ignores_case_punctuation_and_numbers() -> None:
+    assert similarity_key("Bump RDS to t3.small (#123)") == similarity_key("bump rds to t3 small")
+
+
+class _FakeCompletions:
+    """Stands in for OpenAI's chat.completions; packed prompts get a JSON array."""
+
+    def __init__(self, packed_answer: str) -> None:
+        self.packed_answer = packed_answer
+        self.calls = 0
+
+    def create(self, messages, **kwargs):
+        self.calls += 1
+        prompt = messages[-1]["content"]
+        content = self.packed_answer if "JSON array" in prompt else "Single fallback note"
+        message = type("Message", (), {"content": content})()
+        choice = type("Choice", (), {"message": message})()
+        return type("Response", (), {"choices": [choice]})()
+
+
+def _client_with_fake_openai(packed_answer: str):
+    from config.settings import Settings
+    from core.llm_client import LLMClient
+
+    llm_client = LLMClient(settings=Settings(OPENAI_API_KEY=None))
+    completions = _FakeCompletions(packed_answer)
+    llm_client._client = type("FakeOpenAI", (), {"chat": type("Chat", (), {"completions": completions})()})()
+    return llm_client, completions
+
+
+def test_packed_generation_splits_json_and_falls_back_for_invalid_items() -> None:
+    """Three changes -> one packed call; the empty entry is regenerated alone."""
+    from core.models import ReleaseNoteRequest
+    from core.services import generate_release_notes_packed
+
+    llm_client, completions = _client_with_fake_openai(
+        '```json\n["Created the docs bucket", "", "Resized the dev database"]\n```'
+    )
+    payloads = [
+        ReleaseNoteRequest(change_summary="Add S3 bucket for docs"),
+        ReleaseNoteRequest(change_summary="Rotate IAM keys for CI", tone="casual"),
+        ReleaseNoteRequest(change_summary="Resize dev RDS to db.t3.small"),
+    ]
+
+    notes = generate_release_notes_packed(payloads, llm_client=llm_client, provider_name="openai")
+
+    assert [n.release_note for n in notes] == [
+        "Created the docs bucket.",
+        "Single fallback note.",
+        "Resized the dev database.",
+    ]
+    assert completions.calls == 2
+
+
+def test_parse_json_array_rejects_wrong_length() -> None:
+    from core.llm_client import parse_json_array
+
+    assert parse_json_array('["a", "b"]', 3) == [None, None, None]
+    assert parse_json_array('Sure! ["a", 1]', 2) == ["a", None]
+
+
+def test_packed_generation_makes_one_call_when_provider_fails() -> None:
+    """A provider outage yields fallback text for every item without per-item retries."""
+    from core.models import ReleaseNoteRequest
+    from core.services import generate_release_notes_packed
+
+    llm_client, completions = _client_with_fake_openai("[]")
+
+    def _fail(messages, **kwargs):
+        completions.calls += 1
+        raise RuntimeError("provider down")
+
+    completions.create = _fail
+    payloads = [
+        ReleaseNoteRequest(change_summary="Add S3 bucket for docs"),
+        ReleaseNoteRequest(change_summary="Resize dev RDS to db.t3.small"),
+    ]
+
+    notes = generate_release_notes_packed(payloads, llm_client=llm_client, provider_name="openai")
+
+    assert all(n.release_note.startswith("MOCK_LLM_RESPONSE for: ") for n in notes)
+    assert completions.calls == 1
@@ -0,0 +1,107 @@
+"""
+Benchmark cache value codecs and cache-key hashes.
+
+Compares every serializer x compression combination whose libraries are
+installed (json/zlib are always available; orjson, msgpack, zstd, lz4 and
+xxhash come with the [perf] extra) on a release-note-sized value:
+
+- stored size in bytes (and Redis MEMORY USAGE with --redis-url)
+- encode / decode time per value
+- cache-key hash time (sha256 vs blake2b vs xxhash) for a large request
+
+Usage (from project root):
+
+    PYTHONPATH=src python scripts/bench_codecs.py
+    PYTHONPATH=src python scripts/bench_codecs.py --description-kb 16 --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from typing import Any, Dict, Optional
+
+from core.codecs import COMPRESSIONS, KEY_HASHES, SERIALIZERS, ValueCodec, hash_bytes
+
+
+def _sample_value(description_kb: int) -> Dict[str, Any]:
+    sentence = "Upgraded the RDS instance class to db.t3.medium and raised max_connections. "
+    return {
+        "release_note": (sentence * (description_kb * 1024 // len(sentence) + 1))[: description_kb * 1024],
+        "test_scenarios": [
+            "Verify the application reconnects after the RDS failover.",
+            "Check connection pool limits under peak load.",
+            "Validate there are no regressions in reporting queries.",
+        ],
+        "provider": "openai",
+        "model": "gpt-4o-mini",
+        "cached": False,
+    }
+
+
+def _per_op_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def _redis_memory(client: Optional[Any], key: str, data: Any) -> str:
+    if client is None:
+        return "-"
+    client.set(key, data)
+    usage = client.memory_usage(key)
+    client.delete(key)
+    return str(usage)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cache codecs and key hashes.")
+    parser.add_argument("--description-kb", type=int, default=4, help="Size of the release note text.")
+    parser.add_argument("--number", type=int, default=2000, help="Iterations per measurement.")
+    parser.add_argument("--redis-url", default=None, help="Also report Redis MEMORY USAGE (uses a scratch key).")
+    args = parser.parse_args(argv)
+
+    value = _sample_value(args.description_kb)
+    client = None
+    if args.redis_url:
+        import redis
+
+        client = redis.Redis.from_url(args.redis_url)
+
+    baseline = json.dumps(value)
+    print(f"value: ~{args.description_kb} KiB release note; legacy JSON text = {len(baseline)} bytes")
+    print(f"legacy json.dumps/json.loads: encode {_per_op_us(lambda: json.dumps(value), args.number):.1f} us, "
+          f"decode {_per_op_us(lambda: json.loads(baseline), args.number):.1f} us, "
+          f"redis {_redis_memory(client, 'd32-bench:legacy', baseline)} B")
+    print()
+    print(f"{'serializer':<10} {'compression':<11} {'bytes':>8} {'ratio':>6} {'enc us':>8} {'dec us':>8} {'redis B':>8}")
+
+    for serializer in SERIALIZERS:
+        for compression in COMPRESSIONS:
+            try:
+                codec = ValueCodec(serializer=serializer, compression=compression, compress_min_bytes=0)
+            except ValueError:
+                print(f"{serializer:<10} {compression:<11} (library not installed)")
+                continue
+            encoded = codec.encode(value)
+            enc_us = _per_op_us(lambda: codec.encode(value), args.number)
+            dec_us = _per_op_us(lambda: codec.decode(encoded), args.number)
+            redis_bytes = _redis_memory(client, "d32-bench:codec", encoded)
+            print(
+                f"{serializer:<10} {compression:<11} {len(encoded):>8} {len(baseline) / len(encoded):>6.1f} "
+                f"{enc_us:>8.1f} {dec_us:>8.1f} {redis_bytes:>8}"
+            )
+
+    print()
+    key_payload = json.dumps({"title": "Bump RDS", "description": value["release_note"]}, sort_keys=True).encode()
+    print(f"cache-key hash over {len(key_payload)} bytes:")
+    for algorithm in KEY_HASHES:
+        try:
+            hash_bytes(b"", algorithm)
+        except ValueError:
+            print(f"  {algorithm:<8} (library not installed)")
+            continue
+        print(f"  {algorithm:<8} {_per_op_us(lambda: hash_bytes(key_payload, algorithm), args.number):.2f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Benchmark model_service micro-batching: throughput vs latency.
+
+Runs in-process (no server needed) against the stub generator with a
+simulated model cost per forward pass:
+
+    cost(batch) = --batch-overhead-ms + --per-item-ms * batch size
+
+Real models look like this: a fixed per-pass cost (weights read, kernel
+launches) plus a smaller marginal cost per extra sequence. For each
+concurrency level, `--concurrency` clients send requests back to back
+(closed loop), first one model call per request ("off"), then through
+MicroBatcher with each --max-wait-ms value.
+
+Reported per row: requests/s, p50/p95 latency in ms and mean batch size.
+
+Usage (from project root):
+
+    PYTHONPATH=src python scripts/bench_model_batching.py
+    PYTHONPATH=src python scripts/bench_model_batching.py --concurrency 1 8 32 --max-wait-ms 2 10 --max-batch-size 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import List, Optional
+
+from model_service.batcher import MicroBatcher
+from model_service.generator import StubGenerator
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+async def _run(generator: StubGenerator, batcher: Optional[MicroBatcher], concurrency: int, requests: int):
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+
+    async def client(worker: int) -> None:
+        for i in range(requests // concurrency):
+            started = time.perf_counter()
+            prompt = f"Summarize change {worker}-{i}"
+            if batcher is None:
+                await loop.run_in_executor(None, generator.generate, prompt)
+            else:
+                await batcher.submit(prompt)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(w) for w in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return len(latencies) / elapsed, statistics.median(latencies), _percentile(latencies, 95)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark model_service micro-batching.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=256, help="Requests per concurrency level.")
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=float, nargs="+", default=[2.0, 5.0, 20.0])
+    parser.add_argument("--batch-overhead-ms", type=float, default=20.0)
+    parser.add_argument("--per-item-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    generator = StubGenerator(
+        use_mock=True, batch_overhead_ms=args.batch_overhead_ms, per_item_ms=args.per_item_ms
+    )
+    print(
+        f"stub cost: {args.batch_overhead_ms} ms/batch + {args.per_item_ms} ms/item, "
+        f"max_batch_size={args.max_batch_size}, {args.requests} requests per row"
+    )
+    print(f"{'conc':>5} {'mode':<12} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'batch':>6}")
+
+    for concurrency in args.concurrency:
+        rps, p50, p95 = asyncio.run(_run(generator, None, concurrency, args.requests))
+        print(f"{concurrency:>5} {'off':<12} {rps:>8.1f} {p50:>8.1f} {p95:>8.1f} {1.0:>6.1f}")
+        for max_wait_ms in args.max_wait_ms:
+            batcher = MicroBatcher(generator.generate_batch, args.max_batch_size, max_wait_ms)
+            rps, p50, p95 = asyncio.run(_run(generator, batcher, concurrency, args.requests))
+            mode = f"wait={max_wait_ms:g}ms"
+            print(f"{concurrency:>5} {mode:<12} {rps:>8.1f} {p50:>8.1f} {p95:>8.1f} {batcher.mean_batch_size:>6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
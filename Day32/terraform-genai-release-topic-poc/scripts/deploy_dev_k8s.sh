@@ -31,6 +31,8 @@ envsubst < k8s/base/app-configmap.yaml | kubectl apply -f -
 
 # Workloads
 envsubst < k8s/base/api-deployment.yaml          | kubectl apply -f -
+envsubst < k8s/base/worker-deployment.yaml       | kubectl apply -f -
+envsubst < k8s/base/greeting-prewarm-cronjob.yaml | kubectl apply -f -
 envsubst < k8s/base/model-service-deployment.yaml | kubectl apply -f -
 envsubst < k8s/base/ui-deployment.yaml           | kubectl apply -f -
 
@@ -0,0 +1,337 @@
+"""
+Open-loop load test for the Day32 API (release notes + greetings).
+
+Requests arrive as a Poisson process at --rate requests/s for --duration
+seconds, whether or not earlier ones have finished (open loop). That is
+how real traffic behaves, so overload shows up as growing latency and
+errors instead of a quietly lower request rate. Latency is measured from
+each request's scheduled arrival time, so a stalled client loop cannot
+hide queueing (no coordinated omission).
+
+By default the whole stack runs in this process with local stand-ins:
+- the real API app (app.main), called over ASGI;
+- the real model_service app with the stub engine, which adds latency
+  sampled from --model-latency (e.g. lognormal:150:0.5);
+- fakeredis in place of Redis (one in-process server shared by the sync
+  and async caches).
+With --target the same load is sent to a running deployment instead.
+
+Requests are drawn from --keys distinct payloads per endpoint, with a Zipf
+skew (--zipf, 0 = uniform), so the cache hit ratio depends on the key
+space the way it does in production.
+
+Reported per endpoint and in total:
+- throughput (successful requests/s);
+- p50/p95/p99 latency in ms;
+- cache hit ratio (`cached` in the response);
+- error rate (non-2xx responses, timeouts, connection errors).
+Use --json-out to save a run and --compare to print the deltas against a
+saved run.
+
+Settings come from the environment as usual (e.g.
+LLM_SCHEDULER_MAX_CONCURRENCY=4, SEMANTIC_CACHE_ENABLED=true,
+MODEL_SERVICE_BATCH_ENABLED=true). The local stack needs fakeredis (dev
+dependency).
+
+Usage (from project root):
+
+    PYTHONPATH=src python scripts/load_test.py
+    PYTHONPATH=src python scripts/load_test.py --rate 200 --duration 30 --model-latency lognormal:150:0.5 --keys 500
+    PYTHONPATH=src python scripts/load_test.py --json-out before.json
+    PYTHONPATH=src python scripts/load_test.py --json-out after.json --compare before.json
+    PYTHONPATH=src python scripts/load_test.py --target http://localhost:8000 --rate 20
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+ENDPOINTS = {
+    "release-notes": "/api/v1/release-notes/generate",
+    "greeting": "/api/v1/greeting/generate",
+}
+
+
+# ------------------------
+# Latency distributions
+# ------------------------
+
+
+def parse_distribution(spec: str, rng: random.Random) -> Callable[[], float]:
+    """
+    Latency sampler (milliseconds) from a spec string:
+
+        const:MS | uniform:LOW:HIGH | normal:MEAN:STDDEV | exp:MEAN | lognormal:MEDIAN:SIGMA
+    """
+    name, *raw = spec.split(":")
+    params = [float(p) for p in raw]
+    samplers: Dict[str, Callable[..., Callable[[], float]]] = {
+        "const": lambda ms: lambda: ms,
+        "uniform": lambda low, high: lambda: rng.uniform(low, high),
+        "normal": lambda mean, stddev: lambda: max(0.0, rng.gauss(mean, stddev)),
+        "exp": lambda mean: lambda: rng.expovariate(1.0 / mean),
+        "lognormal": lambda median, sigma: lambda: rng.lognormvariate(math.log(median), sigma),
+    }
+    if name not in samplers:
+        raise ValueError(f"Unknown distribution '{name}'. Expected one of: {', '.join(samplers)}.")
+    try:
+        return samplers[name](*params)
+    except TypeError as exc:
+        raise ValueError(f"Wrong number of parameters in '{spec}'.") from exc
+
+
+# ------------------------
+# Workload
+# ------------------------
+
+
+def _payloads(endpoint: str, keys: int) -> List[Dict[str, Any]]:
+    if endpoint == "release-notes":
+        return [
+            {
+                "title": f"Improve service {i} error handling",
+                "description": f"Service {i} now retries transient failures and reports clearer errors.",
+                "risk_level": ("low", "medium", "high")[i % 3],
+            }
+            for i in range(keys)
+        ]
+    return [
+        {"name": f"User {i}", "date_of_birth": f"19{70 + i % 30}-{1 + i % 12:02d}-{1 + i % 28:02d}"}
+        for i in range(keys)
+    ]
+
+
+def _zipf_cum_weights(n: int, s: float) -> List[float]:
+    return list(itertools.accumulate(1.0 / (rank ** s) for rank in range(1, n + 1)))
+
+
+@dataclass
+class _Result:
+    endpoint: str
+    latency_ms: float
+    ok: bool
+    cached: bool = False
+    status: Optional[int] = None
+
+
+@dataclass
+class _Run:
+    results: List[_Result] = field(default_factory=list)
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+async def _one(client: httpx.AsyncClient, run: _Run, endpoint: str, payload: Dict[str, Any], scheduled: float) -> None:
+    run.in_flight += 1
+    run.max_in_flight = max(run.max_in_flight, run.in_flight)
+    try:
+        response = await client.post(ENDPOINTS[endpoint], json=payload)
+        ok = response.is_success
+        cached = bool(ok and response.json().get("cached"))
+        status: Optional[int] = response.status_code
+    except Exception:  # noqa: BLE001 - timeouts / connection errors count as errors
+        ok, cached, status = False, False, None
+    finally:
+        run.in_flight -= 1
+    run.results.append(_Result(endpoint, (time.perf_counter() - scheduled) * 1000, ok, cached, status))
+
+
+async def run_load(client: httpx.AsyncClient, args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    pools = {endpoint: _payloads(endpoint, args.keys) for endpoint in ENDPOINTS}
+    cum_weights = _zipf_cum_weights(args.keys, args.zipf)
+    run = _Run()
+    tasks = []
+
+    started = time.perf_counter()
+    next_arrival = started
+    while next_arrival < started + args.duration:
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        endpoint = "greeting" if rng.random() < args.greeting_ratio else "release-notes"
+        payload = rng.choices(pools[endpoint], cum_weights=cum_weights)[0]
+        tasks.append(asyncio.ensure_future(_one(client, run, endpoint, payload, next_arrival)))
+        next_arrival += rng.expovariate(args.rate)
+    sent_seconds = time.perf_counter() - started
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("json_out", "compare")},
+        "offered_rps": round(len(tasks) / sent_seconds, 1),
+        "elapsed_seconds": round(elapsed, 2),
+        "max_in_flight": run.max_in_flight,
+        "endpoints": {},
+    }
+    for endpoint in ENDPOINTS:
+        report["endpoints"][endpoint] = _summarize([r for r in run.results if r.endpoint == endpoint], elapsed)
+    report["total"] = _summarize(run.results, elapsed)
+    return report
+
+
+def _summarize(results: List[_Result], elapsed: float) -> Dict[str, Any]:
+    ok = [r for r in results if r.ok]
+    latencies = sorted(r.latency_ms for r in ok)
+    statuses: Dict[str, int] = {}
+    for r in results:
+        if not r.ok:
+            key = str(r.status) if r.status is not None else "exception"
+            statuses[key] = statuses.get(key, 0) + 1
+    return {
+        "requests": len(results),
+        "throughput_rps": round(len(ok) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "hit_ratio": round(sum(r.cached for r in ok) / len(ok), 3) if ok else 0.0,
+        "error_rate": round(1 - len(ok) / len(results), 4) if results else 0.0,
+        "errors": statuses,
+    }
+
+
+def _percentile(ordered: List[float], pct: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))], 1)
+
+
+# ------------------------
+# Local stand-in stack
+# ------------------------
+
+
+def build_local_client(args: argparse.Namespace) -> httpx.AsyncClient:
+    """The API app in-process, backed by fakeredis and the stub model_service with sampled latency."""
+    import fakeredis
+    import fakeredis.aioredis
+
+    # Real provider path (oss -> model_service) so the stub latency is actually paid.
+    for name, value in {
+        "USE_MOCK_LLM": "false",
+        "LLM_DEFAULT_PROVIDER": "oss",
+        "OPENAI_API_KEY": "",
+        "MODEL_SERVICE_BASE_URL": "http://model-service",
+        "REDIS_L1_INVALIDATION": "none",
+        "JOBS_API_WORKERS": "0",
+        # One local client would hit its own buckets; set RATE_LIMIT_ENABLED=true to measure 429s.
+        "RATE_LIMIT_ENABLED": "false",
+    }.items():
+        os.environ.setdefault(name, value)
+
+    import core.services
+
+    server = fakeredis.FakeServer()
+    core.services.build_redis_client = lambda settings: fakeredis.FakeRedis(server=server)
+    core.services.build_async_redis_client = lambda settings: fakeredis.aioredis.FakeRedis(server=server)
+
+    import app.main as api_main
+    import model_service.main as model_main
+    from model_service.generator import StubGenerator
+
+    model_main.engine = StubGenerator(
+        use_mock=False,
+        latency_ms=parse_distribution(args.model_latency, random.Random(args.seed + 1)),
+    )
+    # model_main.batcher runs batches on model_main.engine, so it picks up the stub too.
+    # Same injection point as LLMClient(async_http_client=...): model_service over ASGI.
+    api_main.llm_client._async_http_client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=model_main.app),
+        base_url=api_main.settings.model_service_base_url,
+        timeout=api_main.settings.model_service_timeout_seconds,
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=api_main.app), base_url="http://api", timeout=args.timeout)
+
+
+# ------------------------
+# Output
+# ------------------------
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    print(
+        f"offered {report['offered_rps']} req/s for {report['config']['duration']}s, "
+        f"elapsed {report['elapsed_seconds']}s, max in flight {report['max_in_flight']}"
+    )
+    print(f"{'endpoint':<14} {'reqs':>6} {'ok/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'hit':>6} {'err':>7}")
+    rows = [*report["endpoints"].items(), ("total", report["total"])]
+    for name, row in rows:
+        print(
+            f"{name:<14} {row['requests']:>6} {row['throughput_rps']:>8.1f} {_fmt(row['p50_ms'])} "
+            f"{_fmt(row['p95_ms'])} {_fmt(row['p99_ms'])} {row['hit_ratio']:>6.1%} {row['error_rate']:>7.2%}"
+        )
+        if row["errors"]:
+            print(f"{'':<14} errors: {row['errors']}")
+    if baseline is not None:
+        print("\nvs baseline (total):")
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "hit_ratio", "error_rate"):
+            before, after = baseline["total"].get(metric), report["total"].get(metric)
+            if before is None or after is None:
+                continue
+            change = f" ({(after - before) / before:+.1%})" if before else ""
+            print(f"  {metric:<15} {before:>10} -> {after:<10}{change}")
+
+
+def _fmt(value: Optional[float]) -> str:
+    return f"{value:>8.1f}" if value is not None else f"{'-':>8}"
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Open-loop load test for the Day32 API.")
+    parser.add_argument("--rate", type=float, default=50.0, help="Mean arrival rate (requests/s, Poisson).")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to generate arrivals for.")
+    parser.add_argument("--greeting-ratio", type=float, default=0.5, help="Share of requests that are greetings.")
+    parser.add_argument("--keys", type=int, default=200, help="Distinct payloads per endpoint.")
+    parser.add_argument("--zipf", type=float, default=1.0, help="Key popularity skew (0 = uniform).")
+    parser.add_argument(
+        "--model-latency", default="lognormal:100:0.5", help="Stub model latency distribution (local stack)."
+    )
+    parser.add_argument("--timeout", type=float, default=30.0, help="Client timeout per request (seconds).")
+    parser.add_argument("--seed", type=int, default=32)
+    parser.add_argument("--target", help="Base URL of a running API instead of the in-process stack.")
+    parser.add_argument("--json-out", help="Write the report as JSON (for --compare in a later run).")
+    parser.add_argument("--compare", help="Print deltas against a report saved with --json-out.")
+    parser.add_argument("--log-level", default="WARNING", help="Log level of the in-process stack.")
+    args = parser.parse_args(argv)
+    parse_distribution(args.model_latency, random.Random())  # validate early
+    logging.basicConfig(level=args.log_level)
+    logging.getLogger().setLevel(args.log_level)
+
+    if args.target:
+        client = httpx.AsyncClient(
+            base_url=args.target,
+            timeout=args.timeout,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=100),
+        )
+    else:
+        client = build_local_client(args)
+
+    async def _main() -> Dict[str, Any]:
+        async with client:
+            return await run_load(client, args)
+
+    report = asyncio.run(_main())
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
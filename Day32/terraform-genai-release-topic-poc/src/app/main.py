@@ -1,35 +1,247 @@
 # src/app/main.py
-from fastapi import FastAPI, Query
+import logging
+import secrets
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+import anyio
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from config.settings import get_settings
+from core.cache_policy import CachePolicy, invalidate_matching
+from core.cache_stats import sample_keyspace
+from core.freshness import BackgroundRefresher, FreshnessPolicy
+from core.jobs import JobQueue, JobWorkerPool
 from core.llm_client import LLMClient
 from core.models import (
+    CacheInvalidateRequest,
+    CacheInvalidateResponse,
     GreetingRequest,
     GreetingResponse,
     HealthResponse,
+    JobStatus,
+    JobStatusResponse,
+    JobSubmitResponse,
     ModelProvider,
     ReleaseNoteRequest,
     ReleaseNoteResponse,
 )
-from core.services import GreetingService, RedisCache, ReleaseNotesService
+from core.rate_limit import RateLimitExceeded, build_rate_limiter, estimate_cost, resolve_client_id
+from core.redis_pool import build_jobs_redis_client
+from core.scheduler import DEFAULT_TENANT, DeadlineExceeded, build_scheduler, current_tenant
+from core.semantic_cache import SemanticIndex
+from core.services import AsyncRedisCache, GreetingService, RedisCache, ReleaseNotesService
+from core.single_flight import AsyncSingleFlight, SingleFlight
+from core.sse import SSE_MEDIA_TYPE, format_sse
+
+logger = logging.getLogger(__name__)
 
 # Initialize shared components (simple "poor man's DI container")
 settings = get_settings()
-llm_client = LLMClient(settings)
+# Priority classes + per-tenant fair queueing in front of real LLM calls.
+llm_scheduler = build_scheduler(settings)
+llm_client = LLMClient(settings, scheduler=llm_scheduler)
 redis_cache = RedisCache(settings=settings)
+# Per-client token buckets on the LLM-backed endpoints (shared across pods via Redis).
+rate_limiter = build_rate_limiter(settings, redis_cache.client)
+# Async endpoints use redis.asyncio; sharing L1 keeps sync and async paths coherent.
+async_redis_cache = AsyncRedisCache(
+    settings=settings,
+    l1=redis_cache.l1,
+    stats=redis_cache.stats,
+    publish_invalidations=settings.redis_l1_invalidation == "pubsub",
+)
+single_flight = (
+    SingleFlight(
+        cache=redis_cache,
+        lock_ttl_ms=settings.single_flight_lock_ttl_ms,
+        wait_timeout_seconds=settings.single_flight_wait_timeout_seconds,
+    )
+    if settings.single_flight_enabled
+    else None
+)
+async_single_flight = (
+    AsyncSingleFlight(
+        cache=async_redis_cache,
+        lock_ttl_ms=settings.single_flight_lock_ttl_ms,
+        wait_timeout_seconds=settings.single_flight_wait_timeout_seconds,
+    )
+    if settings.single_flight_enabled
+    else None
+)
+semantic_index = (
+    SemanticIndex(
+        cache=redis_cache,
+        threshold=settings.semantic_cache_threshold,
+        num_perm=settings.semantic_cache_num_perm,
+        bands=settings.semantic_cache_bands,
+    )
+    if settings.semantic_cache_enabled
+    else None
+)
+cache_refresher = BackgroundRefresher(
+    cache=redis_cache,
+    max_workers=settings.cache_refresh_max_workers,
+)
+# What gets cached and for how long (negative caching, per-provider/model TTLs).
+cache_policy = CachePolicy(
+    negative_ttl_seconds=settings.cache_negative_ttl_seconds,
+    ttl_overrides=settings.cache_ttl_overrides,
+)
 
 release_notes_service = ReleaseNotesService(
     settings=settings,
     llm_client=llm_client,
     cache=redis_cache,
+    single_flight=single_flight,
+    freshness=FreshnessPolicy(
+        soft_ttl_seconds=settings.release_notes_cache_soft_ttl_seconds,
+        stale_ttl_seconds=settings.release_notes_cache_stale_ttl_seconds,
+        xfetch_beta=settings.release_notes_cache_xfetch_beta,
+    ),
+    refresher=cache_refresher,
+    semantic_index=semantic_index,
+    async_cache=async_redis_cache,
+    async_single_flight=async_single_flight,
+    cache_policy=cache_policy,
 )
 
 greeting_service = GreetingService(
     settings=settings,
     llm_client=llm_client,
     cache=redis_cache,
+    single_flight=single_flight,
+    freshness=FreshnessPolicy(
+        soft_ttl_seconds=settings.greeting_cache_soft_ttl_seconds,
+        stale_ttl_seconds=settings.greeting_cache_stale_ttl_seconds,
+        xfetch_beta=settings.greeting_cache_xfetch_beta,
+    ),
+    refresher=cache_refresher,
+    async_cache=async_redis_cache,
+    async_single_flight=async_single_flight,
+    cache_policy=cache_policy,
+)
+
+
+job_queue = JobQueue(
+    build_jobs_redis_client(settings),
+    result_ttl_seconds=settings.jobs_result_ttl_seconds,
+    visibility_timeout_seconds=settings.jobs_visibility_timeout_seconds,
+    max_attempts=settings.jobs_max_attempts,
 )
 
+
+def run_release_notes_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Job handler: the normal (cached, coalesced) sync generation path."""
+    current_tenant.set(payload.get("tenant") or DEFAULT_TENANT)  # worker threads: one job at a time
+    provider = ModelProvider(payload["provider"]) if payload.get("provider") else None
+    response = release_notes_service.generate_release_notes(
+        request=ReleaseNoteRequest(**payload["request"]),
+        provider=provider,
+    )
+    return response.dict()
+
+
+job_handlers = {"release-notes": run_release_notes_job}
+
+
+async def bind_tenant(
+    x_tenant_id: Optional[str] = Header(
+        default=None,
+        description="Tenant for LLM fair queueing (LLM_SCHEDULER_TENANT_WEIGHTS).",
+    ),
+) -> None:
+    """Make the caller's tenant visible to the LLM scheduler for this request."""
+    current_tenant.set((x_tenant_id or "").strip() or DEFAULT_TENANT)
+
+
+def require_cache_admin(
+    x_admin_key: Optional[str] = Header(default=None, description="CACHE_ADMIN_KEY (bulk cache operations)."),
+) -> None:
+    """Gate operator-only endpoints: 403 while CACHE_ADMIN_KEY is unset, 401 on a wrong key."""
+    if not settings.cache_admin_key:
+        raise HTTPException(status_code=403, detail="Bulk cache invalidation is disabled (CACHE_ADMIN_KEY unset).")
+    if not secrets.compare_digest((x_admin_key or "").encode(), settings.cache_admin_key.encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Key.")
+
+
+def _client_id(request: Request, api_key: Optional[str]) -> str:
+    return resolve_client_id(
+        api_key,
+        peer_host=request.client.host if request.client else None,
+        forwarded_for=request.headers.get("x-forwarded-for"),
+        api_keys=settings.rate_limit_api_keys,
+        trusted_proxy_hops=settings.rate_limit_trusted_proxy_hops,
+    )
+
+
+def rate_limited(endpoint: str, cost_of: Optional[Callable[[Dict[str, Any]], float]] = None) -> Callable:
+    """
+    Dependency enforcing the caller's token bucket for `endpoint`.
+
+    Allowed requests get RateLimit-* headers (also kept on
+    `request.state.rate_limit_headers` for endpoints that build their own
+    Response); rejected ones raise RateLimitExceeded (429).
+    `cost_of(json body)` weights expensive requests.
+    The local pre-check runs inline; only a Redis round trip goes to a thread.
+    """
+
+    async def enforce(
+        request: Request,
+        response: Response,
+        x_api_key: Optional[str] = Header(
+            default=None,
+            description="Rate-limit API key (RATE_LIMIT_API_KEYS); unknown keys share one bucket, none = client IP.",
+        ),
+    ) -> None:
+        if rate_limiter is None:
+            return
+        cost = 1.0
+        if cost_of is not None:
+            try:
+                payload = await request.json()
+            except ValueError:
+                payload = None
+            cost = cost_of(payload) if isinstance(payload, dict) else 1.0
+        client_id = _client_id(request, x_api_key)
+        result = rate_limiter.precheck(endpoint, client_id, cost)
+        if result is None:
+            result = await anyio.to_thread.run_sync(rate_limiter.acquire, endpoint, client_id, cost)
+        if result is None:
+            return
+        if not result.allowed:
+            raise RateLimitExceeded(endpoint, result)
+        request.state.rate_limit_headers = result.headers()
+        response.headers.update(request.state.rate_limit_headers)
+
+    return enforce
+
+
+def _release_notes_cost(payload: Dict[str, Any]) -> float:
+    return estimate_cost(str(payload.get("description") or ""), settings.rate_limit_tokens_per_cost_unit)
+
+
+release_notes_rate_limit = Depends(rate_limited("release-notes", _release_notes_cost))
+greeting_rate_limit = Depends(rate_limited("greeting"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start in-API job workers if configured; close pooled connections on shutdown."""
+    api_workers: Optional[JobWorkerPool] = None
+    if settings.jobs_api_workers > 0:
+        api_workers = JobWorkerPool(
+            job_queue, job_handlers, pool_size=settings.jobs_api_workers, block_ms=settings.jobs_claim_block_ms
+        )
+        api_workers.start()
+    yield
+    if api_workers is not None:
+        await anyio.to_thread.run_sync(api_workers.stop, 5.0)
+    await llm_client.aclose()
+    await async_redis_cache.aclose()
+
+
 app = FastAPI(
     title="Day32 GenAI Release Notes API (d32-release)",
     version="0.1.0",
@@ -39,9 +251,24 @@ app = FastAPI(
         "- Provides greeting generation (birthday-aware) via LLM.\n"
         "- Uses Redis for caching responses.\n"
     ),
+    lifespan=lifespan,
+    dependencies=[Depends(bind_tenant)],
 )
 
 
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded) -> JSONResponse:
+    """LLM capacity is saturated for this workload: shed load with a retryable 503."""
+    logger.warning("Dropped %s request: %s", exc.workload, exc)
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+    """The caller's bucket for this endpoint is empty: 429 with RateLimit-* and Retry-After headers."""
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers=exc.result.headers())
+
+
 # ------------------------
 # Health Endpoint
 # ------------------------
@@ -64,6 +291,78 @@ def health() -> HealthResponse:
     )
 
 
+@app.get("/api/v1/scheduler/stats", summary="LLM scheduler queue depth, grants and drops per class.")
+def scheduler_stats() -> Dict[str, Any]:
+    if llm_scheduler is None:
+        return {"enabled": False}
+    return {"enabled": True, **llm_scheduler.stats()}
+
+
+@app.get("/api/v1/rate-limit/stats", summary="Rate limiter backend, Redis calls and local pre-check rejections.")
+def rate_limit_stats() -> Dict[str, Any]:
+    if rate_limiter is None:
+        return {"enabled": False}
+    return {"enabled": True, **rate_limiter.stats()}
+
+
+@app.get("/api/v1/cache/stats", summary="Cache hit/miss/bypass counters and a sampled key-space breakdown.")
+def cache_stats(
+    sample_keys: Optional[int] = Query(
+        default=None,
+        ge=0,
+        le=100000,
+        description="Keys to sample with SCAN (0 = counters only; default CACHE_STATS_SAMPLE_MAX_KEYS).",
+    ),
+) -> Dict[str, Any]:
+    """
+    - counters: this pod's per-namespace L1/Redis hits, misses, bypasses,
+      writes and errors since start (sum across pods for the fleet).
+    - keyspace: per-namespace key count, bytes and TTL histogram from a
+      bounded SCAN sample of `d32-release:*` (exact when `complete`).
+    """
+    max_keys = settings.cache_stats_sample_max_keys if sample_keys is None else sample_keys
+    keyspace = None
+    if max_keys > 0:
+        try:
+            keyspace = sample_keyspace(redis_cache.client, max_keys=max_keys, scan_count=settings.cache_stats_scan_count)
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Cache key-space sampling failed: %s", exc)
+    return {
+        "counters": redis_cache.stats.snapshot(),
+        "l1": redis_cache.l1.snapshot() if redis_cache.l1 is not None else None,
+        "keyspace": keyspace,
+    }
+
+
+@app.post(
+    "/api/v1/cache/invalidate",
+    response_model=CacheInvalidateResponse,
+    summary="Drop cached responses of a namespace, optionally by provider/model (requires X-Admin-Key).",
+    dependencies=[Depends(require_cache_admin)],
+)
+def invalidate_cache(body: CacheInvalidateRequest) -> CacheInvalidateResponse:
+    result = invalidate_matching(redis_cache, body.namespace.value, provider=body.provider, model=body.model)
+    return CacheInvalidateResponse(**result)
+
+
+@app.post(
+    "/api/v1/release-notes/cache/invalidate",
+    response_model=CacheInvalidateResponse,
+    summary="Drop the cached response for one release-notes request.",
+)
+def invalidate_release_notes(body: ReleaseNoteRequest) -> CacheInvalidateResponse:
+    return CacheInvalidateResponse(deleted=release_notes_service.invalidate(body))
+
+
+@app.post(
+    "/api/v1/greeting/cache/invalidate",
+    response_model=CacheInvalidateResponse,
+    summary="Drop the cached greetings (both birthday-month variants) for one person.",
+)
+def invalidate_greeting(body: GreetingRequest) -> CacheInvalidateResponse:
+    return CacheInvalidateResponse(deleted=greeting_service.invalidate(body))
+
+
 # ------------------------
 # Release Notes Endpoint
 # ------------------------
@@ -73,8 +372,9 @@ def health() -> HealthResponse:
     "/api/v1/release-notes/generate",
     response_model=ReleaseNoteResponse,
     summary="Generate release notes + test scenarios from a change description.",
+    dependencies=[release_notes_rate_limit],
 )
-def generate_release_notes(
+async def generate_release_notes(
     body: ReleaseNoteRequest,
     provider: ModelProvider | None = Query(
         default=None,
@@ -96,12 +396,126 @@ def generate_release_notes(
         - mock     -> if USE_MOCK_LLM=true or providers are unavailable.
     4. Parse text into ReleaseNoteResponse, store in cache, and return.
     """
-    return release_notes_service.generate_release_notes(
+    return await release_notes_service.agenerate_release_notes(
         request=body,
         provider=provider,
     )
 
 
+@app.post(
+    "/api/v1/release-notes/generate/stream",
+    summary="Stream release notes as they are generated (Server-Sent Events).",
+    dependencies=[release_notes_rate_limit],
+)
+async def stream_release_notes(
+    request: Request,
+    body: ReleaseNoteRequest,
+    provider: ModelProvider | None = Query(
+        default=None,
+        description="Optional provider override: 'openai' or 'oss'.",
+    ),
+) -> StreamingResponse:
+    """
+    Same as /api/v1/release-notes/generate, streamed:
+
+        event: delta   data: {"text": "<partial text>"}   (repeated, cache misses only)
+        event: field   data: {"name": "test_scenarios", "value": "...", "index": 0}
+                       (structured output: each field / list item once complete;
+                       index is null for a whole field)
+        event: result  data: <ReleaseNoteResponse>          (last event)
+        event: error   data: {"detail": "..."}
+
+    The final parsed response is cached as usual, so a repeat request gets
+    a single `result` event straight from Redis.
+    """
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event, data in release_notes_service.astream_release_notes(request=body, provider=provider):
+                yield format_sse(event, data)
+        except Exception as exc:  # noqa: BLE001 - headers are already sent; report in-band
+            logger.warning("Release notes stream failed: %s", exc)
+            yield format_sse("error", {"detail": "Release note generation failed."})
+
+    headers = {"Cache-Control": "no-cache", **getattr(request.state, "rate_limit_headers", {})}
+    return StreamingResponse(events(), media_type=SSE_MEDIA_TYPE, headers=headers)
+
+
+# ------------------------
+# Async Job Endpoints
+# ------------------------
+
+
+@app.post(
+    "/api/v1/release-notes/jobs",
+    response_model=JobSubmitResponse,
+    status_code=202,
+    summary="Queue release-note generation and return a job id immediately.",
+    dependencies=[release_notes_rate_limit],
+)
+async def submit_release_notes_job(
+    body: ReleaseNoteRequest,
+    provider: ModelProvider | None = Query(
+        default=None,
+        description="Optional provider override: 'openai' or 'oss'.",
+    ),
+) -> JobSubmitResponse:
+    """
+    Job mode for /api/v1/release-notes/generate.
+
+    The request is queued in Redis and processed by job workers, so the
+    HTTP connection is not held open for the LLM call (no load-balancer
+    timeouts on slow models). Poll GET /jobs/{job_id} for the result.
+    """
+    payload = {
+        "request": body.dict(),
+        "provider": provider.value if provider else None,
+        "tenant": current_tenant.get(),
+    }
+    try:
+        job = await anyio.to_thread.run_sync(job_queue.submit, "release-notes", payload)
+    except Exception as exc:  # noqa: BLE001 - the queue needs Redis; there is no local fallback
+        logger.warning("Job submit failed: %s", exc)
+        raise HTTPException(status_code=503, detail="Job queue unavailable.") from exc
+    return JobSubmitResponse(job_id=job["job_id"], status=job["status"], status_url=f"/jobs/{job['job_id']}")
+
+
+@app.get(
+    "/jobs/{job_id}",
+    response_model=JobStatusResponse,
+    summary="Get a job's status and result (optionally long-poll until it finishes).",
+)
+async def get_job(
+    job_id: str,
+    wait: float = Query(
+        default=0.0,
+        ge=0.0,
+        le=30.0,
+        description="Seconds to wait for the job to finish before answering (long poll).",
+    ),
+) -> JobStatusResponse:
+    """
+    Return the job record; 404 if unknown or expired (JOBS_RESULT_TTL_SECONDS).
+
+    With `wait`, the call returns as soon as the job is 'succeeded' or
+    'failed', or after `wait` seconds with the current status. Clients with
+    Redis access can instead subscribe to `d32-release:job-done:<job_id>`.
+    """
+    deadline = anyio.current_time() + wait
+    while True:
+        try:
+            job = await anyio.to_thread.run_sync(job_queue.get, job_id)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Job lookup failed: %s", exc)
+            raise HTTPException(status_code=503, detail="Job queue unavailable.") from exc
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found.")
+        finished = job["status"] in (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value)
+        if finished or anyio.current_time() >= deadline:
+            return JobStatusResponse(**job)
+        await anyio.sleep(min(0.25, max(0.0, deadline - anyio.current_time())))
+
+
 # ------------------------
 # Greeting Endpoint
 # ------------------------
@@ -111,8 +525,9 @@ def generate_release_notes(
     "/api/v1/greeting/generate",
     response_model=GreetingResponse,
     summary="Generate a greeting message (birthday-aware) via LLM.",
+    dependencies=[greeting_rate_limit],
 )
-def generate_greeting(
+async def generate_greeting(
     body: GreetingRequest,
 ) -> GreetingResponse:
     """
@@ -128,4 +543,4 @@ def generate_greeting(
     - body.provider if given (openai/oss),
     - otherwise settings.llm_default_provider.
     """
-    return greeting_service.generate_greeting(request=body)
+    return await greeting_service.agenerate_greeting(request=body)
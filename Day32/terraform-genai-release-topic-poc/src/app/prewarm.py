@@ -0,0 +1,62 @@
+# src/app/prewarm.py
+"""
+Greeting pre-warm job: shortly before the 1st of a month, generate the
+greetings whose birthday-month flag is about to flip (see
+GreetingService.prewarm_month_boundary).
+
+    PYTHONPATH=src python -m app.prewarm [--boundary YYYY-MM-01] [--force]
+
+Meant to run hourly (k8s CronJob); it does nothing outside the last
+GREETING_PREWARM_LEAD_HOURS before a boundary, and a per-boundary Redis
+lock makes sure only one run warms each boundary.
+"""
+
+import argparse
+import logging
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from app.main import greeting_service, redis_cache, settings
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "d32-release:greeting:prewarm:"
+
+
+def next_boundary(now: datetime) -> date:
+    """The next 1st-of-month after `now`."""
+    return date(now.year + now.month // 12, now.month % 12 + 1, 1)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--boundary", type=date.fromisoformat, help="Month boundary to warm (default: the next 1st).")
+    parser.add_argument("--force", action="store_true", help="Run outside the lead window and ignore the lock.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    now = datetime.now()
+    boundary = args.boundary or next_boundary(now)
+    until = datetime(boundary.year, boundary.month, boundary.day) - now
+    if not args.force:
+        if until > timedelta(hours=settings.greeting_prewarm_lead_hours) or until <= timedelta(0):
+            logger.info("Next boundary %s is %s away; outside the pre-warm window.", boundary, until)
+            return 0
+        # Held until it expires (after the boundary), so later hourly runs skip this boundary.
+        lock_ttl_ms = int((until + timedelta(hours=1)).total_seconds() * 1000)
+        if not redis_cache.acquire_lock(f"{LOCK_PREFIX}{boundary.isoformat()}", uuid.uuid4().hex, lock_ttl_ms):
+            logger.info("Boundary %s already pre-warmed (or in progress).", boundary)
+            return 0
+
+    counts = greeting_service.prewarm_month_boundary(
+        boundary,
+        max_workers=settings.greeting_prewarm_max_workers,
+        max_items=settings.greeting_prewarm_max_items,
+    )
+    logger.info("Pre-warmed greetings for %s: %s", boundary, counts)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
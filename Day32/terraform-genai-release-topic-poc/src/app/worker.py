@@ -0,0 +1,38 @@
+# src/app/worker.py
+"""
+Job worker process: consumes the Redis job queue (core.jobs) and runs the
+same services as the API.
+
+    PYTHONPATH=src python -m app.worker
+
+Scale it independently of the API: JOBS_WORKER_POOL_SIZE threads per
+process, and as many worker replicas as the model backend can take.
+"""
+
+import logging
+import signal
+import threading
+
+from app.main import job_handlers, job_queue, settings
+from core.jobs import JobWorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    pool = JobWorkerPool(
+        job_queue, job_handlers, pool_size=settings.jobs_worker_pool_size, block_ms=settings.jobs_claim_block_ms
+    )
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    pool.start()
+    stop.wait()
+    logger.info("Stopping job workers; unfinished jobs will be re-delivered.")
+    pool.stop(timeout=settings.jobs_visibility_timeout_seconds)
+
+
+if __name__ == "__main__":
+    main()
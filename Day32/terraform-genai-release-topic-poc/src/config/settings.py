@@ -1,6 +1,6 @@
 # src/config/settings.py
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseSettings, Field
 
@@ -45,6 +45,196 @@ class Settings(BaseSettings):
         env="REDIS_URL",
         description="Redis connection URL (ElastiCache in AWS).",
     )
+    redis_max_connections: int = Field(
+        default=50,
+        env="REDIS_MAX_CONNECTIONS",
+        description="Max Redis connections per process (per client: sync and async pools are separate).",
+    )
+    redis_pool_timeout_seconds: float = Field(
+        default=1.0,
+        env="REDIS_POOL_TIMEOUT_SECONDS",
+        description="Max time to wait for a free pooled connection before failing.",
+    )
+    redis_socket_timeout_seconds: float = Field(
+        default=0.5,
+        env="REDIS_SOCKET_TIMEOUT_SECONDS",
+        description="Read/write timeout per Redis command; on timeout the cache acts as a miss.",
+    )
+    redis_socket_connect_timeout_seconds: float = Field(
+        default=0.5,
+        env="REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS",
+        description="TCP connect timeout for new Redis connections.",
+    )
+    redis_health_check_interval_seconds: int = Field(
+        default=30,
+        env="REDIS_HEALTH_CHECK_INTERVAL_SECONDS",
+        description="PING idle pooled connections older than this before reuse (0 disables).",
+    )
+    redis_l1_max_entries: int = Field(
+        default=2048,
+        env="REDIS_L1_MAX_ENTRIES",
+        description="Max entries in the in-process L1 cache in front of Redis (0 disables L1).",
+    )
+    redis_l1_ttl_seconds: float = Field(
+        default=30.0,
+        env="REDIS_L1_TTL_SECONDS",
+        description="Max lifetime of an L1 entry; always capped by the key's Redis TTL.",
+    )
+    redis_l1_invalidation: str = Field(
+        default="none",
+        env="REDIS_L1_INVALIDATION",
+        description=(
+            "'none' (L1 staleness bounded by REDIS_L1_TTL_SECONDS) or 'pubsub' "
+            "(writes publish invalidations so every pod evicts its L1 copy)."
+        ),
+    )
+
+    # --- Cache encoding ---
+    cache_serializer: str = Field(
+        default="json",
+        env="CACHE_SERIALIZER",
+        description="Value serializer: 'json' (stdlib), 'orjson' or 'msgpack' (need the [perf] extra).",
+    )
+    cache_compression: str = Field(
+        default="zlib",
+        env="CACHE_COMPRESSION",
+        description="Value compression: 'none', 'zlib' (stdlib), 'zstd' or 'lz4' (need the [perf] extra).",
+    )
+    cache_compress_min_bytes: int = Field(
+        default=1024,
+        env="CACHE_COMPRESS_MIN_BYTES",
+        description="Only compress serialized values at least this large.",
+    )
+    cache_compression_level: int = Field(
+        default=1,
+        env="CACHE_COMPRESSION_LEVEL",
+        description="Compression level for zlib/zstd (low = fast).",
+    )
+    cache_key_hash: str = Field(
+        default="sha256",
+        env="CACHE_KEY_HASH",
+        description="Cache-key hash: 'sha256' (default), 'blake2b' or 'xxhash' ([perf] extra).",
+    )
+
+    # --- Cache freshness (stale-while-revalidate + XFetch early refresh), per service ---
+    release_notes_cache_soft_ttl_seconds: int = Field(
+        default=3600,
+        env="RELEASE_NOTES_CACHE_SOFT_TTL_SECONDS",
+        description="Release notes are fresh for this long.",
+    )
+    release_notes_cache_stale_ttl_seconds: int = Field(
+        default=600,
+        env="RELEASE_NOTES_CACHE_STALE_TTL_SECONDS",
+        description="After the soft TTL, serve stale release notes this long while refreshing (0 disables SWR).",
+    )
+    release_notes_cache_xfetch_beta: float = Field(
+        default=1.0,
+        env="RELEASE_NOTES_CACHE_XFETCH_BETA",
+        description="XFetch early-refresh aggressiveness for release notes (0 disables, >1 refreshes earlier).",
+    )
+    greeting_cache_soft_ttl_seconds: int = Field(
+        default=3600,
+        env="GREETING_CACHE_SOFT_TTL_SECONDS",
+        description="Greetings are fresh for this long.",
+    )
+    greeting_cache_stale_ttl_seconds: int = Field(
+        default=600,
+        env="GREETING_CACHE_STALE_TTL_SECONDS",
+        description="After the soft TTL, serve stale greetings this long while refreshing (0 disables SWR).",
+    )
+    greeting_cache_xfetch_beta: float = Field(
+        default=1.0,
+        env="GREETING_CACHE_XFETCH_BETA",
+        description="XFetch early-refresh aggressiveness for greetings (0 disables, >1 refreshes earlier).",
+    )
+    greeting_prewarm_lead_hours: float = Field(
+        default=6.0,
+        env="GREETING_PREWARM_LEAD_HOURS",
+        description="Pre-warm greetings whose birthday-month flag flips within this many hours.",
+    )
+    greeting_prewarm_max_workers: int = Field(
+        default=4,
+        env="GREETING_PREWARM_MAX_WORKERS",
+        description="Concurrent LLM calls while pre-warming greetings.",
+    )
+    greeting_prewarm_max_items: int = Field(
+        default=10000,
+        env="GREETING_PREWARM_MAX_ITEMS",
+        description="Upper bound on greetings generated per month boundary.",
+    )
+    cache_refresh_max_workers: int = Field(
+        default=2,
+        env="CACHE_REFRESH_MAX_WORKERS",
+        description="Threads running background cache refreshes (shared by all services).",
+    )
+
+    # --- Cache policy (what is cached, for how long) ---
+    cache_negative_ttl_seconds: int = Field(
+        default=30,
+        env="CACHE_NEGATIVE_TTL_SECONDS",
+        description="Cache provider-failure fallbacks (and skip the failed provider) this long; 0 disables.",
+    )
+    cache_ttl_overrides: Dict[str, int] = Field(
+        default_factory=dict,
+        env="CACHE_TTL_OVERRIDES",
+        description='JSON map of "provider" or "provider/model" -> soft TTL seconds (0 = do not cache).',
+    )
+    cache_admin_key: Optional[str] = Field(
+        default=None,
+        env="CACHE_ADMIN_KEY",
+        description="X-Admin-Key required by bulk cache invalidation; unset disables the endpoint.",
+    )
+
+    # --- Cache analytics (/api/v1/cache/stats) ---
+    cache_stats_sample_max_keys: int = Field(
+        default=1000,
+        env="CACHE_STATS_SAMPLE_MAX_KEYS",
+        description="Default number of keys sampled (SCAN) per /api/v1/cache/stats call.",
+    )
+    cache_stats_scan_count: int = Field(
+        default=250,
+        env="CACHE_STATS_SCAN_COUNT",
+        description="COUNT hint per SCAN call while sampling (bounds the work per Redis call).",
+    )
+
+    # --- Semantic (near-duplicate) cache for release notes ---
+    semantic_cache_enabled: bool = Field(
+        default=False,
+        env="SEMANTIC_CACHE_ENABLED",
+        description="Serve near-duplicate release-note requests from the most similar cached entry.",
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.85,
+        env="SEMANTIC_CACHE_THRESHOLD",
+        description="Min estimated similarity (MinHash Jaccard, 0-1) for a near-duplicate hit.",
+    )
+    semantic_cache_num_perm: int = Field(
+        default=64,
+        env="SEMANTIC_CACHE_NUM_PERM",
+        description="MinHash signature length (more = more accurate, slower).",
+    )
+    semantic_cache_bands: int = Field(
+        default=16,
+        env="SEMANTIC_CACHE_BANDS",
+        description="LSH bands; must divide SEMANTIC_CACHE_NUM_PERM.",
+    )
+
+    # --- Request coalescing (single-flight) ---
+    single_flight_enabled: bool = Field(
+        default=True,
+        env="SINGLE_FLIGHT_ENABLED",
+        description="Coalesce concurrent cache misses on the same key into one LLM call.",
+    )
+    single_flight_lock_ttl_ms: int = Field(
+        default=15000,
+        env="SINGLE_FLIGHT_LOCK_TTL_MS",
+        description="Lease of the cross-pod Redis lock; should exceed one LLM call.",
+    )
+    single_flight_wait_timeout_seconds: float = Field(
+        default=12.0,
+        env="SINGLE_FLIGHT_WAIT_TIMEOUT_SECONDS",
+        description="Max time a follower waits for the leader before calling the LLM itself.",
+    )
 
     # --- LLM routing ---
     llm_default_provider: str = Field(
@@ -57,6 +247,130 @@ class Settings(BaseSettings):
         env="USE_MOCK_LLM",
         description="If true, force mock responses (no real API calls).",
     )
+    llm_structured_output: bool = Field(
+        default=True,
+        env="LLM_STRUCTURED_OUTPUT",
+        description="Ask providers for schema-constrained JSON release notes (heuristic parsing stays as fallback).",
+    )
+
+    # --- LLM call scheduler (priority classes + per-tenant fair queueing) ---
+    llm_scheduler_enabled: bool = Field(
+        default=True,
+        env="LLM_SCHEDULER_ENABLED",
+        description="Gate provider calls through the priority / fair-queueing scheduler.",
+    )
+    llm_scheduler_max_concurrency: int = Field(
+        default=16,
+        env="LLM_SCHEDULER_MAX_CONCURRENCY",
+        description="Max concurrent LLM provider calls per process.",
+    )
+    llm_scheduler_greeting_deadline_seconds: float = Field(
+        default=5.0,
+        env="LLM_SCHEDULER_GREETING_DEADLINE_SECONDS",
+        description="Drop a greeting call that waited this long for a slot.",
+    )
+    llm_scheduler_release_notes_deadline_seconds: float = Field(
+        default=30.0,
+        env="LLM_SCHEDULER_RELEASE_NOTES_DEADLINE_SECONDS",
+        description="Drop a release-note call that waited this long for a slot.",
+    )
+    llm_scheduler_background_deadline_seconds: float = Field(
+        default=300.0,
+        env="LLM_SCHEDULER_BACKGROUND_DEADLINE_SECONDS",
+        description="Drop a background call (e.g. greeting pre-warm) that waited this long for a slot.",
+    )
+    llm_scheduler_release_notes_cost: float = Field(
+        default=4.0,
+        env="LLM_SCHEDULER_RELEASE_NOTES_COST",
+        description="Relative cost of a release-note call vs a greeting (fair-queueing weight).",
+    )
+    llm_scheduler_tenant_weights: Dict[str, float] = Field(
+        default_factory=dict,
+        env="LLM_SCHEDULER_TENANT_WEIGHTS",
+        description='JSON map of tenant -> weight, e.g. {"team-a": 2}. Unlisted tenants share "default" (weight 1).',
+    )
+
+    # --- API rate limiting (Redis token buckets per API key and endpoint) ---
+    rate_limit_enabled: bool = Field(
+        default=False,
+        env="RATE_LIMIT_ENABLED",
+        description=(
+            "Enforce per-client token buckets on the LLM-backed endpoints (429 when empty). "
+            "Set RATE_LIMIT_API_KEYS / RATE_LIMIT_TRUSTED_PROXY_HOPS first, or clients behind one proxy share a bucket."
+        ),
+    )
+    rate_limit_api_keys: List[str] = Field(
+        default_factory=list,
+        env="RATE_LIMIT_API_KEYS",
+        description='JSON list of accepted X-API-Key values; any other key shares one "anonymous" bucket.',
+    )
+    rate_limit_trusted_proxy_hops: int = Field(
+        default=0,
+        env="RATE_LIMIT_TRUSTED_PROXY_HOPS",
+        description="Proxies in front of the API that append to X-Forwarded-For (e.g. 1 behind the ALB); 0 = use the TCP peer.",
+    )
+    rate_limit_release_notes_burst: float = Field(
+        default=10.0,
+        env="RATE_LIMIT_RELEASE_NOTES_BURST",
+        description="Release-notes bucket capacity (cost units) per client.",
+    )
+    rate_limit_release_notes_per_minute: float = Field(
+        default=20.0,
+        env="RATE_LIMIT_RELEASE_NOTES_PER_MINUTE",
+        description="Release-notes bucket refill rate (cost units per minute) per client.",
+    )
+    rate_limit_greeting_burst: float = Field(
+        default=30.0,
+        env="RATE_LIMIT_GREETING_BURST",
+        description="Greeting bucket capacity (requests) per client.",
+    )
+    rate_limit_greeting_per_minute: float = Field(
+        default=60.0,
+        env="RATE_LIMIT_GREETING_PER_MINUTE",
+        description="Greeting bucket refill rate (requests per minute) per client.",
+    )
+    rate_limit_tokens_per_cost_unit: int = Field(
+        default=500,
+        env="RATE_LIMIT_TOKENS_PER_COST_UNIT",
+        description="A release-notes request costs 1 + (estimated prompt tokens of its description // this); 0 = flat 1.",
+    )
+    rate_limit_client_weights: Dict[str, float] = Field(
+        default_factory=dict,
+        env="RATE_LIMIT_CLIENT_WEIGHTS",
+        description='JSON map of client id ("key:<api key>" or "ip:<addr>") -> limit multiplier.',
+    )
+
+    # --- Async jobs (Redis Streams queue + workers) ---
+    jobs_worker_pool_size: int = Field(
+        default=4,
+        env="JOBS_WORKER_POOL_SIZE",
+        description="Worker threads per worker process (python -m app.worker).",
+    )
+    jobs_api_workers: int = Field(
+        default=0,
+        env="JOBS_API_WORKERS",
+        description="Worker threads started inside the API process (local dev; 0 = separate workers).",
+    )
+    jobs_result_ttl_seconds: int = Field(
+        default=3600,
+        env="JOBS_RESULT_TTL_SECONDS",
+        description="How long job records/results stay readable.",
+    )
+    jobs_visibility_timeout_seconds: int = Field(
+        default=120,
+        env="JOBS_VISIBILITY_TIMEOUT_SECONDS",
+        description="A job running longer than this is assumed lost and re-delivered.",
+    )
+    jobs_max_attempts: int = Field(
+        default=3,
+        env="JOBS_MAX_ATTEMPTS",
+        description="Deliveries before a job is marked failed.",
+    )
+    jobs_claim_block_ms: int = Field(
+        default=1000,
+        env="JOBS_CLAIM_BLOCK_MS",
+        description="How long an idle worker waits in XREADGROUP BLOCK per poll (jobs pool read timeout is above it).",
+    )
 
     # --- Service URLs (used by UI / cross-service calls) ---
     release_api_base_url: str = Field(
@@ -69,6 +383,92 @@ class Settings(BaseSettings):
         env="MODEL_SERVICE_BASE_URL",
         description="Base URL for the Model Service.",
     )
+    model_service_timeout_seconds: float = Field(
+        default=10.0,
+        env="MODEL_SERVICE_TIMEOUT_SECONDS",
+        description="Default per-call timeout for model_service requests.",
+    )
+    model_service_connect_timeout_seconds: float = Field(
+        default=1.0,
+        env="MODEL_SERVICE_CONNECT_TIMEOUT_SECONDS",
+        description="TCP connect timeout to model_service (in-cluster: should be near-instant).",
+    )
+    model_service_max_connections: int = Field(
+        default=100,
+        env="MODEL_SERVICE_MAX_CONNECTIONS",
+        description="Max concurrent connections to model_service per client.",
+    )
+    model_service_max_keepalive_connections: int = Field(
+        default=20,
+        env="MODEL_SERVICE_MAX_KEEPALIVE_CONNECTIONS",
+        description="Idle keep-alive connections kept open to model_service.",
+    )
+    model_service_keepalive_expiry_seconds: float = Field(
+        default=30.0,
+        env="MODEL_SERVICE_KEEPALIVE_EXPIRY_SECONDS",
+        description="Close idle keep-alive connections after this long.",
+    )
+
+    # --- Model service inference engine ---
+    model_service_engine: str = Field(
+        default="stub",
+        env="MODEL_SERVICE_ENGINE",
+        description="stub | llama_cpp (GGUF on CPU, needs the [local-llm] extra).",
+    )
+    model_service_model_path: Optional[str] = Field(
+        default=None,
+        env="MODEL_SERVICE_MODEL_PATH",
+        description="Path to the GGUF model file (memory-mapped, shared across workers).",
+    )
+    model_service_n_ctx: int = Field(
+        default=2048,
+        env="MODEL_SERVICE_N_CTX",
+        description="Context window; sizes the per-process KV cache.",
+    )
+    model_service_n_threads: Optional[int] = Field(
+        default=None,
+        env="MODEL_SERVICE_N_THREADS",
+        description="CPU threads per model call (default: all cores).",
+    )
+    model_service_max_tokens: int = Field(
+        default=256,
+        env="MODEL_SERVICE_MAX_TOKENS",
+        description="Max new tokens per generation.",
+    )
+
+    # --- Model service prompt-prefix (KV state) cache ---
+    model_service_prefix_cache_enabled: bool = Field(
+        default=True,
+        env="MODEL_SERVICE_PREFIX_CACHE_ENABLED",
+        description="Reuse prefilled model state for common prompt prefixes.",
+    )
+    model_service_prefix_cache_max_mb: int = Field(
+        default=256,
+        env="MODEL_SERVICE_PREFIX_CACHE_MAX_MB",
+        description="Memory budget for cached prefix states (LRU eviction).",
+    )
+    model_service_prefix_cache_admit_after: int = Field(
+        default=2,
+        env="MODEL_SERVICE_PREFIX_CACHE_ADMIT_AFTER",
+        description="Cache a prefix once it has been seen this many times.",
+    )
+
+    # --- Model service micro-batching (server side) ---
+    model_service_batch_enabled: bool = Field(
+        default=True,
+        env="MODEL_SERVICE_BATCH_ENABLED",
+        description="Group concurrent /api/v1/generate calls into one model batch.",
+    )
+    model_service_batch_max_size: int = Field(
+        default=8,
+        env="MODEL_SERVICE_BATCH_MAX_SIZE",
+        description="Flush a micro-batch once it has this many prompts.",
+    )
+    model_service_batch_max_wait_ms: float = Field(
+        default=5.0,
+        env="MODEL_SERVICE_BATCH_MAX_WAIT_MS",
+        description="Flush a micro-batch this long after its first prompt arrived.",
+    )
 
     class Config:
         env_file = ".env"
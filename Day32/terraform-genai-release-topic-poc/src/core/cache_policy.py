@@ -0,0 +1,132 @@
+# src/core/cache_policy.py
+from __future__ import annotations
+
+import dataclasses
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from core.cache_stats import KEY_PREFIX
+from core.freshness import FreshnessPolicy
+
+logger = logging.getLogger(__name__)
+
+# Models LLMClient reports when the provider failed and it answered locally instead.
+FAILURE_MODELS = ("oss-fallback", "mock-fallback-error")
+
+
+@dataclass(frozen=True)
+class CacheDecision:
+    """Whether a result is cached, and with which freshness (TTLs)."""
+
+    cache: bool
+    freshness: Optional[FreshnessPolicy] = None
+    negative: bool = False
+
+
+class CachePolicy:
+    """
+    Decides what the services cache, and for how long.
+
+    - Provider failures (the "oss-fallback" / "mock-fallback-error" answers
+      LLMClient returns when a backend is down) are cached briefly
+      (`negative_ttl_seconds`, no stale window): during an outage repeated
+      requests get the fallback at once instead of each waiting on the dead
+      backend, and the real answer comes back soon after recovery.
+    - Other mock results (mock mode, unknown provider) are never cached, so
+      they cannot mask real provider calls later.
+    - Real results use the service's FreshnessPolicy, with the soft TTL
+      optionally overridden per provider or per provider/model:
+      `{"oss": 600, "openai/gpt-4o-mini": 86400}`; the most specific key
+      wins, and 0 disables caching for it.
+    """
+
+    def __init__(
+        self,
+        negative_ttl_seconds: int = 30,
+        ttl_overrides: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._ttl_overrides = ttl_overrides or {}
+
+    @staticmethod
+    def is_failure(value: Dict[str, Any]) -> bool:
+        """True for a cached/returned provider-failure fallback (a negative entry)."""
+        return value.get("model") in FAILURE_MODELS
+
+    def decide(self, provider: str, model: Optional[str], freshness: FreshnessPolicy) -> CacheDecision:
+        if self.is_failure({"model": model}):
+            if self._negative_ttl_seconds <= 0:
+                return CacheDecision(cache=False)
+            negative = FreshnessPolicy(soft_ttl_seconds=self._negative_ttl_seconds, stale_ttl_seconds=0, xfetch_beta=0)
+            return CacheDecision(cache=True, freshness=negative, negative=True)
+        if provider.startswith("mock"):
+            return CacheDecision(cache=False)
+
+        soft_ttl = self._ttl_overrides.get(f"{provider}/{model}", self._ttl_overrides.get(provider))
+        if soft_ttl is None:
+            return CacheDecision(cache=True, freshness=freshness)
+        if soft_ttl <= 0:
+            return CacheDecision(cache=False)
+        return CacheDecision(cache=True, freshness=dataclasses.replace(freshness, soft_ttl_seconds=soft_ttl))
+
+    def bypass(self, value: Dict[str, Any], provider_override: bool) -> bool:
+        """
+        Skip a cached value the caller must not get: a mock answer when a
+        provider was explicitly requested. Negative entries are still served
+        (they record that this very provider just failed).
+        """
+        return (
+            provider_override
+            and str(value.get("provider", "")).startswith("mock")
+            and not self.is_failure(value)
+        )
+
+
+def invalidate_matching(
+    cache: Any,
+    namespace: str,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    max_keys: int = 10000,
+    scan_count: int = 500,
+) -> Dict[str, int]:
+    """
+    Delete cached responses in `d32-release:<namespace>:*` whose provider /
+    model match (both None: the whole namespace). Walks at most `max_keys`
+    keys with SCAN, reads them with pipelined MGETs and deletes through
+    RedisCache.delete() so every pod's L1 drops them too.
+    """
+    scanned = deleted = 0
+    for batch in _scan_batches(cache.client, f"{KEY_PREFIX}{namespace}:*", scan_count, max_keys):
+        scanned += len(batch)
+        for key, value in zip(batch, cache.mget_json(batch)):
+            if value is None:
+                continue  # expired, or not a cached response (e.g. a set)
+            if provider is not None and value.get("provider") != provider:
+                continue
+            if model is not None and value.get("model") != model:
+                continue
+            cache.delete(key)
+            deleted += 1
+    logger.info(
+        "Invalidated %d of %d scanned keys (namespace=%s provider=%s model=%s).",
+        deleted,
+        scanned,
+        namespace,
+        provider,
+        model,
+    )
+    return {"scanned": scanned, "deleted": deleted}
+
+
+def _scan_batches(client: Any, match: str, count: int, max_keys: int) -> Any:
+    cursor, seen = 0, 0
+    while seen < max_keys:
+        cursor, keys = client.scan(cursor=cursor, match=match, count=count)
+        keys = [k.decode("utf-8") if isinstance(k, bytes) else k for k in keys[: max_keys - seen]]
+        if keys:
+            seen += len(keys)
+            yield keys
+        if int(cursor) == 0:
+            return
@@ -0,0 +1,161 @@
+# src/core/cache_stats.py
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "d32-release:"
+COUNTERS = ("l1_hits", "hits", "misses", "bypasses", "sets", "errors")
+# Upper bounds (seconds) of the TTL histogram buckets; keys without expiry go to "none".
+TTL_BUCKETS: Tuple[Tuple[str, float], ...] = (
+    ("<1m", 60),
+    ("<1h", 3600),
+    ("<1d", 86400),
+    ("<7d", 7 * 86400),
+    (">=7d", float("inf")),
+)
+
+
+def namespace_of(key: str) -> str:
+    """`d32-release:<namespace>:...` -> namespace (e.g. greeting, release-notes); anything else -> other."""
+    if not key.startswith(KEY_PREFIX):
+        return "other"
+    rest = key[len(KEY_PREFIX):]
+    return rest.split(":", 1)[0] or "other"
+
+
+class CacheStats:
+    """
+    Per-namespace cache counters kept by RedisCache / AsyncRedisCache.
+
+    - l1_hits / hits: served from the in-process L1 / from Redis.
+    - misses: nothing cached (single-flight re-checks count as lookups too).
+    - bypasses: a cached value existed but the service did not use it (the
+      "mock cached but provider override requested" path). These are also
+      counted as hits by the cache layer, so hit_ratio subtracts them.
+    - sets / errors: writes and failed Redis round trips.
+
+    Counters are per process; sum them across pods for fleet-wide numbers.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    def record(self, key: str, event: str, n: int = 1) -> None:
+        with self._lock:
+            self._counts[namespace_of(key)][event] += n
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            counts = {ns: dict(c) for ns, c in self._counts.items()}
+        for c in counts.values():
+            lookups = c["l1_hits"] + c["hits"] + c["misses"]
+            c["lookups"] = lookups
+            c["hit_ratio"] = round((c["l1_hits"] + c["hits"] - c["bypasses"]) / lookups, 3) if lookups else 0.0
+        return counts
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+def sample_keyspace(
+    client: Any,
+    max_keys: int = 1000,
+    scan_count: int = 250,
+    match: str = KEY_PREFIX + "*",
+) -> Dict[str, Any]:
+    """
+    Sample the key space with SCAN at bounded cost: at most `max_keys` keys,
+    fetched `scan_count` per SCAN call, then one pipelined MEMORY USAGE + PTTL
+    per batch. Never uses KEYS.
+
+    Returns per-namespace key counts, bytes (total / mean / max) and a TTL
+    histogram. `complete` is True if the whole key space was covered (counts
+    are then exact, not a sample). Sizes fall back to STRLEN where MEMORY
+    USAGE is unavailable (e.g. some managed/proxy setups).
+    """
+    namespaces: Dict[str, Dict[str, Any]] = {}
+    sampled = 0
+    cursor = 0
+    complete = False
+    while sampled < max_keys:
+        cursor, keys = client.scan(cursor=cursor, match=match, count=scan_count)
+        keys = keys[: max_keys - sampled]
+        if keys:
+            for key, nbytes, pttl_ms in _describe(client, keys):
+                _add(namespaces, key, nbytes, pttl_ms)
+            sampled += len(keys)
+        if int(cursor) == 0:
+            complete = True
+            break
+
+    for ns in namespaces.values():
+        ns["mean_bytes"] = round(ns["bytes"] / ns["keys"], 1) if ns["keys"] else 0.0
+    return {
+        "sampled_keys": sampled,
+        "complete": complete,
+        "db_keys": _safe(client.dbsize),
+        "namespaces": namespaces,
+    }
+
+
+# Internal helpers
+# ----------------
+
+
+def _describe(client: Any, keys: List[Any]) -> List[Tuple[str, int, Optional[int]]]:
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.memory_usage(key)
+        pipe.pttl(key)
+    replies = pipe.execute(raise_on_error=False)
+    sizes, pttls = replies[0::2], replies[1::2]
+
+    missing = [i for i, size in enumerate(sizes) if not isinstance(size, int)]
+    if missing:
+        pipe = client.pipeline(transaction=False)
+        for i in missing:
+            pipe.strlen(keys[i])
+        for i, size in zip(missing, pipe.execute(raise_on_error=False)):
+            # Non-string types (sets, streams) have no STRLEN: count the key name only.
+            sizes[i] = len(keys[i]) + (size if isinstance(size, int) else 0)
+
+    return [
+        (_text(key), int(size), pttl if isinstance(pttl, int) else None)
+        for key, size, pttl in zip(keys, sizes, pttls)
+    ]
+
+
+def _add(namespaces: Dict[str, Dict[str, Any]], key: str, nbytes: int, pttl_ms: Optional[int]) -> None:
+    ns = namespaces.setdefault(
+        namespace_of(key),
+        {"keys": 0, "bytes": 0, "max_bytes": 0, "ttl": dict.fromkeys(["none", *(b for b, _ in TTL_BUCKETS)], 0)},
+    )
+    ns["keys"] += 1
+    ns["bytes"] += nbytes
+    ns["max_bytes"] = max(ns["max_bytes"], nbytes)
+    if pttl_ms is None or pttl_ms < 0:
+        ns["ttl"]["none"] += 1
+        return
+    for bucket, upper in TTL_BUCKETS:
+        if pttl_ms / 1000 < upper:
+            ns["ttl"][bucket] += 1
+            return
+
+
+def _safe(call: Any) -> Optional[int]:
+    try:
+        return int(call())
+    except Exception as exc:  # pragma: no cover - network/infra
+        logger.warning("Redis call failed during key-space sampling: %s", exc)
+        return None
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
@@ -0,0 +1,178 @@
+# src/core/codecs.py
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import zlib
+from typing import Any, Callable, Dict, Tuple, Union
+
+from config.settings import Settings
+
+
+# ------------------------
+# Value codecs
+# ------------------------
+#
+# Stored value layout (bytes):
+#
+#     MAGIC (1 byte) | serializer id (1 byte) | compression id (1 byte) | payload
+#
+# MAGIC (0xD3) can never start a JSON document, so values written before the
+# codec layer existed (plain JSON text) are still recognized and decoded.
+# Every value records its own serializer/compression, so pods running
+# different CACHE_SERIALIZER / CACHE_COMPRESSION settings during a rollout
+# can still read each other's entries (as long as the library is installed).
+
+MAGIC = 0xD3
+
+SERIALIZERS = ("json", "orjson", "msgpack")
+COMPRESSIONS = ("none", "zlib", "zstd", "lz4")
+KEY_HASHES = ("sha256", "blake2b", "xxhash")
+
+_SERIALIZER_IDS = {"json": b"j", "orjson": b"j", "msgpack": b"m"}
+_COMPRESSION_IDS = {"none": b"n", "zlib": b"z", "zstd": b"s", "lz4": b"l"}
+_COMPRESSION_NAMES = {v[0]: k for k, v in _COMPRESSION_IDS.items()}
+
+
+def _require(module: str, setting: str) -> Any:
+    """Import an optional dependency, with an actionable error if missing."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as exc:
+        raise ValueError(
+            f"{setting} requires the '{module}' package "
+            "(pip install 'day32-terraform-genai-release-topic-poc[perf]')."
+        ) from exc
+
+
+def _serializer_funcs(name: str) -> Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]:
+    if name == "json":
+        return (
+            lambda value: json.dumps(value, separators=(",", ":")).encode("utf-8"),
+            json.loads,
+        )
+    if name == "orjson":
+        orjson = _require("orjson", "CACHE_SERIALIZER=orjson")
+        return orjson.dumps, orjson.loads
+    if name == "msgpack":
+        msgpack = _require("msgpack", "CACHE_SERIALIZER=msgpack")
+        return (
+            lambda value: msgpack.packb(value, use_bin_type=True),
+            lambda payload: msgpack.unpackb(payload, raw=False),
+        )
+    raise ValueError(f"Unknown cache serializer '{name}'. Expected one of: {', '.join(SERIALIZERS)}.")
+
+
+def _compression_funcs(name: str, level: int) -> Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    if name == "none":
+        return (lambda data: data), (lambda data: data)
+    if name == "zlib":
+        return (lambda data: zlib.compress(data, level)), zlib.decompress
+    if name == "zstd":
+        zstandard = _require("zstandard", "CACHE_COMPRESSION=zstd")
+        compressor = zstandard.ZstdCompressor(level=level)
+        decompressor = zstandard.ZstdDecompressor()
+        return compressor.compress, decompressor.decompress
+    if name == "lz4":
+        lz4_frame = _require("lz4.frame", "CACHE_COMPRESSION=lz4")
+        return lz4_frame.compress, lz4_frame.decompress
+    raise ValueError(f"Unknown cache compression '{name}'. Expected one of: {', '.join(COMPRESSIONS)}.")
+
+
+class ValueCodec:
+    """
+    Encode/decode cache values (dicts) to compact bytes.
+
+    - serializer: json (stdlib) | orjson | msgpack
+    - compression: none | zlib (stdlib) | zstd | lz4, applied only to payloads
+      of at least `compress_min_bytes` (small values are not worth the CPU).
+    """
+
+    def __init__(
+        self,
+        serializer: str = "json",
+        compression: str = "none",
+        compress_min_bytes: int = 1024,
+        compression_level: int = 1,
+    ) -> None:
+        self.serializer = serializer
+        self.compression = compression
+        self._dumps, _ = _serializer_funcs(serializer)
+        self._compress, _ = _compression_funcs(compression, compression_level)
+        self._compress_min_bytes = compress_min_bytes
+        self._compression_level = compression_level
+        self._header = bytes([MAGIC]) + _SERIALIZER_IDS[serializer]
+        self._decoders: Dict[Tuple[int, int], Callable[[bytes], Any]] = {}
+
+    def encode(self, value: Dict[str, Any]) -> bytes:
+        payload = self._dumps(value)
+        compression = "none"
+        if self.compression != "none" and len(payload) >= self._compress_min_bytes:
+            payload = self._compress(payload)
+            compression = self.compression
+        return self._header + _COMPRESSION_IDS[compression] + payload
+
+    def decode(self, raw: Union[bytes, str]) -> Any:
+        """
+        Decode a stored value. Raises ValueError for corrupt/unreadable values.
+
+        Plain JSON (legacy entries, or str from a decode_responses=True client)
+        is accepted as-is.
+        """
+        if isinstance(raw, str):
+            return json.loads(raw)
+        if not raw or raw[0] != MAGIC:
+            return json.loads(raw)
+        if len(raw) < 3:
+            raise ValueError("Truncated cache value.")
+        return self._decoder(raw[1], raw[2])(raw[3:])
+
+    def _decoder(self, serializer_id: int, compression_id: int) -> Callable[[bytes], Any]:
+        decoder = self._decoders.get((serializer_id, compression_id))
+        if decoder is None:
+            serializer = {ord("j"): "json", ord("m"): "msgpack"}.get(serializer_id)
+            compression = _COMPRESSION_NAMES.get(compression_id)
+            if serializer is None or compression is None:
+                raise ValueError(f"Unknown cache value header {serializer_id!r}/{compression_id!r}.")
+            if serializer == "json" and self.serializer == "orjson":
+                serializer = "orjson"  # same wire format, faster parser
+            _, loads = _serializer_funcs(serializer)
+            _, decompress = _compression_funcs(compression, self._compression_level)
+            decoder = self._decoders[(serializer_id, compression_id)] = lambda payload: loads(decompress(payload))
+        return decoder
+
+
+def build_codec(settings: Settings) -> ValueCodec:
+    return ValueCodec(
+        serializer=settings.cache_serializer,
+        compression=settings.cache_compression,
+        compress_min_bytes=settings.cache_compress_min_bytes,
+        compression_level=settings.cache_compression_level,
+    )
+
+
+# ------------------------
+# Cache-key hashing
+# ------------------------
+
+
+def hash_bytes(data: bytes, algorithm: str = "sha256") -> str:
+    """
+    Hex digest used in cache keys.
+
+    Keys only need to be collision-resistant for honest inputs, not
+    cryptographically strong:
+    - sha256: the default. Fast on CPUs with SHA extensions (most current x86/ARM servers).
+    - blake2b (128-bit digest): stdlib, faster than sha256 on CPUs without them.
+    - xxhash (xxh3_128): several times faster than both, needs the optional `xxhash` package.
+    Changing the algorithm changes every key, i.e. starts from a cold cache.
+    """
+    if algorithm == "blake2b":
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    if algorithm == "sha256":
+        return hashlib.sha256(data).hexdigest()
+    if algorithm == "xxhash":
+        xxhash = _require("xxhash", "CACHE_KEY_HASH=xxhash")
+        return xxhash.xxh3_128_hexdigest(data)
+    raise ValueError(f"Unknown cache key hash '{algorithm}'. Expected one of: {', '.join(KEY_HASHES)}.")
@@ -0,0 +1,161 @@
+# src/core/freshness.py
+from __future__ import annotations
+
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Set, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from core.services import RedisCache
+
+
+logger = logging.getLogger(__name__)
+
+META_FIELD = "_swr"
+
+
+# ------------------------
+# Freshness policy (soft TTL + stale window + XFetch)
+# ------------------------
+
+
+@dataclass(frozen=True)
+class FreshnessPolicy:
+    """
+    Per-service cache freshness settings.
+
+    Timeline of one entry (seconds after it was written):
+
+        0 ........ soft_ttl ................ soft_ttl + stale_ttl
+        |  fresh   |  stale: served, refreshed |  gone (Redis TTL)
+              ^ XFetch may refresh early here, more likely the closer to soft_ttl
+                and the slower the value was to compute.
+
+    stale_ttl_seconds=0 and xfetch_beta=0 give the old fixed-TTL behaviour.
+    """
+
+    soft_ttl_seconds: int = 3600
+    stale_ttl_seconds: int = 600
+    xfetch_beta: float = 1.0
+
+    @property
+    def hard_ttl_seconds(self) -> int:
+        """Redis TTL: how long an entry may be served at all."""
+        return self.soft_ttl_seconds + self.stale_ttl_seconds
+
+    def wrap(self, value: Dict[str, Any], compute_seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """Attach freshness metadata to a value before it is cached."""
+        now = time.time() if now is None else now
+        return {
+            **value,
+            META_FIELD: {"soft_expires_at": now + self.soft_ttl_seconds, "compute_seconds": compute_seconds},
+        }
+
+    def needs_refresh(
+        self,
+        meta: Optional[Dict[str, Any]],
+        now: Optional[float] = None,
+        rand: Callable[[], float] = random.random,
+    ) -> bool:
+        """
+        True if a cached entry should be recomputed in the background.
+
+        - Past soft expiry: always (entry is stale).
+        - Before it: XFetch (Vattani et al.), refresh when
+              now - compute_seconds * beta * ln(rand()) >= soft_expires_at
+          Refresh probability rises towards the soft expiry and for values that
+          were slow to compute, so concurrent readers do not all refresh at once.
+        """
+        if not meta:
+            return False  # entries written before SWR: plain TTL
+        now = time.time() if now is None else now
+        soft_expires_at = float(meta.get("soft_expires_at", 0))
+        if now >= soft_expires_at:
+            return True
+        delta = float(meta.get("compute_seconds", 0))
+        if self.xfetch_beta <= 0 or delta <= 0:
+            return False
+        return now - delta * self.xfetch_beta * math.log(max(rand(), 1e-12)) >= soft_expires_at
+
+
+def unwrap(cached: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Split a cached dict into (value, freshness metadata or None)."""
+    meta = cached.pop(META_FIELD, None)
+    return cached, meta
+
+
+# ------------------------
+# Background refresher
+# ------------------------
+
+
+class BackgroundRefresher:
+    """
+    Runs cache refreshes off the request path.
+
+    - At most one refresh per key per process (in-flight set).
+    - At most one refresh per key across pods: a short Redis lease lock
+      (`<key>:refresh`); if another pod holds it we skip, since it is
+      already refreshing.
+    - Failures are logged; the stale entry keeps being served until its
+      hard TTL, and the next read schedules another attempt.
+    """
+
+    def __init__(
+        self,
+        cache: Optional["RedisCache"] = None,
+        max_workers: int = 2,
+        lock_ttl_ms: int = 30000,
+    ) -> None:
+        self._cache = cache
+        self._lock_ttl_ms = lock_ttl_ms
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="cache-refresh")
+        self._in_flight: Set[str] = set()
+        self._futures: Set[Future] = set()
+        self._lock = threading.Lock()
+
+    def schedule(self, key: str, refresh: Callable[[], Any]) -> bool:
+        """Queue a refresh for `key`; returns False if one is already running here."""
+        with self._lock:
+            if key in self._in_flight:
+                return False
+            self._in_flight.add(key)
+            future = self._pool.submit(self._run, key, refresh)
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        return True
+
+    def drain(self, timeout: Optional[float] = None) -> None:
+        """Wait for currently scheduled refreshes (tests, graceful shutdown)."""
+        with self._lock:
+            pending = list(self._futures)
+        wait(pending, timeout=timeout)
+
+    def _forget(self, future: Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def _run(self, key: str, refresh: Callable[[], Any]) -> None:
+        lock_key = f"{key}:refresh"
+        token = uuid.uuid4().hex
+        try:
+            if self._cache is not None and not self._cache.acquire_lock(lock_key, token, self._lock_ttl_ms):
+                logger.info("Cache refresh already running on another pod. key=%s", key)
+                return
+            try:
+                logger.info("Cache background refresh. key=%s", key)
+                refresh()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Cache background refresh failed for key=%s: %s", key, exc)
+            finally:
+                if self._cache is not None:
+                    self._cache.release_lock(lock_key, token)
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
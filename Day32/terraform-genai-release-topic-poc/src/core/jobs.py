@@ -0,0 +1,280 @@
+# src/core/jobs.py
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import redis
+
+from core.models import JobStatus
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+# ------------------------
+# Redis Streams job queue
+# ------------------------
+
+
+class JobQueue:
+    """
+    Redis-backed queue for long-running work (e.g. release-note generation).
+
+    Layout:
+    - `d32-release:jobs` (Redis Stream): one entry per submitted job, consumed
+      by the `d32-release-workers` consumer group. Each entry goes to exactly
+      one worker, across all worker pods.
+    - `d32-release:job:<id>` (JSON string, TTL = result_ttl_seconds): job
+      record with status, payload, result / error and timestamps. This is
+      what `GET /jobs/{id}` reads. It is written directly, not through the
+      RedisCache L1, because the status changes.
+    - `d32-release:job-done:<id>` (pub/sub channel): one message when the job
+      finishes, for clients that prefer to subscribe over polling.
+
+    Delivery is at-least-once: a job is acknowledged only after its record
+    is final. If a worker dies mid-job, the entry stays pending and another
+    worker reclaims it after `visibility_timeout_seconds` (XAUTOCLAIM), up to
+    `max_attempts` times.
+
+    `claim()` blocks in XREADGROUP, so the client needs a socket_timeout
+    above the block time (core.redis_pool.build_jobs_redis_client). With a
+    shorter one, the block is clamped below it rather than timing out.
+    """
+
+    STREAM_KEY = "d32-release:jobs"
+    GROUP = "d32-release-workers"
+    RECORD_PREFIX = "d32-release:job:"
+    DONE_CHANNEL_PREFIX = "d32-release:job-done:"
+
+    def __init__(
+        self,
+        client: Any,
+        result_ttl_seconds: int = 3600,
+        visibility_timeout_seconds: int = 120,
+        max_attempts: int = 3,
+        stream_maxlen: int = 10000,
+    ) -> None:
+        self._client = client
+        self._result_ttl_seconds = result_ttl_seconds
+        self._visibility_timeout_ms = visibility_timeout_seconds * 1000
+        self._max_attempts = max_attempts
+        self._stream_maxlen = stream_maxlen
+        self._group_ready = False
+        self._max_block_ms = _max_block_ms(client)
+
+    # Public API
+    # ----------
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a queued job record and enqueue it; returns the record."""
+        self._ensure_group()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": JobStatus.QUEUED.value,
+            "payload": payload,
+            "result": None,
+            "error": None,
+            "attempts": 0,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        pipe = self._client.pipeline()
+        pipe.set(self._record_key(job["job_id"]), json.dumps(job), ex=self._result_ttl_seconds)
+        pipe.xadd(self.STREAM_KEY, {"job_id": job["job_id"]}, maxlen=self._stream_maxlen, approximate=True)
+        pipe.execute()
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.parse_record(self._client.get(self._record_key(job_id)))
+
+    def claim(self, consumer: str, block_ms: int = 1000) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Take the next job for `consumer`: first a stuck one (pending longer
+        than the visibility timeout), else a new one. Returns (entry id, job),
+        or None after an idle wait of up to `block_ms`.
+        """
+        self._ensure_group()
+        entry = self._reclaim_stuck(consumer)
+        if entry is None:
+            if self._max_block_ms is not None:
+                block_ms = min(block_ms, self._max_block_ms)
+            try:
+                response = self._client.xreadgroup(
+                    self.GROUP, consumer, {self.STREAM_KEY: ">"}, count=1, block=block_ms
+                )
+            except redis.exceptions.TimeoutError:
+                return None  # nothing arrived before the read timeout: an idle poll, not an error
+            if not response:
+                return None
+            entry = response[0][1][0]
+
+        entry_id, fields = _as_text(entry[0]), entry[1]
+        job_id = _as_text(fields.get(b"job_id", fields.get("job_id")))
+        job = self.get(job_id)
+        if job is None or job["status"] in (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value):
+            self._client.xack(self.STREAM_KEY, self.GROUP, entry_id)  # expired or already finished
+            return None
+
+        job["attempts"] += 1
+        if job["attempts"] > self._max_attempts:
+            self.finish(entry_id, job, error=f"Gave up after {self._max_attempts} attempts.")
+            return None
+        job.update(status=JobStatus.RUNNING.value, started_at=time.time(), worker=consumer)
+        self._write(job)
+        return entry_id, job
+
+    def finish(
+        self,
+        entry_id: str,
+        job: Dict[str, Any],
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Write the final record, acknowledge the entry and notify subscribers."""
+        job.update(
+            status=(JobStatus.FAILED if error is not None else JobStatus.SUCCEEDED).value,
+            result=result,
+            error=error,
+            finished_at=time.time(),
+        )
+        pipe = self._client.pipeline()
+        pipe.set(self._record_key(job["job_id"]), json.dumps(job), ex=self._result_ttl_seconds)
+        pipe.xack(self.STREAM_KEY, self.GROUP, entry_id)
+        pipe.publish(self.DONE_CHANNEL_PREFIX + job["job_id"], job["status"])
+        pipe.execute()
+
+    def depth(self) -> Dict[str, int]:
+        """Queue backlog for monitoring / autoscaling workers."""
+        self._ensure_group()
+        groups = {_as_text(g["name"]): g for g in self._client.xinfo_groups(self.STREAM_KEY)}
+        group = groups.get(self.GROUP, {})
+        return {"pending": int(group.get("pending", 0)), "lag": int(group.get("lag") or 0)}
+
+    @staticmethod
+    def parse_record(raw: Any) -> Optional[Dict[str, Any]]:
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    # Internal helpers
+    # ----------------
+
+    def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            self._client.xgroup_create(self.STREAM_KEY, self.GROUP, id="0", mkstream=True)
+        except Exception as exc:  # noqa: BLE001
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    def _reclaim_stuck(self, consumer: str) -> Optional[Tuple[Any, Dict[Any, Any]]]:
+        _, entries, *_ = self._client.xautoclaim(
+            self.STREAM_KEY, self.GROUP, consumer, min_idle_time=self._visibility_timeout_ms, count=1
+        )
+        if entries:
+            logger.warning("Reclaimed stuck job entry %s for %s.", _as_text(entries[0][0]), consumer)
+            return entries[0]
+        return None
+
+    def _write(self, job: Dict[str, Any]) -> None:
+        self._client.set(self._record_key(job["job_id"]), json.dumps(job), ex=self._result_ttl_seconds)
+
+    def _record_key(self, job_id: str) -> str:
+        return f"{self.RECORD_PREFIX}{job_id}"
+
+
+# ------------------------
+# Worker pool
+# ------------------------
+
+
+class JobWorkerPool:
+    """
+    Threads that consume JobQueue and run the handler registered for each
+    job kind. Scale throughput with `pool_size` per process and with the
+    number of worker pods; ingress (API) replicas are independent of both.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        pool_size: int = 4,
+        block_ms: int = 1000,
+    ) -> None:
+        self._queue = queue
+        self._handlers = handlers
+        self._pool_size = max(1, pool_size)
+        self._block_ms = block_ms
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._name = f"{socket.gethostname()}-{os.getpid()}"
+
+    def start(self) -> None:
+        self._stop.clear()
+        for i in range(self._pool_size):
+            thread = threading.Thread(
+                target=self._run, args=(f"{self._name}-{i}",), name=f"job-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Started %d job workers (%s).", self._pool_size, self._name)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop after the current jobs; unfinished ones are reclaimed by other workers."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_once(self, consumer: str = "inline") -> bool:
+        """Claim and run at most one job; returns True if one was processed."""
+        claimed = self._queue.claim(consumer, block_ms=self._block_ms)
+        if claimed is None:
+            return False
+        entry_id, job = claimed
+        handler = self._handlers.get(job["kind"])
+        if handler is None:
+            self._queue.finish(entry_id, job, error=f"No handler for job kind '{job['kind']}'.")
+            return True
+        try:
+            result = handler(job["payload"])
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Job %s (%s) failed: %s", job["job_id"], job["kind"], exc)
+            self._queue.finish(entry_id, job, error=str(exc) or exc.__class__.__name__)
+        else:
+            self._queue.finish(entry_id, job, result=result)
+        return True
+
+    def _run(self, consumer: str) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once(consumer)
+            except Exception as exc:  # pragma: no cover - network/infra
+                logger.warning("Job worker %s error (retrying): %s", consumer, exc)
+                self._stop.wait(1.0)
+
+
+def _max_block_ms(client: Any) -> Optional[int]:
+    """Longest XREADGROUP block that stays under the client's socket_timeout (None: no timeout)."""
+    pool = getattr(client, "connection_pool", None)
+    socket_timeout = getattr(pool, "connection_kwargs", {}).get("socket_timeout")
+    if not socket_timeout:
+        return None
+    return max(1, int(socket_timeout * 1000 * 0.8))
+
+
+def _as_text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
@@ -1,12 +1,16 @@
 # src/core/llm_client.py
 import logging
 import re
-from typing import Optional
+import time
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import httpx
 
 from config.settings import Settings
-from core.models import LLMGenerationResult, ModelProvider
+from core.models import LLMGenerationResult, LLMStreamChunk, ModelProvider
+from core.scheduler import LLMScheduler
+from core.sse import aiter_sse
 
 
 logger = logging.getLogger(__name__)
@@ -26,18 +30,47 @@ class LLMClient:
     - 'openai' -> OpenAI API (if key is present).
     - 'oss'    -> Hosted model_service (running on the EKS model node group).
     - mock     -> Used when USE_MOCK_LLM=true or provider is unavailable.
+
+    Two call paths with the same semantics:
+    - generate_text():  sync, for threads / CLI / background refresh.
+    - agenerate_text(): async, for async FastAPI endpoints.
+    model_service calls reuse one long-lived httpx client per path
+    (keep-alive + bounded pool), so the in-cluster hop costs a request,
+    not a TCP handshake. Call aclose() on shutdown.
+
+    With a scheduler, real provider calls first wait for a slot in their
+    `workload` class ('greeting', 'release-notes'); mock responses skip it.
+    A call dropped at its deadline raises core.scheduler.DeadlineExceeded.
+
+    Provider failures are remembered for CACHE_NEGATIVE_TTL_SECONDS: during
+    that window calls to the same provider get the fallback answer at once
+    instead of each waiting for the dead backend to time out.
     """
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        http_client: Optional[httpx.Client] = None,
+        async_http_client: Optional[httpx.AsyncClient] = None,
+        scheduler: Optional[LLMScheduler] = None,
+    ) -> None:
         self._settings = settings
+        self._scheduler = scheduler
         self._openai_client = None
+        self._async_openai_client = None
+        # Created lazily on first OSS call; can be injected (e.g. MockTransport in tests).
+        self._http_client = http_client
+        self._async_http_client = async_http_client
+        # provider -> monotonic time until which it is considered down.
+        self._failed_until: Dict[str, float] = {}
 
         # Best-effort OpenAI initialization (chat completions, API v1/v2 compatible)
         if settings.openai_api_key:
             try:
-                from openai import OpenAI
+                from openai import AsyncOpenAI, OpenAI
 
                 self._openai_client = OpenAI(api_key=settings.openai_api_key)
+                self._async_openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
                 logger.info("LLMClient initialized with OpenAI backend.")
             except Exception as exc:  # pragma: no cover - env specific
                 logger.warning("Failed to initialize OpenAI client: %s", exc)
@@ -52,6 +85,8 @@ class LLMClient:
         self,
         prompt: str,
         provider: Optional[ModelProvider] = None,
+        workload: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
     ) -> LLMGenerationResult:
         """
         Generate text using the configured LLM backend.
@@ -62,6 +97,11 @@ class LLMClient:
         3) Dispatch to the appropriate backend (OpenAI or OSS model_service).
         4) On any error, log and fall back to a mock result.
 
+        `response_schema` (a JSON schema) asks the provider for a JSON answer
+        matching it: OpenAI structured outputs, or a grammar on the OSS
+        model_service. Mock/fallback answers ignore it, so callers must still
+        parse defensively.
+
         This method is synchronous and safe to call from normal FastAPI endpoints.
         """
         provider_str = self._resolve_provider(provider)
@@ -72,11 +112,21 @@ class LLMClient:
             logger.info("LLMClient in mock mode. provider=%s", provider_str)
             return self._mock_response(prompt, provider_str, model="mock")
 
+        recent_failure = self._recent_failure(prompt, provider_str)
+        if recent_failure is not None:
+            return recent_failure
+
+        with self._slot(workload):
+            return self._dispatch(prompt, provider_str, response_schema)
+
+    def _dispatch(
+        self, prompt: str, provider_str: str, schema: Optional[Dict[str, Any]] = None
+    ) -> LLMGenerationResult:
         try:
             if provider_str == ModelProvider.OPENAI.value:
-                return self._call_openai(prompt)
+                return self._call_openai(prompt, schema)
             elif provider_str == ModelProvider.OSS.value:
-                return self._call_oss_model_service(prompt)
+                return self._call_oss_model_service(prompt, schema)
             else:
                 logger.warning(
                     "Unknown provider '%s'; falling back to mock.", provider_str
@@ -88,14 +138,200 @@ class LLMClient:
                 provider_str,
                 exc,
             )
+            self._mark_failed(provider_str)
             return self._mock_response(
                 prompt, provider_str, model="mock-fallback-error"
             )
 
+    async def agenerate_text(
+        self,
+        prompt: str,
+        provider: Optional[ModelProvider] = None,
+        timeout: Optional[float] = None,
+        workload: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+    ) -> LLMGenerationResult:
+        """
+        Async version of generate_text() (same provider selection and fallbacks).
+
+        Does not block the event loop while waiting on the provider.
+        `timeout` overrides MODEL_SERVICE_TIMEOUT_SECONDS for this call.
+        """
+        provider_str = self._resolve_provider(provider)
+        explicit_provider = provider is not None
+
+        if self._settings.use_mock_llm and not explicit_provider:
+            logger.info("LLMClient in mock mode. provider=%s", provider_str)
+            return self._mock_response(prompt, provider_str, model="mock")
+
+        recent_failure = self._recent_failure(prompt, provider_str)
+        if recent_failure is not None:
+            return recent_failure
+
+        async with self._aslot(workload):
+            return await self._adispatch(prompt, provider_str, timeout, response_schema)
+
+    async def _adispatch(
+        self,
+        prompt: str,
+        provider_str: str,
+        timeout: Optional[float],
+        schema: Optional[Dict[str, Any]] = None,
+    ) -> LLMGenerationResult:
+        try:
+            if provider_str == ModelProvider.OPENAI.value:
+                return await self._acall_openai(prompt, schema)
+            elif provider_str == ModelProvider.OSS.value:
+                return await self._acall_oss_model_service(prompt, timeout=timeout, schema=schema)
+            else:
+                logger.warning(
+                    "Unknown provider '%s'; falling back to mock.", provider_str
+                )
+                return self._mock_response(prompt, provider_str, model="mock-unknown")
+        except Exception as exc:  # pragma: no cover - network / provider issues
+            logger.warning(
+                "LLM provider call failed (provider=%s). Falling back to mock. Error: %s",
+                provider_str,
+                exc,
+            )
+            self._mark_failed(provider_str)
+            return self._mock_response(
+                prompt, provider_str, model="mock-fallback-error"
+            )
+
+    async def astream_text(
+        self,
+        prompt: str,
+        provider: Optional[ModelProvider] = None,
+        workload: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """
+        Streaming version of agenerate_text(): yields text deltas as the
+        provider produces them, then one last chunk with the assembled result.
+
+        Same provider selection and fallbacks. If the provider fails before
+        sending anything, the fallback text is sent as a single delta; if it
+        fails mid-stream, the last chunk has `complete=False` (callers should
+        not cache it).
+        """
+        provider_str = self._resolve_provider(provider)
+        explicit_provider = provider is not None
+
+        if self._settings.use_mock_llm and not explicit_provider:
+            logger.info("LLMClient in mock mode. provider=%s", provider_str)
+            async for chunk in self._astream_result(self._mock_response(prompt, provider_str, model="mock")):
+                yield chunk
+            return
+
+        recent_failure = self._recent_failure(prompt, provider_str)
+        if recent_failure is not None:
+            async for chunk in self._astream_result(recent_failure):
+                yield chunk
+            return
+
+        # The slot is held for the whole stream.
+        async with self._aslot(workload):
+            async for chunk in self._astream_dispatch(prompt, provider_str, response_schema):
+                yield chunk
+
+    async def _astream_dispatch(
+        self, prompt: str, provider_str: str, schema: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[LLMStreamChunk]:
+        if provider_str == ModelProvider.OPENAI.value:
+            source = self._astream_openai(prompt, schema)
+        elif provider_str == ModelProvider.OSS.value:
+            source = self._astream_oss_model_service(prompt, schema)
+        else:
+            logger.warning("Unknown provider '%s'; falling back to mock.", provider_str)
+            source = self._astream_result(self._mock_response(prompt, provider_str, model="mock-unknown"))
+
+        parts: List[str] = []
+        try:
+            async for chunk in source:
+                if chunk.result is not None:
+                    yield chunk
+                    return
+                parts.append(chunk.delta)
+                yield chunk
+        except Exception as exc:  # pragma: no cover - network / provider issues
+            logger.warning("LLM provider stream failed (provider=%s): %s", provider_str, exc)
+            self._mark_failed(provider_str)
+            if parts:
+                partial = LLMGenerationResult(text="".join(parts), provider=provider_str, model=None)
+                yield LLMStreamChunk(result=partial, complete=False)
+                return
+            fallback = (
+                self._oss_failure(prompt, exc)
+                if provider_str == ModelProvider.OSS.value
+                else self._mock_response(prompt, provider_str, model="mock-fallback-error")
+            )
+            async for chunk in self._astream_result(fallback):
+                yield chunk
+
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections (call from the app's shutdown hook)."""
+        if self._async_http_client is not None:
+            await self._async_http_client.aclose()
+            self._async_http_client = None
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+
     # ---------------------
     # Internal helpers
     # ---------------------
 
+    def _http_options(self) -> Dict[str, Any]:
+        """Pool/timeout options shared by the sync and async model_service clients."""
+        return {
+            "base_url": self._settings.model_service_base_url.rstrip("/"),
+            "timeout": httpx.Timeout(
+                self._settings.model_service_timeout_seconds,
+                connect=self._settings.model_service_connect_timeout_seconds,
+            ),
+            "limits": httpx.Limits(
+                max_connections=self._settings.model_service_max_connections,
+                max_keepalive_connections=self._settings.model_service_max_keepalive_connections,
+                keepalive_expiry=self._settings.model_service_keepalive_expiry_seconds,
+            ),
+        }
+
+    def _recent_failure(self, prompt: str, provider_str: str) -> Optional[LLMGenerationResult]:
+        """The fallback answer if `provider_str` failed within the negative-cache window, else None."""
+        if time.monotonic() >= self._failed_until.get(provider_str, 0.0):
+            return None
+        logger.info("Provider %s failed recently; answering with the fallback.", provider_str)
+        if provider_str == ModelProvider.OSS.value:
+            text, model = self._oss_local_fallback(prompt)
+            return LLMGenerationResult(text=text, provider="oss", model=model)
+        return self._mock_response(prompt, provider_str, model="mock-fallback-error")
+
+    def _mark_failed(self, provider_str: str) -> None:
+        ttl = self._settings.cache_negative_ttl_seconds
+        if ttl > 0:
+            self._failed_until[provider_str] = time.monotonic() + ttl
+
+    def _slot(self, workload: Optional[str]) -> Any:
+        if self._scheduler is None or workload is None:
+            return nullcontext()
+        return self._scheduler.slot(workload)
+
+    def _aslot(self, workload: Optional[str]) -> Any:
+        if self._scheduler is None or workload is None:
+            return nullcontext()
+        return self._scheduler.aslot(workload)
+
+    def _get_http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            self._http_client = httpx.Client(**self._http_options())
+        return self._http_client
+
+    def _get_async_http_client(self) -> httpx.AsyncClient:
+        if self._async_http_client is None:
+            self._async_http_client = httpx.AsyncClient(**self._http_options())
+        return self._async_http_client
+
     def _resolve_provider(
         self,
         provider: Optional[ModelProvider],
@@ -133,7 +369,7 @@ class LLMClient:
     # Provider implementations
     # ---------------------
 
-    def _call_openai(self, prompt: str) -> LLMGenerationResult:
+    def _call_openai(self, prompt: str, schema: Optional[Dict[str, Any]] = None) -> LLMGenerationResult:
         """
         Call OpenAI's chat completion API (works with SDK v1/v2).
         """
@@ -142,19 +378,22 @@ class LLMClient:
             return self._mock_response(prompt, "openai", model=None)
 
         model_name = self._settings.openai_model or "gpt-4o-mini"
-        response = self._openai_client.chat.completions.create(
+        response = self._openai_client.chat.completions.create(**self._openai_request(prompt, model_name, schema))
+        text = response.choices[0].message.content.strip()
+        return LLMGenerationResult(
+            text=text,
+            provider="openai",
             model=model_name,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a concise assistant that writes release notes and greetings."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=400,
-            temperature=0.4,
+        )
+
+    async def _acall_openai(self, prompt: str, schema: Optional[Dict[str, Any]] = None) -> LLMGenerationResult:
+        if self._async_openai_client is None:
+            logger.warning("OpenAI backend requested but not initialized; using mock.")
+            return self._mock_response(prompt, "openai", model=None)
+
+        model_name = self._settings.openai_model or "gpt-4o-mini"
+        response = await self._async_openai_client.chat.completions.create(
+            **self._openai_request(prompt, model_name, schema)
         )
         text = response.choices[0].message.content.strip()
         return LLMGenerationResult(
@@ -163,7 +402,31 @@ class LLMClient:
             model=model_name,
         )
 
-    def _call_oss_model_service(self, prompt: str) -> LLMGenerationResult:
+    @staticmethod
+    def _openai_request(prompt: str, model_name: str, schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        request: Dict[str, Any] = {
+            "model": model_name,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": (
+                        "You are a concise assistant that writes release notes and greetings."
+                    ),
+                },
+                {"role": "user", "content": prompt},
+            ],
+            "max_tokens": 400,
+            "temperature": 0.4,
+        }
+        if schema is not None:
+            # Structured outputs: decoding is constrained to the schema.
+            request["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "schema": schema, "strict": True},
+            }
+        return request
+
+    def _call_oss_model_service(self, prompt: str, schema: Optional[Dict[str, Any]] = None) -> LLMGenerationResult:
         """
         Call the hosted OSS model service via HTTP.
 
@@ -171,48 +434,123 @@ class LLMClient:
         an endpoint like:
 
             POST {MODEL_SERVICE_BASE_URL}/api/v1/generate
-            body: {"prompt": "..."}  # can be extended with provider/model later
+            body: {"prompt": "...", "json_schema": {...}}  # json_schema optional
 
         For this PoC, we assume the response JSON has at least:
             {"text": "...", "model": "tiny-oss-model"}
 
         We'll implement that endpoint in the model_service app in a later part.
         """
-        base_url = self._settings.model_service_base_url.rstrip("/")
-        url = f"{base_url}/api/v1/generate"
+        logger.info("Calling OSS model service at %s", self._settings.model_service_base_url)
+        try:
+            response = self._get_http_client().post("/api/v1/generate", json=self._oss_body(prompt, schema))
+            response.raise_for_status()
+            return self._oss_result(response.json())
+        except Exception as exc:
+            return self._oss_failure(prompt, exc)
 
-        logger.info("Calling OSS model service at %s", url)
+    async def _acall_oss_model_service(
+        self,
+        prompt: str,
+        timeout: Optional[float] = None,
+        schema: Optional[Dict[str, Any]] = None,
+    ) -> LLMGenerationResult:
+        """Async version of _call_oss_model_service() on the pooled AsyncClient."""
+        logger.info("Calling OSS model service at %s", self._settings.model_service_base_url)
+        kwargs: Dict[str, Any] = {"json": self._oss_body(prompt, schema)}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
         try:
-            response = httpx.post(
-                url,
-                json={"prompt": prompt},
-                timeout=10.0,
-            )
+            response = await self._get_async_http_client().post("/api/v1/generate", **kwargs)
+            response.raise_for_status()
+            return self._oss_result(response.json())
+        except Exception as exc:
+            return self._oss_failure(prompt, exc)
+
+    async def _astream_oss_model_service(
+        self, prompt: str, schema: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """Consume model_service's SSE stream (POST /api/v1/generate/stream)."""
+        logger.info("Streaming from OSS model service at %s", self._settings.model_service_base_url)
+        parts: List[str] = []
+        async with self._get_async_http_client().stream(
+            "POST", "/api/v1/generate/stream", json=self._oss_body(prompt, schema)
+        ) as response:
             response.raise_for_status()
-            data = response.json()
+            async for event, data in aiter_sse(response.aiter_lines()):
+                if event == "token":
+                    parts.append(data.get("text", ""))
+                    yield LLMStreamChunk(delta=data.get("text", ""))
+                elif event == "done":
+                    result = self._oss_result({"text": "".join(parts), "model": data.get("model") or "oss-model"})
+                    yield LLMStreamChunk(result=result)
+                    return
+                elif event == "error":
+                    raise RuntimeError(f"model_service stream error: {data.get('detail')}")
+        raise RuntimeError("model_service stream ended without a 'done' event.")
+
+    async def _astream_openai(
+        self, prompt: str, schema: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[LLMStreamChunk]:
+        if self._async_openai_client is None:
+            logger.warning("OpenAI backend requested but not initialized; using mock.")
+            async for chunk in self._astream_result(self._mock_response(prompt, "openai", model=None)):
+                yield chunk
+            return
 
-            text = data.get("text", "")
-            model = data.get("model", "oss-model")
+        model_name = self._settings.openai_model or "gpt-4o-mini"
+        stream = await self._async_openai_client.chat.completions.create(
+            **self._openai_request(prompt, model_name, schema), stream=True
+        )
+        parts: List[str] = []
+        async for event in stream:
+            delta = event.choices[0].delta.content if event.choices else None
+            if delta:
+                parts.append(delta)
+                yield LLMStreamChunk(delta=delta)
+        yield LLMStreamChunk(
+            result=LLMGenerationResult(text="".join(parts).strip(), provider="openai", model=model_name)
+        )
 
-            if not text:
-                text = "[oss] Empty response body."
+    @staticmethod
+    def _oss_body(prompt: str, schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"prompt": prompt}
+        if schema is not None:
+            body["json_schema"] = schema
+        return body
 
-            return LLMGenerationResult(
-                text=text,
-                provider="oss",
-                model=model,
-            )
-        except Exception as exc:
-            logger.warning(
-                "OSS model service call failed (%s). Using local fallback response.",
-                exc,
-            )
-            text, model = self._oss_local_fallback(prompt)
-            return LLMGenerationResult(
-                text=text,
-                provider="oss",
-                model=model,
-            )
+    @staticmethod
+    async def _astream_result(result: LLMGenerationResult) -> AsyncIterator[LLMStreamChunk]:
+        """A non-streaming result as a stream: one delta, then the result."""
+        yield LLMStreamChunk(delta=result.text)
+        yield LLMStreamChunk(result=result)
+
+    @staticmethod
+    def _oss_result(data: Dict[str, Any]) -> LLMGenerationResult:
+        text = data.get("text", "")
+        model = data.get("model", "oss-model")
+
+        if not text:
+            text = "[oss] Empty response body."
+
+        return LLMGenerationResult(
+            text=text,
+            provider="oss",
+            model=model,
+        )
+
+    def _oss_failure(self, prompt: str, exc: Exception) -> LLMGenerationResult:
+        logger.warning(
+            "OSS model service call failed (%s). Using local fallback response.",
+            exc,
+        )
+        self._mark_failed(ModelProvider.OSS.value)
+        text, model = self._oss_local_fallback(prompt)
+        return LLMGenerationResult(
+            text=text,
+            provider="oss",
+            model=model,
+        )
 
     def _oss_local_fallback(self, prompt: str) -> tuple[str, str]:
         """
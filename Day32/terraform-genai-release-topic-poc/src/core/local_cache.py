@@ -0,0 +1,75 @@
+# src/core/local_cache.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class LocalTTLCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+
+    Used as the L1 tier in front of Redis (see RedisCache):
+    - Hot keys are served from process memory (no network round trip, no json.loads).
+    - Entry lifetime is min(L1 TTL, remaining Redis TTL), so L1 never outlives L2.
+    - Thread-safe: FastAPI runs sync endpoints on a thread pool.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value.
+
+        ttl_seconds (e.g. the remaining Redis TTL) can only shorten the L1 TTL.
+        """
+        ttl = self._ttl_seconds if ttl_seconds is None else min(self._ttl_seconds, ttl_seconds)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict[str, int]:
+        """Small stats dict for debugging/observability."""
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self._max_entries}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
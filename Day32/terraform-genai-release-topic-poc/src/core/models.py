@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from datetime import date
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -84,6 +84,13 @@ class ReleaseNoteResponse(BaseModel):
         default=False,
         description="True if result came from cache (Redis) instead of a fresh LLM call.",
     )
+    similarity: Optional[float] = Field(
+        default=None,
+        description=(
+            "Set on near-duplicate cache hits: estimated similarity (0-1) between this request "
+            "and the cached one that was served."
+        ),
+    )
 
 
 # ------------------------
@@ -150,6 +157,80 @@ class GreetingResponse(BaseModel):
     )
 
 
+# ------------------------
+# Cache Admin Contracts
+# ------------------------
+
+
+class CacheNamespace(str, Enum):
+    """Cached-response namespaces that can be invalidated in bulk."""
+
+    RELEASE_NOTES = "release-notes"
+    GREETING = "greeting"
+
+
+class CacheInvalidateRequest(BaseModel):
+    """
+    Bulk invalidation: every cached response in `namespace`, optionally only
+    those produced by `provider` and/or `model` (e.g. after a model upgrade).
+    """
+
+    namespace: CacheNamespace = Field(..., description="release-notes | greeting.")
+    provider: Optional[str] = Field(default=None, description="Only entries from this provider, e.g. 'oss'.")
+    model: Optional[str] = Field(default=None, description="Only entries from this model, e.g. 'oss-fallback'.")
+
+
+class CacheInvalidateResponse(BaseModel):
+    deleted: int = Field(..., description="Cache keys removed.")
+    scanned: Optional[int] = Field(default=None, description="Keys examined (bulk invalidation only).")
+
+
+# ------------------------
+# Job Contracts
+# ------------------------
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of an async job (see core.jobs)."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobSubmitResponse(BaseModel):
+    """
+    Returned immediately when a job is submitted (HTTP 202).
+
+    Poll `status_url` (optionally with `?wait=<seconds>` to long-poll) until
+    the status is 'succeeded' or 'failed'.
+    """
+
+    job_id: str = Field(..., description="Opaque job identifier.")
+    status: JobStatus = Field(..., description="Initial status, normally 'queued'.")
+    status_url: str = Field(..., description="Relative URL to poll for the result.")
+
+
+class JobStatusResponse(BaseModel):
+    """
+    Current state of a job.
+
+    `result` holds the job's response (e.g. a ReleaseNoteResponse dict)
+    once status is 'succeeded'; `error` is set when it is 'failed'.
+    """
+
+    job_id: str = Field(..., description="Opaque job identifier.")
+    kind: str = Field(..., description="Job type, e.g. 'release-notes'.")
+    status: JobStatus = Field(..., description="queued | running | succeeded | failed.")
+    result: Optional[Dict[str, Any]] = Field(default=None, description="Job output when succeeded.")
+    error: Optional[str] = Field(default=None, description="Failure reason when failed.")
+    attempts: int = Field(default=0, description="Times a worker has picked up this job.")
+    submitted_at: float = Field(..., description="Unix time the job was submitted.")
+    started_at: Optional[float] = Field(default=None, description="Unix time the last attempt started.")
+    finished_at: Optional[float] = Field(default=None, description="Unix time the job finished.")
+
+
 # ------------------------
 # LLM Internal Model
 # ------------------------
@@ -177,6 +258,28 @@ class LLMGenerationResult(BaseModel):
     )
 
 
+class LLMStreamChunk(BaseModel):
+    """
+    One piece of a streamed LLM call (LLMClient.astream_text).
+
+    Every chunk but the last carries a text `delta`; the last one carries the
+    assembled `result` (and no delta).
+    """
+
+    delta: str = Field(
+        default="",
+        description="Newly generated text since the previous chunk.",
+    )
+    result: Optional[LLMGenerationResult] = Field(
+        default=None,
+        description="Final assembled result; only set on the last chunk.",
+    )
+    complete: bool = Field(
+        default=True,
+        description="False if the stream broke mid-way and `result` only holds partial text.",
+    )
+
+
 # ------------------------
 # Health Contracts
 # ------------------------
@@ -0,0 +1,333 @@
+# src/core/rate_limit.py
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Collection, Dict, Optional, Tuple
+
+import redis
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "d32-release:ratelimit:"
+
+# Shared bucket for requests carrying an API key that is not configured.
+ANONYMOUS_CLIENT = "anonymous"
+
+# Atomic refill + take on a hash {t: tokens, ts: last refill ms}.
+# ARGV: capacity, refill tokens per ms, now ms, cost, key TTL ms.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+if now > ts then
+  tokens = math.min(capacity, tokens + (now - ts) * rate)
+  ts = now
+end
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', tostring(ts))
+redis.call('PEXPIRE', KEYS[1], ARGV[5])
+return {allowed, tostring(tokens)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A token bucket: holds up to `capacity` tokens, refilled at `refill_per_second`."""
+
+    capacity: float
+    refill_per_second: float
+
+    def scaled(self, factor: float) -> "RateLimit":
+        return RateLimit(self.capacity * factor, self.refill_per_second * factor)
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: float
+    remaining: float
+    reset_seconds: float  # until the bucket is full again
+    retry_after_seconds: float = 0.0  # until `cost` tokens are available (denied only)
+    window_seconds: float = 0.0  # time to refill an empty bucket
+
+    def headers(self) -> Dict[str, str]:
+        """IETF RateLimit header fields (draft-ietf-httpapi-ratelimit-headers), plus Retry-After when denied."""
+        headers = {
+            "RateLimit-Limit": str(int(self.limit)),
+            "RateLimit-Remaining": str(max(0, int(self.remaining))),
+            "RateLimit-Reset": str(math.ceil(self.reset_seconds)),
+            "RateLimit-Policy": f"{int(self.limit)};w={math.ceil(self.window_seconds)}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after_seconds)))
+        return headers
+
+
+class RateLimitExceeded(Exception):
+    """The caller's token bucket for this endpoint is empty (HTTP 429)."""
+
+    def __init__(self, endpoint: str, result: RateLimitResult) -> None:
+        super().__init__(f"Rate limit exceeded for '{endpoint}'; retry in {result.retry_after_seconds:.1f}s.")
+        self.endpoint = endpoint
+        self.result = result
+
+
+class TokenBucketLimiter:
+    """
+    Distributed token buckets, one per (client, endpoint), stored in Redis.
+
+    - Each request takes `cost` tokens (1 by default; larger for expensive
+      calls, see estimate_cost). A bucket refills continuously up to its
+      capacity, so `capacity` is the allowed burst and `refill_per_second`
+      the sustained rate.
+    - Refill + take is atomic across pods: a Lua script, or, where scripting
+      is unavailable (some proxies/managed setups, fakeredis), an optimistic
+      WATCH/MULTI transaction.
+    - Local pre-check: the pod remembers the token count Redis last returned
+      for a bucket. Other pods only take tokens, so "last seen + refill since"
+      is an upper bound of what Redis holds; if even that is below `cost`,
+      the request is rejected without a Redis round trip. A flooding client
+      is therefore mostly turned away in-process, and the pre-check never
+      rejects a request that Redis would allow.
+    - Per-client weights (`client_weights`, keyed by the client id before
+      hashing) scale capacity and rate, e.g. {"key:partner-key": 5}.
+    - If Redis fails, requests are allowed (fail open, like the cache).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        limits: Dict[str, RateLimit],
+        client_weights: Optional[Dict[str, float]] = None,
+        local_max_entries: int = 10000,
+        watch_retries: int = 5,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._client = client
+        self._limits = limits
+        self._client_weights = client_weights or {}
+        self._local_max_entries = local_max_entries
+        self._watch_retries = watch_retries
+        self._clock = clock
+        self._script = client.register_script(_TOKEN_BUCKET_LUA)
+        self._use_lua = True
+        self._seen: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key -> (tokens, at)
+        self._lock = threading.Lock()
+        self.local_rejections = 0
+        self.redis_calls = 0
+
+    # Public API
+    # ----------
+
+    def limit_for(self, endpoint: str, client_id: str) -> Optional[RateLimit]:
+        limit = self._limits.get(endpoint)
+        if limit is None:
+            return None
+        return limit.scaled(self._client_weights.get(client_id, 1.0))
+
+    def precheck(self, endpoint: str, client_id: str, cost: float = 1.0) -> Optional[RateLimitResult]:
+        """
+        The rejection, if this pod already knows the bucket cannot cover
+        `cost`; None if Redis has to decide (call acquire()). Never blocks.
+        """
+        limit = self.limit_for(endpoint, client_id)
+        if limit is None:
+            return None
+        key = self._key(endpoint, client_id)
+        cost = min(cost, limit.capacity)
+        with self._lock:
+            seen = self._seen.get(key)
+        if seen is None:
+            return None
+        tokens = self._refilled(limit, *seen, self._clock())
+        if tokens >= cost:
+            return None
+        with self._lock:
+            self.local_rejections += 1
+        return self._result(limit, False, tokens, cost)
+
+    def acquire(self, endpoint: str, client_id: str, cost: float = 1.0) -> Optional[RateLimitResult]:
+        """
+        Take `cost` tokens from the caller's bucket for `endpoint`. Returns
+        None for endpoints without a limit. Blocking (one Redis round trip
+        unless the local pre-check already rejects).
+        """
+        rejected = self.precheck(endpoint, client_id, cost)
+        if rejected is not None:
+            return rejected
+        limit = self.limit_for(endpoint, client_id)
+        if limit is None:
+            return None
+        key = self._key(endpoint, client_id)
+        cost = min(cost, limit.capacity)  # an oversized request can still run on a full bucket
+        now = self._clock()
+        try:
+            allowed, tokens = self._take(key, limit, cost, now)
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Rate limiter unavailable; allowing request. key=%s error=%s", key, exc)
+            return self._result(limit, True, limit.capacity, cost)
+        with self._lock:
+            self.redis_calls += 1
+            self._seen[key] = (tokens, now)
+            self._seen.move_to_end(key)
+            while len(self._seen) > self._local_max_entries:
+                self._seen.popitem(last=False)
+        return self._result(limit, allowed, tokens, cost)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "lua" if self._use_lua else "watch",
+                "redis_calls": self.redis_calls,
+                "local_rejections": self.local_rejections,
+                "tracked_buckets": len(self._seen),
+            }
+
+    # Internal helpers
+    # ----------------
+
+    @staticmethod
+    def _key(endpoint: str, client_id: str) -> str:
+        # Hashed: raw API keys never end up in Redis key names.
+        digest = hashlib.sha256(client_id.encode("utf-8")).hexdigest()[:24]
+        return f"{KEY_PREFIX}{endpoint}:{digest}"
+
+    @staticmethod
+    def _refilled(limit: RateLimit, tokens: float, at: float, now: float) -> float:
+        return min(limit.capacity, tokens + max(0.0, now - at) * limit.refill_per_second)
+
+    def _take(self, key: str, limit: RateLimit, cost: float, now: float) -> Tuple[bool, float]:
+        now_ms = int(now * 1000)
+        rate_per_ms = limit.refill_per_second / 1000
+        ttl_ms = int(1000 * limit.capacity / limit.refill_per_second) + 1000 if limit.refill_per_second > 0 else 86400000
+        if self._use_lua:
+            try:
+                allowed, tokens = self._script(keys=[key], args=[limit.capacity, rate_per_ms, now_ms, cost, ttl_ms])
+                return bool(int(allowed)), float(tokens)
+            except redis.exceptions.ResponseError as exc:
+                if "unknown command" not in str(exc).lower() and "noscript" not in str(exc).lower():
+                    raise
+                logger.warning("Redis scripting unavailable (%s); rate limiter uses WATCH/MULTI.", exc)
+                self._use_lua = False
+        return self._take_watch(key, limit, cost, now_ms, rate_per_ms, ttl_ms)
+
+    def _take_watch(
+        self, key: str, limit: RateLimit, cost: float, now_ms: int, rate_per_ms: float, ttl_ms: int
+    ) -> Tuple[bool, float]:
+        """Same algorithm as the Lua script, as an optimistic transaction (retried on conflict)."""
+        for _ in range(self._watch_retries):
+            with self._client.pipeline(transaction=True) as pipe:
+                try:
+                    pipe.watch(key)
+                    state = pipe.hmget(key, "t", "ts")
+                    if state[0] is None or state[1] is None:
+                        tokens, ts = float(limit.capacity), now_ms
+                    else:
+                        tokens, ts = float(state[0]), int(float(state[1]))
+                    if now_ms > ts:
+                        tokens, ts = min(limit.capacity, tokens + (now_ms - ts) * rate_per_ms), now_ms
+                    allowed = tokens >= cost
+                    if allowed:
+                        tokens -= cost
+                    pipe.multi()
+                    pipe.hset(key, mapping={"t": repr(tokens), "ts": str(ts)})
+                    pipe.pexpire(key, ttl_ms)
+                    pipe.execute()
+                    return allowed, tokens
+                except redis.exceptions.WatchError:
+                    continue
+        raise RuntimeError(f"Token bucket update kept conflicting ({self._watch_retries} attempts).")
+
+    @staticmethod
+    def _result(limit: RateLimit, allowed: bool, tokens: float, cost: float) -> RateLimitResult:
+        rate = limit.refill_per_second
+        return RateLimitResult(
+            allowed=allowed,
+            limit=limit.capacity,
+            remaining=tokens,
+            reset_seconds=(limit.capacity - tokens) / rate if rate > 0 else 0.0,
+            retry_after_seconds=0.0 if allowed else (cost - tokens) / rate if rate > 0 else 3600.0,
+            window_seconds=limit.capacity / rate if rate > 0 else 0.0,
+        )
+
+
+def resolve_client_id(
+    api_key: Optional[str],
+    peer_host: Optional[str],
+    forwarded_for: Optional[str],
+    api_keys: Collection[str],
+    trusted_proxy_hops: int = 0,
+) -> str:
+    """
+    Rate-limit identity of a request (the bucket it draws from).
+
+    - A configured API key (RATE_LIMIT_API_KEYS): "key:<api key>".
+    - Any other key: the one shared ANONYMOUS_CLIENT bucket, so inventing
+      or rotating keys does not create fresh buckets.
+    - No key: "ip:<addr>". Behind `trusted_proxy_hops` proxies that each
+      append the address they saw to X-Forwarded-For, the client is the
+      entry that many places from the right; anything further left was
+      written by the client and is ignored. With 0 hops, or a header
+      shorter than that, the TCP peer is used.
+    """
+    api_key = (api_key or "").strip()
+    if api_key:
+        return f"key:{api_key}" if api_key in api_keys else ANONYMOUS_CLIENT
+    host = peer_host or "unknown"
+    if trusted_proxy_hops > 0 and forwarded_for:
+        hops = [part.strip() for part in forwarded_for.split(",")]
+        if len(hops) >= trusted_proxy_hops and hops[-trusted_proxy_hops]:
+            host = hops[-trusted_proxy_hops]
+    return f"ip:{host}"
+
+
+def estimate_cost(text: str, tokens_per_unit: int) -> float:
+    """
+    Rate-limit cost of a request whose prompt includes `text`: 1 plus one
+    unit per `tokens_per_unit` estimated prompt tokens (~4 chars per token),
+    so long change descriptions drain the bucket faster. Whole units only.
+    """
+    if tokens_per_unit <= 0:
+        return 1.0
+    estimated_tokens = math.ceil(len(text or "") / 4)
+    return float(1 + estimated_tokens // tokens_per_unit)
+
+
+def build_rate_limiter(settings: Settings, client: Any) -> Optional[TokenBucketLimiter]:
+    """TokenBucketLimiter from settings, or None when RATE_LIMIT_ENABLED=false."""
+    if not settings.rate_limit_enabled:
+        return None
+    return TokenBucketLimiter(
+        client,
+        limits={
+            "release-notes": RateLimit(
+                capacity=settings.rate_limit_release_notes_burst,
+                refill_per_second=settings.rate_limit_release_notes_per_minute / 60,
+            ),
+            "greeting": RateLimit(
+                capacity=settings.rate_limit_greeting_burst,
+                refill_per_second=settings.rate_limit_greeting_per_minute / 60,
+            ),
+        },
+        client_weights=settings.rate_limit_client_weights,
+    )
@@ -0,0 +1,82 @@
+# src/core/redis_pool.py
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict
+
+import redis
+import redis.asyncio as aioredis
+
+from config.settings import Settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_kwargs(settings: Settings) -> Dict[str, Any]:
+    """
+    Connection pool options shared by the sync and async clients.
+
+    - max_connections: hard cap per process; callers block for at most
+      redis_pool_timeout_seconds when the pool is exhausted (BlockingConnectionPool)
+      instead of opening unbounded connections.
+    - socket/connect timeouts: a slow or partitioned Redis fails fast (and the
+      cache degrades to a miss) instead of stalling request threads.
+    - health_check_interval: idle connections are PINGed before reuse, so
+      connections silently dropped by ElastiCache/NAT are detected.
+    """
+    return {
+        "max_connections": settings.redis_max_connections,
+        "timeout": settings.redis_pool_timeout_seconds,
+        "socket_timeout": settings.redis_socket_timeout_seconds,
+        "socket_connect_timeout": settings.redis_socket_connect_timeout_seconds,
+        "health_check_interval": settings.redis_health_check_interval_seconds,
+        # Values are binary (see core.codecs), so responses stay bytes.
+        "decode_responses": False,
+    }
+
+
+def build_redis_client(settings: Settings) -> redis.Redis:
+    """Sync Redis client backed by an explicitly configured, bounded pool."""
+    pool = redis.BlockingConnectionPool.from_url(settings.redis_url, **_pool_kwargs(settings))
+    logger.info(
+        "Redis pool created (max_connections=%s, socket_timeout=%ss)",
+        settings.redis_max_connections,
+        settings.redis_socket_timeout_seconds,
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def build_jobs_redis_client(settings: Settings) -> redis.Redis:
+    """
+    Sync client for the job queue (core.jobs), on its own pool.
+
+    Workers park in XREADGROUP BLOCK for up to jobs_claim_block_ms, which the
+    cache pool's short socket_timeout would cut off (and each parked worker
+    would hold a cache connection). Here the read timeout is the block time
+    plus the normal command timeout, and the pool has room for every worker
+    thread plus the API's submit/status calls.
+    """
+    kwargs = _pool_kwargs(settings)
+    kwargs["socket_timeout"] = settings.jobs_claim_block_ms / 1000 + settings.redis_socket_timeout_seconds
+    kwargs["max_connections"] = (
+        max(settings.jobs_worker_pool_size, settings.jobs_api_workers) + settings.redis_max_connections
+    )
+    pool = redis.BlockingConnectionPool.from_url(settings.redis_url, **kwargs)
+    logger.info(
+        "Redis jobs pool created (max_connections=%s, socket_timeout=%ss)",
+        kwargs["max_connections"],
+        kwargs["socket_timeout"],
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def build_async_redis_client(settings: Settings) -> aioredis.Redis:
+    """redis.asyncio client with the same pool settings, for async endpoints."""
+    pool = aioredis.BlockingConnectionPool.from_url(settings.redis_url, **_pool_kwargs(settings))
+    logger.info(
+        "Async Redis pool created (max_connections=%s, socket_timeout=%ss)",
+        settings.redis_max_connections,
+        settings.redis_socket_timeout_seconds,
+    )
+    return aioredis.Redis(connection_pool=pool)
@@ -0,0 +1,297 @@
+# src/core/scheduler.py
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+
+# Set per request (API middleware) or per job (worker); read when a slot is requested.
+current_tenant: contextvars.ContextVar[str] = contextvars.ContextVar("llm_tenant", default=DEFAULT_TENANT)
+
+
+class DeadlineExceeded(Exception):
+    """The request could not get an LLM slot before its deadline and was dropped."""
+
+    def __init__(self, workload: str, waited_seconds: float) -> None:
+        super().__init__(f"No LLM capacity for '{workload}' within its deadline ({waited_seconds:.2f}s waited).")
+        self.workload = workload
+        self.waited_seconds = waited_seconds
+
+
+@dataclass(frozen=True)
+class PriorityClass:
+    """
+    How one kind of LLM call is scheduled.
+
+    - priority: lower runs first; a queued call of a lower class is never
+      picked while a higher class has calls waiting.
+    - deadline_seconds: max time to wait for a slot; after that the call is
+      dropped (DeadlineExceeded) instead of running for a client that gave up.
+    - cost: relative LLM cost, used by weighted fair queueing between tenants.
+    """
+
+    name: str
+    priority: int
+    deadline_seconds: float
+    cost: float = 1.0
+
+
+@dataclass
+class _Waiter:
+    workload: str
+    tenant: str
+    start_tag: float
+    finish_tag: float
+    enqueued_at: float
+    deadline: float
+    notify: Callable[[], None]
+    granted: bool = False
+    dropped: bool = False
+    cancelled: bool = False
+
+
+@dataclass
+class _ClassQueue:
+    spec: PriorityClass
+    heap: List[Tuple[float, int, _Waiter]] = field(default_factory=list)
+    virtual_time: float = 0.0
+    last_finish: Dict[str, float] = field(default_factory=dict)
+
+
+class LLMScheduler:
+    """
+    Admission control in front of LLM provider calls.
+
+    At most `max_concurrency` calls run at once. When a slot frees up, the
+    next call is chosen by:
+    1) Priority class (strict): e.g. interactive greetings before release
+       notes before background work (pre-warming), so a burst of
+       release-note work cannot starve greetings.
+    2) Within a class, weighted fair queueing between tenants (start-time
+       fair queueing): each tenant's calls get virtual tags advancing by
+       cost / weight, and the smallest start tag runs next. One tenant's
+       burst only delays its own later calls. Tenants come from a client
+       header, so only those in `tenant_weights` are tracked on their own;
+       any other name shares the "default" tenant. A tenant whose last tag
+       the virtual clock has passed is forgotten (it would restart from the
+       clock anyway).
+    3) Deadlines: a call still waiting at its class deadline is dropped
+       with DeadlineExceeded (shed load early rather than answer late).
+
+    Works for threads (`slot`) and asyncio tasks (`aslot`) sharing one
+    instance; both hold a slot for the duration of the `with` block.
+    """
+
+    def __init__(
+        self,
+        classes: List[PriorityClass],
+        max_concurrency: int = 16,
+        tenant_weights: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self._classes = {c.name: _ClassQueue(spec=c) for c in classes}
+        self._by_priority = sorted(self._classes.values(), key=lambda q: q.spec.priority)
+        self._max_concurrency = max(1, max_concurrency)
+        self._tenant_weights = tenant_weights or {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._granted: Dict[str, int] = {c.name: 0 for c in classes}
+        self._dropped: Dict[str, int] = {c.name: 0 for c in classes}
+        self._wait_seconds: Dict[str, float] = {c.name: 0.0 for c in classes}
+
+    # Public API
+    # ----------
+
+    @contextmanager
+    def slot(self, workload: str, tenant: Optional[str] = None) -> Iterator[None]:
+        """Block the calling thread until the call may run (or raise DeadlineExceeded)."""
+        event = threading.Event()
+        waiter = self._enqueue(workload, tenant, event.set)
+        if not event.wait(max(0.0, waiter.deadline - time.monotonic())):
+            self._give_up(waiter)
+        if waiter.dropped:
+            raise DeadlineExceeded(workload, time.monotonic() - waiter.enqueued_at)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aslot(self, workload: str, tenant: Optional[str] = None) -> AsyncIterator[None]:
+        """Async version of slot(); waits without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+
+        def notify() -> None:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        waiter = self._enqueue(workload, tenant, notify)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), max(0.0, waiter.deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self._give_up(waiter)
+        except asyncio.CancelledError:
+            self._give_up(waiter, cancelled=True)
+            raise
+        if waiter.dropped:
+            raise DeadlineExceeded(workload, time.monotonic() - waiter.enqueued_at)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_concurrency": self._max_concurrency,
+                "in_flight": self._in_flight,
+                "classes": {
+                    name: {
+                        "priority": q.spec.priority,
+                        "queued": sum(1 for _, _, w in q.heap if not (w.cancelled or w.granted or w.dropped)),
+                        "granted": self._granted[name],
+                        "dropped": self._dropped[name],
+                        "mean_wait_ms": round(1000 * self._wait_seconds[name] / self._granted[name], 2)
+                        if self._granted[name]
+                        else 0.0,
+                    }
+                    for name, q in self._classes.items()
+                },
+            }
+
+    # Internal helpers
+    # ----------------
+
+    def _enqueue(self, workload: str, tenant: Optional[str], notify: Callable[[], None]) -> _Waiter:
+        queue = self._classes.get(workload)
+        if queue is None:
+            raise ValueError(f"Unknown LLM workload '{workload}'. Expected one of: {', '.join(self._classes)}.")
+        tenant = tenant or current_tenant.get()
+        if tenant not in self._tenant_weights:
+            tenant = DEFAULT_TENANT
+        weight = max(self._tenant_weights.get(tenant, 1.0), 1e-6)
+        now = time.monotonic()
+        with self._lock:
+            start = max(queue.virtual_time, queue.last_finish.get(tenant, 0.0))
+            finish = start + queue.spec.cost / weight
+            queue.last_finish[tenant] = finish
+            waiter = _Waiter(
+                workload=workload,
+                tenant=tenant,
+                start_tag=start,
+                finish_tag=finish,
+                enqueued_at=now,
+                deadline=now + queue.spec.deadline_seconds,
+                notify=notify,
+            )
+            heapq.heappush(queue.heap, (start, next(self._seq), waiter))
+            notified = self._dispatch_locked()
+        for callback in notified:
+            callback()
+        return waiter
+
+    def _give_up(self, waiter: _Waiter, cancelled: bool = False) -> None:
+        """Waiter timed out / was cancelled; a grant that raced with it is returned."""
+        with self._lock:
+            if waiter.granted:
+                if not cancelled:
+                    return  # granted just in time: run it
+                self._in_flight -= 1
+                notified = self._dispatch_locked()
+            else:
+                waiter.cancelled = True
+                if not cancelled and not waiter.dropped:
+                    waiter.dropped = True
+                    self._dropped[waiter.workload] += 1
+                notified = []
+        for callback in notified:
+            callback()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            notified = self._dispatch_locked()
+        for callback in notified:
+            callback()
+
+    def _dispatch_locked(self) -> List[Callable[[], None]]:
+        """Hand free slots to the best waiters; returns their callbacks (run outside the lock)."""
+        notified = []
+        now = time.monotonic()
+        while self._in_flight < self._max_concurrency:
+            waiter = self._pop_next_locked()
+            if waiter is None:
+                break
+            if now >= waiter.deadline:
+                waiter.dropped = True
+                self._dropped[waiter.workload] += 1
+                notified.append(waiter.notify)
+                continue
+            waiter.granted = True
+            self._in_flight += 1
+            self._granted[waiter.workload] += 1
+            self._wait_seconds[waiter.workload] += now - waiter.enqueued_at
+            notified.append(waiter.notify)
+        return notified
+
+    def _pop_next_locked(self) -> Optional[_Waiter]:
+        for queue in self._by_priority:
+            while queue.heap:
+                start, _, waiter = heapq.heappop(queue.heap)
+                if waiter.cancelled:
+                    continue
+                if start > queue.virtual_time:
+                    queue.virtual_time = start
+                    self._prune_idle_tenants_locked(queue)
+                return waiter
+        return None
+
+    @staticmethod
+    def _prune_idle_tenants_locked(queue: _ClassQueue) -> None:
+        """Forget tenants whose last finish tag is behind the virtual clock (no effect on scheduling)."""
+        idle = [tenant for tenant, finish in queue.last_finish.items() if finish <= queue.virtual_time]
+        for tenant in idle:
+            del queue.last_finish[tenant]
+
+
+def build_scheduler(settings: Settings) -> Optional[LLMScheduler]:
+    """LLMScheduler from settings, or None when LLM_SCHEDULER_ENABLED=false."""
+    if not settings.llm_scheduler_enabled:
+        return None
+    return LLMScheduler(
+        classes=[
+            PriorityClass(
+                name="greeting",
+                priority=0,
+                deadline_seconds=settings.llm_scheduler_greeting_deadline_seconds,
+                cost=1.0,
+            ),
+            PriorityClass(
+                name="release-notes",
+                priority=1,
+                deadline_seconds=settings.llm_scheduler_release_notes_deadline_seconds,
+                cost=settings.llm_scheduler_release_notes_cost,
+            ),
+            PriorityClass(
+                name="background",
+                priority=2,
+                deadline_seconds=settings.llm_scheduler_background_deadline_seconds,
+                cost=1.0,
+            ),
+        ],
+        max_concurrency=settings.llm_scheduler_max_concurrency,
+        tenant_weights=settings.llm_scheduler_tenant_weights,
+    )
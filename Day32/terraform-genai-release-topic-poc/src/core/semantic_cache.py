@@ -0,0 +1,196 @@
+# src/core/semantic_cache.py
+from __future__ import annotations
+
+import hashlib
+import logging
+import random
+import re
+import struct
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from core.services import RedisCache
+
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------------
+# Normalization
+# ------------------------
+
+# Punctuation that is not inside a token ("t3.small", "api-gateway", "v1.2" keep theirs).
+_LOOSE_PUNCT_RE = re.compile(r"(?<!\w)[^\w\s]+|[^\w\s]+(?!\w)")
+# Sentence punctuation ending the text.
+_TRAILING_PUNCT_RE = re.compile(r"[.!?]+$")
+
+
+def normalize_key_text(text: str) -> str:
+    """
+    Canonical form of free text for exact cache keys.
+
+    Only casefolds, collapses whitespace and strips trailing sentence
+    punctuation, so "Upgrade RDS  to t3.small." and "upgrade rds to
+    t3.small" share a key. Every other character is kept: "+10%" vs
+    "-10%" or "x > 5" vs "x < 5" are different changes.
+    """
+    text = " ".join(text.casefold().split())
+    return _TRAILING_PUNCT_RE.sub("", text).rstrip()
+
+
+def normalize_text(text: str) -> str:
+    """
+    Loose form of free text for MinHash shingling (similarity only).
+
+    Also drops punctuation outside tokens, so it maps different changes
+    ("C++" and "C") to the same text: never use it for exact keys
+    (see normalize_key_text).
+    """
+    text = _LOOSE_PUNCT_RE.sub(" ", text.casefold())
+    return " ".join(text.split())
+
+
+# ------------------------
+# MinHash
+# ------------------------
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text: str, size: int = 5) -> Set[str]:
+    """Character n-grams of the normalized text (robust to small word-level edits)."""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+class MinHasher:
+    """
+    MinHash signatures: the fraction of equal positions in two signatures
+    estimates the Jaccard similarity of the underlying shingle sets.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 32) -> None:
+        rng = random.Random(seed)  # fixed seed: signatures must match across pods
+        self.num_perm = num_perm
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> List[int]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "big")
+            for s in shingles(text)
+        ] or [0]
+        return [min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in self._perms]
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        if not sig_a or len(sig_a) != len(sig_b):
+            return 0.0
+        return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+    @staticmethod
+    def pack(signature: List[int]) -> bytes:
+        return struct.pack(f">{len(signature)}I", *signature)
+
+    @staticmethod
+    def unpack(raw: bytes) -> List[int]:
+        return list(struct.unpack(f">{len(raw) // 4}I", raw))
+
+
+# ------------------------
+# Redis-backed LSH index
+# ------------------------
+
+
+class SemanticIndex:
+    """
+    Near-duplicate lookup over cached release notes (MinHash + LSH in Redis).
+
+    For each cached entry we store:
+    - `<cache_key>:minhash`: its packed signature.
+    - LSH buckets `d32-release:semantic:<scope>:<band>:<band hash>` (Redis sets
+      of cache keys). Two texts share a bucket if one band (rows_per_band
+      signature values) matches exactly, so lookup only compares a handful of
+      candidates instead of every cached entry.
+
+    `scope` separates entries that must never match each other (e.g. different
+    risk level / impact area). Everything lives in Redis, so all pods share the
+    index; all keys expire with the cached entry.
+    """
+
+    def __init__(
+        self,
+        cache: "RedisCache",
+        threshold: float = 0.85,
+        num_perm: int = 64,
+        bands: int = 16,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self._cache = cache
+        self._threshold = threshold
+        self._hasher = MinHasher(num_perm=num_perm)
+        self._bands = bands
+        self._rows = num_perm // bands
+
+    def add(self, scope: str, text: str, cache_key: str, ttl_seconds: int) -> None:
+        signature = self._hasher.signature(text)
+        try:
+            pipe = self._cache.pipeline()
+            pipe.set(f"{cache_key}:minhash", MinHasher.pack(signature), ex=ttl_seconds)
+            for bucket in self._buckets(scope, signature):
+                pipe.sadd(bucket, cache_key)
+                pipe.expire(bucket, ttl_seconds)
+            pipe.execute()
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Semantic index add failed for key=%s: %s", cache_key, exc)
+
+    def lookup(self, scope: str, text: str, exclude: Optional[str] = None) -> Optional[Tuple[str, float]]:
+        """Return (cache_key, similarity) of the most similar entry above the threshold."""
+        signature = self._hasher.signature(text)
+        try:
+            pipe = self._cache.pipeline()
+            for bucket in self._buckets(scope, signature):
+                pipe.smembers(bucket)
+            candidates = {_as_text(key) for members in pipe.execute() for key in members}
+            candidates.discard(exclude)
+            if not candidates:
+                return None
+            ordered = sorted(candidates)
+            pipe = self._cache.pipeline()
+            for key in ordered:
+                pipe.get(f"{key}:minhash")
+            raw_signatures = pipe.execute()
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Semantic index lookup failed: %s", exc)
+            return None
+
+        best: Optional[Tuple[str, float]] = None
+        for key, raw in zip(ordered, raw_signatures):
+            if raw is None:
+                continue  # entry expired; its bucket membership will expire too
+            score = MinHasher.similarity(signature, MinHasher.unpack(raw))
+            if score >= self._threshold and (best is None or score > best[1]):
+                best = (key, score)
+        return best
+
+    def _buckets(self, scope: str, signature: List[int]) -> List[str]:
+        buckets = []
+        for band in range(self._bands):
+            rows = signature[band * self._rows : (band + 1) * self._rows]
+            digest = hashlib.blake2b(MinHasher.pack(rows), digest_size=8).hexdigest()
+            buckets.append(f"d32-release:semantic:{scope}:{band}:{digest}")
+        return buckets
+
+
+def scope_for(fields: Dict[str, Any]) -> str:
+    """Short stable id for the exact-match part of a request."""
+    payload = "|".join(f"{k}={fields[k] or ''}" for k in sorted(fields))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def _as_text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
@@ -1,17 +1,28 @@
 # src/core/services.py
 from __future__ import annotations
 
-import hashlib
 import json
 import logging
-from dataclasses import dataclass
-from datetime import date
-from typing import Any, Dict, Optional, Tuple
-
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import anyio
 import redis
 
 from config.settings import Settings
 from core.llm_client import LLMClient
+from core.cache_policy import CachePolicy
+from core.cache_stats import CacheStats
+from core.codecs import ValueCodec, build_codec, hash_bytes
+from core.freshness import BackgroundRefresher, FreshnessPolicy, unwrap
+from core.local_cache import LocalTTLCache
+from core.redis_pool import build_async_redis_client, build_redis_client
+from core.semantic_cache import SemanticIndex, normalize_key_text, normalize_text, scope_for
 from core.models import (
     GreetingRequest,
     GreetingResponse,
@@ -20,6 +31,8 @@ from core.models import (
     ReleaseNoteRequest,
     ReleaseNoteResponse,
 )
+from core.single_flight import AsyncSingleFlight, SingleFlight
+from core.structured import RELEASE_NOTE_SCHEMA, StreamingJSONParser, parse_structured
 
 
 logger = logging.getLogger(__name__)
@@ -33,50 +46,517 @@ logger = logging.getLogger(__name__)
 @dataclass
 class RedisCache:
     """
-    Thin wrapper over Redis for JSON-encoded values.
+    Thin wrapper over Redis for dict values, with an in-process L1.
 
     Notes:
     - Redis is NOT optional in this PoC: all services try to use it.
     - If Redis is unavailable, we log a warning and continue without caching
       (to keep the app usable).
+    - Reads go L1 (LocalTTLCache) -> Redis. L1 hits skip the network round trip
+      and decoding entirely; L1 entries never outlive the Redis TTL.
+    - Values are encoded by a ValueCodec (core.codecs: json/orjson/msgpack,
+      optional compression). Plain-JSON entries written before the codec
+      layer are still readable.
+    - With REDIS_L1_INVALIDATION=pubsub, every write publishes the key on
+      INVALIDATION_CHANNEL and all pods evict their L1 copy, keeping L1
+      coherent across replicas.
+    - The client uses an explicitly sized pool with socket timeouts
+      (see core.redis_pool), so a slow Redis degrades to cache misses
+      instead of stalling request threads.
+    - mget_json / set_many_json batch many keys into one round trip.
+    - `stats` (core.cache_stats.CacheStats) counts L1/Redis hits, misses,
+      writes and errors per key namespace; services add bypasses.
+    - `client` can be injected (e.g. a fakeredis instance in tests).
     """
 
+    INVALIDATION_CHANNEL = "d32-release:cache-invalidation"
+
     settings: Settings
+    client: Optional[Any] = field(default=None, repr=False)
+    codec: Optional[ValueCodec] = field(default=None, repr=False)
+    stats: CacheStats = field(default_factory=CacheStats, repr=False)
 
     def __post_init__(self) -> None:
-        self._client = redis.Redis.from_url(
+        if self.client is None:
+            self.client = build_redis_client(self.settings)
+        if self.codec is None:
+            self.codec = build_codec(self.settings)
+        self._client = self.client
+        self._codec = self.codec
+        self._instance_id = uuid.uuid4().hex
+        self._l1: Optional[LocalTTLCache] = None
+        if self.settings.redis_l1_max_entries > 0:
+            self._l1 = LocalTTLCache(
+                max_entries=self.settings.redis_l1_max_entries,
+                ttl_seconds=self.settings.redis_l1_ttl_seconds,
+            )
+        self._listener: Optional[threading.Thread] = None
+        if self._l1 is not None and self.settings.redis_l1_invalidation == "pubsub":
+            self._start_invalidation_listener()
+        logger.info(
+            "RedisCache initialized with URL: %s (l1_max_entries=%s, invalidation=%s)",
             self.settings.redis_url,
-            decode_responses=True,
+            self.settings.redis_l1_max_entries,
+            self.settings.redis_l1_invalidation,
         )
-        logger.info("RedisCache initialized with URL: %s", self.settings.redis_url)
 
     def get_json(self, key: str) -> Optional[Dict[str, Any]]:
+        if self._l1 is not None:
+            hit = self._l1.get(key)
+            if hit is not None:
+                self.stats.record(key, "l1_hits")
+                # Shallow copy: callers mutate the dict (e.g. set cached=True).
+                return dict(hit)
         try:
-            raw = self._client.get(key)
-            if raw is None:
-                return None
-            return json.loads(raw)
+            # GET + PTTL in one round trip so L1 can be capped by the Redis TTL.
+            raw, pttl_ms = self._client.pipeline(transaction=False).get(key).pttl(key).execute()
         except Exception as exc:  # pragma: no cover - network/infra
             logger.warning("Redis GET failed for key=%s: %s", key, exc)
+            self.stats.record(key, "errors")
+            self.stats.record(key, "misses")
             return None
+        value = _decode_value(self._codec, key, raw)
+        if value is None:
+            self.stats.record(key, "misses")
+            return None
+        self.stats.record(key, "hits")
+
+        if self._l1 is not None:
+            self._l1.set(key, value, ttl_seconds=_l1_ttl(pttl_ms))
+        return dict(value)
+
+    def mget_json(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Batch get: L1 first, then one pipelined MGET (+ PTTLs) for the rest.
+
+        Returns values in the same order as `keys` (None for misses).
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(keys)
+        missing: List[int] = []
+        for i, key in enumerate(keys):
+            hit = self._l1.get(key) if self._l1 is not None else None
+            if hit is not None:
+                self.stats.record(key, "l1_hits")
+                results[i] = dict(hit)
+            else:
+                missing.append(i)
+        if not missing:
+            return results
+
+        missing_keys = [keys[i] for i in missing]
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.mget(missing_keys)
+            for key in missing_keys:
+                pipe.pttl(key)
+            raws, *pttls = pipe.execute()
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Redis MGET failed for %d keys: %s", len(missing_keys), exc)
+            for key in missing_keys:
+                self.stats.record(key, "errors")
+                self.stats.record(key, "misses")
+            return results
+
+        for i, key, raw, pttl_ms in zip(missing, missing_keys, raws, pttls):
+            value = _decode_value(self._codec, key, raw)
+            self.stats.record(key, "misses" if value is None else "hits")
+            if value is None:
+                continue
+            if self._l1 is not None:
+                self._l1.set(key, value, ttl_seconds=_l1_ttl(pttl_ms))
+            results[i] = dict(value)
+        return results
+
+    def set_many_json(self, items: Dict[str, Dict[str, Any]], ttl_seconds: int) -> None:
+        """Batch set: all SETs go out in one pipelined round trip."""
+        if not items:
+            return
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(key, self._codec.encode(value), ex=ttl_seconds)
+            pipe.execute()
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Redis pipelined SET failed for %d keys: %s", len(items), exc)
+            for key in items:
+                self.stats.record(key, "errors")
+            return
+        for key, value in items.items():
+            self.stats.record(key, "sets")
+            if self._l1 is not None:
+                self._l1.set(key, dict(value), ttl_seconds=ttl_seconds)
+            self._publish_invalidation(key)
+
+    def pipeline(self) -> Any:
+        """Raw non-transactional pipeline for callers that batch their own commands."""
+        return self._client.pipeline(transaction=False)
+
+    @property
+    def l1(self) -> Optional[LocalTTLCache]:
+        return self._l1
 
     def set_json(self, key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
         try:
-            serialized = json.dumps(value)
+            serialized = self._codec.encode(value)
             self._client.set(key, serialized, ex=ttl_seconds)
         except Exception as exc:  # pragma: no cover - network/infra
             logger.warning("Redis SET failed for key=%s: %s", key, exc)
+            self.stats.record(key, "errors")
+            return
+        self.stats.record(key, "sets")
+        if self._l1 is not None:
+            self._l1.set(key, dict(value), ttl_seconds=ttl_seconds)
+        self._publish_invalidation(key)
+
+    def delete(self, key: str) -> int:
+        """Remove a key from Redis and from every pod's L1; returns how many Redis keys were removed."""
+        if self._l1 is not None:
+            self._l1.delete(key)
+        removed = 0
+        try:
+            removed = int(self._client.delete(key))
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Redis DEL failed for key=%s: %s", key, exc)
+        self._publish_invalidation(key)
+        return removed
+
+    # Lease locks (used by SingleFlight)
+    # ----------------------------------
+
+    def acquire_lock(self, key: str, token: str, ttl_ms: int) -> bool:
+        """
+        SET NX PX lease lock. Fails open (returns True) if Redis is unavailable,
+        so callers fall back to computing locally instead of blocking.
+        """
+        try:
+            return bool(self._client.set(key, token, nx=True, px=ttl_ms))
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Redis lock acquire failed for key=%s: %s", key, exc)
+            return True
+
+    def release_lock(self, key: str, token: str) -> None:
+        """Delete the lock only if we still own it (WATCH/MULTI compare-and-delete)."""
+        try:
+            with self._client.pipeline() as pipe:
+                pipe.watch(key)
+                if _as_text(pipe.get(key)) == token:
+                    pipe.multi()
+                    pipe.delete(key)
+                    pipe.execute()
+                else:
+                    pipe.unwatch()
+        except redis.WatchError:
+            pass  # lease expired and someone else took the lock: leave it alone
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Redis lock release failed for key=%s: %s", key, exc)
+
+    def lock_exists(self, key: str) -> bool:
+        try:
+            return bool(self._client.exists(key))
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Redis EXISTS failed for key=%s: %s", key, exc)
+            return False
+
+    # L1 coherence (pub/sub)
+    # ----------------------
+
+    def _publish_invalidation(self, key: str) -> None:
+        if self._listener is None:
+            return
+        try:
+            message = json.dumps({"key": key, "origin": self._instance_id})
+            self._client.publish(self.INVALIDATION_CHANNEL, message)
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Redis PUBLISH invalidation failed for key=%s: %s", key, exc)
+
+    def _start_invalidation_listener(self) -> None:
+        self._listener = threading.Thread(
+            target=self._listen_for_invalidations,
+            name="redis-l1-invalidation",
+            daemon=True,
+        )
+        self._listener.start()
+
+    def _listen_for_invalidations(self) -> None:
+        """
+        Evict L1 entries written by other pods.
+
+        Runs forever in a daemon thread. While disconnected we may miss
+        invalidations, so L1 is cleared on every (re)subscribe.
+        """
+        backoff = 1.0
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.INVALIDATION_CHANNEL)
+                self._l1.clear()
+                backoff = 1.0
+                while True:
+                    # Poll with a timeout instead of listen(): a blocking read
+                    # would trip the pool's socket_timeout on an idle channel.
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._handle_invalidation(message.get("data"))
+            except Exception as exc:  # pragma: no cover - network/infra
+                logger.warning("Redis invalidation listener error: %s (retry in %.0fs)", exc, backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _handle_invalidation(self, data: Any) -> None:
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if payload.get("origin") != self._instance_id and payload.get("key"):
+            self._l1.delete(payload["key"])
+
+
+@dataclass
+class AsyncRedisCache:
+    """
+    redis.asyncio counterpart of RedisCache, for async endpoints.
+
+    Same key/value format and pool settings as RedisCache. Pass the sync
+    cache's `l1` to share one in-process L1 (kept coherent by the sync
+    cache's pub/sub listener) between sync and async code paths; with
+    publish_invalidations=True async writes notify other pods as well.
+    Pass its `stats` too, so sync and async traffic is counted together.
+    """
+
+    settings: Settings
+    client: Optional[Any] = field(default=None, repr=False)
+    l1: Optional[LocalTTLCache] = field(default=None, repr=False)
+    codec: Optional[ValueCodec] = field(default=None, repr=False)
+    stats: CacheStats = field(default_factory=CacheStats, repr=False)
+    publish_invalidations: bool = False
+
+    def __post_init__(self) -> None:
+        if self.client is None:
+            self.client = build_async_redis_client(self.settings)
+        if self.codec is None:
+            self.codec = build_codec(self.settings)
+        self._client = self.client
+        self._codec = self.codec
+        self._l1 = self.l1
+
+    async def get_json(self, key: str) -> Optional[Dict[str, Any]]:
+        return (await self.mget_json([key]))[0]
+
+    async def mget_json(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(keys)
+        missing: List[int] = []
+        for i, key in enumerate(keys):
+            hit = self._l1.get(key) if self._l1 is not None else None
+            if hit is not None:
+                self.stats.record(key, "l1_hits")
+                results[i] = dict(hit)
+            else:
+                missing.append(i)
+        if not missing:
+            return results
+
+        missing_keys = [keys[i] for i in missing]
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.mget(missing_keys)
+            for key in missing_keys:
+                pipe.pttl(key)
+            raws, *pttls = await pipe.execute()
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Async Redis MGET failed for %d keys: %s", len(missing_keys), exc)
+            for key in missing_keys:
+                self.stats.record(key, "errors")
+                self.stats.record(key, "misses")
+            return results
+
+        for i, key, raw, pttl_ms in zip(missing, missing_keys, raws, pttls):
+            value = _decode_value(self._codec, key, raw)
+            self.stats.record(key, "misses" if value is None else "hits")
+            if value is None:
+                continue
+            if self._l1 is not None:
+                self._l1.set(key, value, ttl_seconds=_l1_ttl(pttl_ms))
+            results[i] = dict(value)
+        return results
+
+    async def set_json(self, key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
+        await self.set_many_json({key: value}, ttl_seconds)
+
+    async def set_many_json(self, items: Dict[str, Dict[str, Any]], ttl_seconds: int) -> None:
+        if not items:
+            return
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(key, self._codec.encode(value), ex=ttl_seconds)
+            await pipe.execute()
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Async Redis SET failed for %d keys: %s", len(items), exc)
+            for key in items:
+                self.stats.record(key, "errors")
+            return
+        for key, value in items.items():
+            self.stats.record(key, "sets")
+            if self._l1 is not None:
+                self._l1.set(key, dict(value), ttl_seconds=ttl_seconds)
+            await self._publish_invalidation(key)
+
+    async def delete(self, key: str) -> None:
+        if self._l1 is not None:
+            self._l1.delete(key)
+        try:
+            await self._client.delete(key)
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Async Redis DEL failed for key=%s: %s", key, exc)
+        await self._publish_invalidation(key)
+
+    # Lease locks (used by AsyncSingleFlight); same semantics as RedisCache.
+    async def acquire_lock(self, key: str, token: str, ttl_ms: int) -> bool:
+        try:
+            return bool(await self._client.set(key, token, nx=True, px=ttl_ms))
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Async Redis lock acquire failed for key=%s: %s", key, exc)
+            return True
+
+    async def release_lock(self, key: str, token: str) -> None:
+        try:
+            async with self._client.pipeline() as pipe:
+                await pipe.watch(key)
+                if _as_text(await pipe.get(key)) == token:
+                    pipe.multi()
+                    pipe.delete(key)
+                    await pipe.execute()
+                else:
+                    await pipe.unwatch()
+        except redis.WatchError:
+            pass  # lease expired and someone else took the lock: leave it alone
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Async Redis lock release failed for key=%s: %s", key, exc)
+
+    async def lock_exists(self, key: str) -> bool:
+        try:
+            return bool(await self._client.exists(key))
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Async Redis EXISTS failed for key=%s: %s", key, exc)
+            return False
+
+    async def _publish_invalidation(self, key: str) -> None:
+        if not self.publish_invalidations:
+            return
+        try:
+            message = json.dumps({"key": key, "origin": "async"})
+            await self._client.publish(RedisCache.INVALIDATION_CHANNEL, message)
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Async Redis PUBLISH invalidation failed for key=%s: %s", key, exc)
+
+    async def aclose(self) -> None:
+        """Close the pool (call from the app's shutdown hook)."""
+        await self._client.aclose()
+
 
+def _l1_ttl(pttl_ms: Optional[int]) -> Optional[float]:
+    """Remaining Redis TTL in seconds (None if the key has no expiry)."""
+    return pttl_ms / 1000 if pttl_ms and pttl_ms > 0 else None
 
-def _hash_dict(data: Dict[str, Any]) -> str:
+
+def _decode_value(codec: ValueCodec, key: str, raw: Optional[bytes]) -> Optional[Dict[str, Any]]:
+    if raw is None:
+        return None
+    try:
+        return codec.decode(raw)
+    except Exception as exc:  # noqa: BLE001 - corrupt value or missing codec library
+        logger.warning("Ignoring undecodable cache value for key=%s: %s", key, exc)
+        return None
+
+
+def _as_text(value: Any) -> Optional[str]:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _next_month_start(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def _hash_dict(data: Dict[str, Any], algorithm: str = "sha256") -> str:
     """
     Stable hash for dict contents, used for Redis keys.
 
     - Sorts keys to ensure same dict -> same hash.
     - Converts values to strings where needed.
+    - algorithm: see core.codecs.hash_bytes (CACHE_KEY_HASH).
     """
     payload = json.dumps(data, sort_keys=True, default=str)
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return hash_bytes(payload.encode("utf-8"), algorithm)
+
+
+def _store(
+    cache: RedisCache,
+    freshness: FreshnessPolicy,
+    cache_key: str,
+    value: Dict[str, Any],
+    compute_seconds: float,
+    ttl_seconds: Optional[int] = None,
+    valid_from: Optional[float] = None,
+) -> None:
+    """
+    Cache a freshly computed value with its soft-expiry metadata; Redis TTL = hard TTL.
+
+    `ttl_seconds` caps the Redis TTL (e.g. at a date boundary); `valid_from`
+    starts the soft TTL later than now (values computed ahead of time).
+    """
+    cache.set_json(
+        cache_key,
+        freshness.wrap(value, compute_seconds, now=valid_from),
+        ttl_seconds or freshness.hard_ttl_seconds,
+    )
+
+
+async def _aget_json(
+    async_cache: Optional[AsyncRedisCache],
+    cache: RedisCache,
+    key: str,
+) -> Optional[Dict[str, Any]]:
+    """Async cache read; falls back to the sync cache in a worker thread."""
+    if async_cache is not None:
+        return await async_cache.get_json(key)
+    return await anyio.to_thread.run_sync(cache.get_json, key)
+
+
+async def _astore(
+    async_cache: Optional[AsyncRedisCache],
+    cache: RedisCache,
+    freshness: FreshnessPolicy,
+    cache_key: str,
+    value: Dict[str, Any],
+    compute_seconds: float,
+    ttl_seconds: Optional[int] = None,
+) -> None:
+    """Async version of _store()."""
+    if async_cache is None:
+        await anyio.to_thread.run_sync(
+            _store, cache, freshness, cache_key, value, compute_seconds, ttl_seconds
+        )
+        return
+    await async_cache.set_json(
+        cache_key,
+        freshness.wrap(value, compute_seconds),
+        ttl_seconds or freshness.hard_ttl_seconds,
+    )
+
+
+def _maybe_schedule_refresh(
+    freshness: FreshnessPolicy,
+    refresher: Optional[BackgroundRefresher],
+    cache_key: str,
+    meta: Optional[Dict[str, Any]],
+    refresh: Callable[[], Any],
+) -> None:
+    """On a cache hit: if the entry is stale (or XFetch fires), refresh it off the request path."""
+    if refresher is None or not freshness.needs_refresh(meta):
+        return
+    if refresher.schedule(cache_key, refresh):
+        logger.info("Scheduled background refresh. key=%s", cache_key)
+
 
 # ------------------------
 # Release Notes Service
@@ -92,23 +572,55 @@ class ReleaseNotesService:
     - ALWAYS check Redis for a cached result before calling LLM.
     - Call LLMClient (OpenAI or OSS model via model_service).
     - Parse LLM text into ReleaseNoteResponse.
-    - Store the result in Redis with a TTL.
+    - Store the result in Redis with a TTL. A CachePolicy decides what is
+      stored and for how long: mock results never, provider-failure
+      fallbacks briefly (negative caching), others per provider/model TTL.
+    - With a FreshnessPolicy + BackgroundRefresher: serve stale entries while
+      they are refreshed in the background (stale-while-revalidate), and
+      refresh hot entries early (XFetch) so they rarely expire at all.
+    - Cache keys use normalized text (case/whitespace/punctuation-insensitive).
+      With a SemanticIndex, near-duplicate requests are served from the most
+      similar cached entry (cached=True, similarity=score).
 
     This service is framework-agnostic and can be used from FastAPI,
     CLI, or tests.
     """
 
+    # LLMScheduler class: heavier, batch-friendly work.
+    WORKLOAD = "release-notes"
+    # Stale-while-revalidate / XFetch refreshes: nobody is waiting on them.
+    REFRESH_WORKLOAD = "background"
+
     def __init__(
         self,
         settings: Settings,
         llm_client: LLMClient,
         cache: RedisCache,
         cache_ttl_seconds: int = 3600,
+        single_flight: Optional[SingleFlight] = None,
+        freshness: Optional[FreshnessPolicy] = None,
+        refresher: Optional[BackgroundRefresher] = None,
+        semantic_index: Optional[SemanticIndex] = None,
+        async_cache: Optional[AsyncRedisCache] = None,
+        async_single_flight: Optional[AsyncSingleFlight] = None,
+        cache_policy: Optional[CachePolicy] = None,
     ) -> None:
         self._settings = settings
         self._llm_client = llm_client
         self._cache = cache
-        self._cache_ttl_seconds = cache_ttl_seconds
+        self._single_flight = single_flight
+        # Without an explicit policy: plain fixed TTL (no stale window, no early refresh).
+        self._freshness = freshness or FreshnessPolicy(
+            soft_ttl_seconds=cache_ttl_seconds,
+            stale_ttl_seconds=0,
+            xfetch_beta=0.0,
+        )
+        self._refresher = refresher
+        self._semantic_index = semantic_index
+        self._async_cache = async_cache
+        self._async_single_flight = async_single_flight
+        self._cache_policy = cache_policy or CachePolicy()
+        self._response_schema = RELEASE_NOTE_SCHEMA if settings.llm_structured_output else None
 
     # Public API
     # ----------
@@ -122,32 +634,291 @@ class ReleaseNotesService:
         Main entrypoint:
         1) Compute cache key from request.
         2) If cached, return cached response (with cached=True).
+           Else, if a near-duplicate request is cached, return that one
+           (with cached=True and its similarity score).
         3) Otherwise, call LLMClient, parse text, cache and return.
+           Concurrent misses on the same key are coalesced (SingleFlight):
+           one caller runs the LLM, the others wait for its result.
         """
         cache_key = self._build_cache_key(request)
-        cached = self._cache.get_json(cache_key)
         provider_override = provider is not None
 
+        cached = self._lookup_cache(
+            cache_key,
+            provider_override,
+            refresh=lambda: self._generate_and_store(request, provider, cache_key, refreshing=True),
+        )
         if cached is not None:
-            # Skip cached mock responses when caller explicitly requested a provider
-            if provider_override and str(cached.get("provider", "")).startswith("mock"):
-                logger.info(
-                    "ReleaseNotesService cache bypass (mock cached but provider override requested). key=%s",
-                    cache_key,
-                )
-            else:
-                logger.info("ReleaseNotesService cache HIT. key=%s", cache_key)
-                cached["cached"] = True  # ensure the flag is set
-                return ReleaseNoteResponse(**cached)
+            logger.info("ReleaseNotesService cache HIT. key=%s", cache_key)
+            return cached
+
+        similar = self._lookup_similar(request, cache_key, provider_override)
+        if similar is not None:
+            return similar
+
+        logger.info("ReleaseNotesService cache MISS. key=%s", cache_key)
+
+        if self._single_flight is None:
+            return self._generate_and_store(request, provider, cache_key)
+        return self._single_flight.do(
+            cache_key,
+            compute=lambda: self._generate_and_store(request, provider, cache_key),
+            load_cached=lambda: self._lookup_cache(cache_key, provider_override),
+        )
+
+    async def agenerate_release_notes(
+        self,
+        request: ReleaseNoteRequest,
+        provider: Optional[ModelProvider] = None,
+    ) -> ReleaseNoteResponse:
+        """
+        Async version of generate_release_notes() for async endpoints.
+
+        Same flow; Redis goes through AsyncRedisCache, the LLM through
+        LLMClient.agenerate_text(), and coalescing through AsyncSingleFlight,
+        so nothing blocks the event loop. Background (SWR) refreshes still run
+        on the sync path in the refresher's threads.
+        """
+        cache_key = self._build_cache_key(request)
+        provider_override = provider is not None
+
+        cached = self._from_cached(
+            await _aget_json(self._async_cache, self._cache, cache_key),
+            cache_key,
+            provider_override,
+            refresh=lambda: self._generate_and_store(request, provider, cache_key, refreshing=True),
+        )
+        if cached is not None:
+            logger.info("ReleaseNotesService cache HIT. key=%s", cache_key)
+            return cached
+
+        if self._semantic_index is not None:
+            # The MinHash index is sync (pipelined Redis calls): keep it off the event loop.
+            similar = await anyio.to_thread.run_sync(self._lookup_similar, request, cache_key, provider_override)
+            if similar is not None:
+                return similar
 
         logger.info("ReleaseNotesService cache MISS. key=%s", cache_key)
 
+        async def load_cached() -> Optional[ReleaseNoteResponse]:
+            return self._from_cached(
+                await _aget_json(self._async_cache, self._cache, cache_key), cache_key, provider_override
+            )
+
+        if self._async_single_flight is None:
+            return await self._agenerate_and_store(request, provider, cache_key)
+        return await self._async_single_flight.do(
+            cache_key,
+            compute=lambda: self._agenerate_and_store(request, provider, cache_key),
+            load_cached=load_cached,
+        )
+
+    async def astream_release_notes(
+        self,
+        request: ReleaseNoteRequest,
+        provider: Optional[ModelProvider] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming version of agenerate_release_notes().
+
+        Yields ("delta", {"text": ...}) events while the LLM writes, then one
+        ("result", ReleaseNoteResponse dict) with the parsed response. With
+        structured output, ("field", {"name", "value", "index"}) events are
+        also yielded as soon as the release note / each test scenario is
+        complete in the JSON being streamed. Cache
+        hits (exact or near-duplicate) yield only the result. The assembled
+        response is cached like a normal call; a stream that broke mid-way is
+        not cached.
+
+        Streams are not coalesced: each streaming miss runs its own LLM call.
+        """
+        cache_key = self._build_cache_key(request)
+        provider_override = provider is not None
+
+        cached = self._from_cached(
+            await _aget_json(self._async_cache, self._cache, cache_key),
+            cache_key,
+            provider_override,
+            refresh=lambda: self._generate_and_store(request, provider, cache_key, refreshing=True),
+        )
+        if cached is None and self._semantic_index is not None:
+            cached = await anyio.to_thread.run_sync(self._lookup_similar, request, cache_key, provider_override)
+        if cached is not None:
+            logger.info("ReleaseNotesService cache HIT (stream). key=%s", cache_key)
+            yield "result", cached.dict()
+            return
+
+        logger.info("ReleaseNotesService cache MISS (stream). key=%s", cache_key)
+        started = time.monotonic()
+        fields = StreamingJSONParser() if self._response_schema is not None else None
+        async for chunk in self._llm_client.astream_text(
+            self._build_prompt(request), provider=provider, workload=self.WORKLOAD, **self._schema_kwargs()
+        ):
+            if chunk.result is None:
+                if chunk.delta:
+                    yield "delta", {"text": chunk.delta}
+                    for field in self._feed_fields(fields, chunk.delta):
+                        yield "field", field
+                continue
+            response = self._build_response(chunk.result)
+            if chunk.complete:
+                await self._astore_response(request, cache_key, response, time.monotonic() - started)
+            yield "result", response.dict()
+
+    def invalidate(self, request: ReleaseNoteRequest) -> int:
+        """Drop the cached response for `request` (all pods); returns keys removed."""
+        return self._cache.delete(self._build_cache_key(request))
+
+    # Internal helpers
+    # ----------------
+
+    def _lookup_cache(
+        self,
+        cache_key: str,
+        provider_override: bool,
+        refresh: Optional[Callable[[], Any]] = None,
+    ) -> Optional[ReleaseNoteResponse]:
+        return self._from_cached(self._cache.get_json(cache_key), cache_key, provider_override, refresh)
+
+    def _from_cached(
+        self,
+        cached: Optional[Dict[str, Any]],
+        cache_key: str,
+        provider_override: bool,
+        refresh: Optional[Callable[[], Any]] = None,
+    ) -> Optional[ReleaseNoteResponse]:
+        if cached is None:
+            return None
+        cached, meta = unwrap(cached)
+        # Skip cached mock responses when caller explicitly requested a provider
+        if self._cache_policy.bypass(cached, provider_override):
+            logger.info(
+                "ReleaseNotesService cache bypass (mock cached but provider override requested). key=%s",
+                cache_key,
+            )
+            self._cache.stats.record(cache_key, "bypasses")
+            return None
+        if refresh is not None:
+            _maybe_schedule_refresh(self._freshness, self._refresher, cache_key, meta, refresh)
+        cached["cached"] = True  # ensure the flag is set
+        return ReleaseNoteResponse(**cached)
+
+    def _lookup_similar(
+        self,
+        request: ReleaseNoteRequest,
+        cache_key: str,
+        provider_override: bool,
+    ) -> Optional[ReleaseNoteResponse]:
+        if self._semantic_index is None:
+            return None
+        match = self._semantic_index.lookup(
+            self._semantic_scope(request),
+            self._semantic_text(request),
+            exclude=cache_key,
+        )
+        if match is None:
+            return None
+        match_key, similarity = match
+        # No refresh callback: a refresh would store this request's answer under match_key.
+        response = self._lookup_cache(match_key, provider_override)
+        if response is None:
+            return None
+        logger.info(
+            "ReleaseNotesService semantic cache HIT. key=%s match=%s similarity=%.3f",
+            cache_key,
+            match_key,
+            similarity,
+        )
+        return response.copy(update={"similarity": round(similarity, 3)})
+
+    def _generate_and_store(
+        self,
+        request: ReleaseNoteRequest,
+        provider: Optional[ModelProvider],
+        cache_key: str,
+        refreshing: bool = False,
+    ) -> ReleaseNoteResponse:
+        """
+        Run the LLM and cache the answer. `refreshing`: a background refresh
+        of an entry that is still being served; it runs in the background
+        class and a provider failure is not cached over that entry.
+        """
+        started = time.monotonic()
         prompt = self._build_prompt(request)
-        llm_result = self._llm_client.generate_text(prompt, provider=provider)
+        llm_result = self._llm_client.generate_text(
+            prompt,
+            provider=provider,
+            workload=self.REFRESH_WORKLOAD if refreshing else self.WORKLOAD,
+            **self._schema_kwargs(),
+        )
+        response = self._build_response(llm_result)
 
-        release_note, scenarios = self._parse_release_note_text(llm_result)
+        # Store in Redis cache (best-effort); CachePolicy decides whether (mock / failure results) and how long.
+        decision = self._cache_policy.decide(response.provider, response.model, self._freshness)
+        if decision.negative and refreshing:
+            logger.info("Refresh hit a provider failure; keeping the cached answer. key=%s", cache_key)
+        elif decision.cache:
+            _store(self._cache, decision.freshness, cache_key, response.dict(), time.monotonic() - started)
+            if not decision.negative:
+                self._index_semantic(request, cache_key)
+
+        return response
+
+    async def _agenerate_and_store(
+        self,
+        request: ReleaseNoteRequest,
+        provider: Optional[ModelProvider],
+        cache_key: str,
+    ) -> ReleaseNoteResponse:
+        started = time.monotonic()
+        prompt = self._build_prompt(request)
+        llm_result = await self._llm_client.agenerate_text(
+            prompt, provider=provider, workload=self.WORKLOAD, **self._schema_kwargs()
+        )
+        response = self._build_response(llm_result)
+        await self._astore_response(request, cache_key, response, time.monotonic() - started)
+        return response
+
+    async def _astore_response(
+        self,
+        request: ReleaseNoteRequest,
+        cache_key: str,
+        response: ReleaseNoteResponse,
+        compute_seconds: float,
+    ) -> None:
+        decision = self._cache_policy.decide(response.provider, response.model, self._freshness)
+        if not decision.cache:
+            return
+        await _astore(
+            self._async_cache,
+            self._cache,
+            decision.freshness,
+            cache_key,
+            response.dict(),
+            compute_seconds,
+        )
+        if self._semantic_index is not None and not decision.negative:
+            await anyio.to_thread.run_sync(self._index_semantic, request, cache_key)
+
+    def _schema_kwargs(self) -> Dict[str, Any]:
+        # Only passed when enabled, so LLM clients without schema support keep working.
+        return {} if self._response_schema is None else {"response_schema": self._response_schema}
+
+    @staticmethod
+    def _feed_fields(parser: Optional[StreamingJSONParser], delta: str) -> List[Dict[str, Any]]:
+        """Field events completed by `delta`; a stream that is not JSON just yields none."""
+        if parser is None:
+            return []
+        try:
+            events = parser.feed(delta)
+        except ValueError:
+            logger.info("Streamed release note is not valid JSON; no field events.")
+            return []
+        return [{"name": e.name, "value": e.value, "index": e.index} for e in events]
 
-        response = ReleaseNoteResponse(
+    def _build_response(self, llm_result: LLMGenerationResult) -> ReleaseNoteResponse:
+        release_note, scenarios = self._parse_release_note_text(llm_result)
+        return ReleaseNoteResponse(
             release_note=release_note,
             test_scenarios=scenarios,
             provider=llm_result.provider,
@@ -155,20 +926,40 @@ class ReleaseNotesService:
             cached=False,
         )
 
-        # Store in Redis cache (best-effort). Avoid caching mock responses so real provider calls are not masked.
-        if not response.provider.startswith("mock"):
-            self._cache.set_json(cache_key, response.dict(), self._cache_ttl_seconds)
-
-        return response
-
-    # Internal helpers
-    # ----------------
+    def _index_semantic(self, request: ReleaseNoteRequest, cache_key: str) -> None:
+        if self._semantic_index is not None:
+            self._semantic_index.add(
+                self._semantic_scope(request),
+                self._semantic_text(request),
+                cache_key,
+                self._freshness.hard_ttl_seconds,
+            )
 
     def _build_cache_key(self, request: ReleaseNoteRequest) -> str:
-        payload = request.dict()
-        digest = _hash_dict(payload)
+        # Normalized so case/whitespace/trailing-period edits hit the same entry.
+        payload = {
+            "title": normalize_key_text(request.title),
+            "description": normalize_key_text(request.description),
+            "risk_level": (request.risk_level or "").strip().lower() or None,
+            "impact_area": (request.impact_area or "").strip().lower() or None,
+        }
+        digest = _hash_dict(payload, self._settings.cache_key_hash)
         return f"d32-release:release-notes:{digest}"
 
+    @staticmethod
+    def _semantic_scope(request: ReleaseNoteRequest) -> str:
+        # Near-duplicates only match within the same risk level / impact area.
+        return scope_for(
+            {
+                "risk_level": (request.risk_level or "").strip().lower(),
+                "impact_area": (request.impact_area or "").strip().lower(),
+            }
+        )
+
+    @staticmethod
+    def _semantic_text(request: ReleaseNoteRequest) -> str:
+        return normalize_text(f"{request.title} {request.description}")
+
     def _build_prompt(self, request: ReleaseNoteRequest) -> str:
         """
         Build a compact but clear prompt for the LLM.
@@ -180,17 +971,29 @@ class ReleaseNotesService:
         risk = request.risk_level or "unspecified"
         impact = request.impact_area or "general"
 
+        if self._response_schema is not None:
+            answer_format = (
+                'Return the answer as a JSON object: "release_note" (string) and '
+                '"test_scenarios" (array of 2–3 strings).\n\n'
+            )
+        else:
+            answer_format = (
+                "Return the answer as plain text, where the first paragraph is the release note "
+                "and the following lines (starting with '-') are the test scenarios.\n\n"
+            )
+
+        # Fixed instructions first, request fields last: every release-note prompt
+        # shares the same leading paragraphs, which model_service's prefix cache reuses.
         return (
             "You are an assistant that writes clear, concise release notes and test scenarios.\n\n"
-            f"Title: {request.title}\n"
-            f"Risk level: {risk}\n"
-            f"Impact area: {impact}\n"
-            f"Change description:\n{request.description}\n\n"
             "Please produce:\n"
             "1) A short release note (2–4 sentences) suitable for end users.\n"
             "2) 2–3 bullet-point test scenarios.\n\n"
-            "Return the answer as plain text, where the first paragraph is the release note "
-            "and the following lines (starting with '-') are the test scenarios.\n"
+            f"{answer_format}"
+            f"Title: {request.title}\n"
+            f"Risk level: {risk}\n"
+            f"Impact area: {impact}\n"
+            f"Change description:\n{request.description}\n"
         )
 
     def _parse_release_note_text(
@@ -203,11 +1006,17 @@ class ReleaseNotesService:
         - test_scenarios (list of strings)
 
         The parsing is robust:
-        - If text has multiple lines, treat the first non-empty paragraph as the
-          release note and bullet-like lines as scenarios.
+        - A JSON answer matching RELEASE_NOTE_SCHEMA (structured output) is
+          used as is.
+        - Otherwise, if text has multiple lines, treat the first non-empty
+          paragraph as the release note and bullet-like lines as scenarios.
         - If parsing fails, use generic fallback scenarios.
         """
         text = (llm_result.text or "").strip()
+        structured = parse_structured(text, RELEASE_NOTE_SCHEMA)
+        if structured is not None:
+            return structured["release_note"].strip(), [s.strip() for s in structured["test_scenarios"]]
+
         if not text:
             return "No content generated.", [
                 "Verify the main feature works as intended.",
@@ -259,19 +1068,54 @@ class GreetingService:
     The choice of provider:
     - Can be overridden per-request via GreetingRequest.provider.
     - Otherwise defaults to settings.llm_default_provider.
+
+    Month boundaries: the cache key includes the birthday-month flag, which
+    flips on the 1st for people born this month and next month. Entries whose
+    flag flips at the next boundary expire at that boundary, and
+    prewarm_month_boundary() generates the new variants shortly before it,
+    so the 1st does not start with a wave of misses.
     """
 
+    # LLMScheduler class: cheap and interactive, scheduled ahead of release notes.
+    WORKLOAD = "greeting"
+    # Pre-warming runs in the low-priority class so it never delays live greetings.
+    PREWARM_WORKLOAD = "background"
+    # So do stale-while-revalidate / XFetch refreshes: the caller already has an answer.
+    REFRESH_WORKLOAD = "background"
+    # Greeting identities seen per birth month (inputs for pre-warming): a ZSET scored by
+    # last-seen time, trimmed to the greeting cache's hard TTL.
+    KNOWN_KEY_PREFIX = "d32-release:greeting:known:"
+
     def __init__(
         self,
         settings: Settings,
         llm_client: LLMClient,
         cache: RedisCache,
         cache_ttl_seconds: int = 3600,
+        single_flight: Optional[SingleFlight] = None,
+        freshness: Optional[FreshnessPolicy] = None,
+        refresher: Optional[BackgroundRefresher] = None,
+        async_cache: Optional[AsyncRedisCache] = None,
+        async_single_flight: Optional[AsyncSingleFlight] = None,
+        cache_policy: Optional[CachePolicy] = None,
+        clock: Callable[[], datetime] = datetime.now,
     ) -> None:
         self._settings = settings
         self._llm_client = llm_client
         self._cache = cache
-        self._cache_ttl_seconds = cache_ttl_seconds
+        self._single_flight = single_flight
+        # Without an explicit policy: plain fixed TTL (no stale window, no early refresh).
+        self._freshness = freshness or FreshnessPolicy(
+            soft_ttl_seconds=cache_ttl_seconds,
+            stale_ttl_seconds=0,
+            xfetch_beta=0.0,
+        )
+        self._refresher = refresher
+        self._async_cache = async_cache
+        self._async_single_flight = async_single_flight
+        self._cache_policy = cache_policy or CachePolicy()
+        # Local wall-clock time; month boundaries follow the system date.
+        self._clock = clock
 
     # Public API
     # ----------
@@ -287,7 +1131,210 @@ class GreetingService:
         3) Otherwise, build an LLM prompt (birthday or normal),
            call LLMClient, cache, and return.
         """
-        is_birthday_month = self._is_birthday_month(request.date_of_birth)
+        is_birthday_month, provider_str, cache_key = self._resolve(request)
+
+        def compute() -> GreetingResponse:
+            return self._generate_and_store(request, provider_str, is_birthday_month, cache_key)
+
+        def refresh() -> GreetingResponse:
+            return self._generate_and_store(request, provider_str, is_birthday_month, cache_key, refreshing=True)
+
+        provider_override = request.provider is not None
+        cached = self._lookup_cache(cache_key, provider_override, refresh=refresh)
+        if cached is not None:
+            logger.info("GreetingService cache HIT. key=%s", cache_key)
+            return cached
+
+        logger.info("GreetingService cache MISS. key=%s", cache_key)
+
+        if self._single_flight is None:
+            return compute()
+        return self._single_flight.do(
+            cache_key,
+            compute=compute,
+            load_cached=lambda: self._lookup_cache(cache_key, provider_override),
+        )
+
+    async def agenerate_greeting(
+        self,
+        request: GreetingRequest,
+    ) -> GreetingResponse:
+        """Async version of generate_greeting() (see ReleaseNotesService.agenerate_release_notes)."""
+        is_birthday_month, provider_str, cache_key = self._resolve(request)
+        provider_override = request.provider is not None
+
+        cached = self._from_cached(
+            await _aget_json(self._async_cache, self._cache, cache_key),
+            cache_key,
+            provider_override,
+            refresh=lambda: self._generate_and_store(
+                request, provider_str, is_birthday_month, cache_key, refreshing=True
+            ),
+        )
+        if cached is not None:
+            logger.info("GreetingService cache HIT. key=%s", cache_key)
+            return cached
+
+        logger.info("GreetingService cache MISS. key=%s", cache_key)
+
+        async def compute() -> GreetingResponse:
+            return await self._agenerate_and_store(request, provider_str, is_birthday_month, cache_key)
+
+        async def load_cached() -> Optional[GreetingResponse]:
+            return self._from_cached(
+                await _aget_json(self._async_cache, self._cache, cache_key), cache_key, provider_override
+            )
+
+        if self._async_single_flight is None:
+            return await compute()
+        return await self._async_single_flight.do(cache_key, compute=compute, load_cached=load_cached)
+
+    def prewarm_month_boundary(
+        self,
+        boundary: date,
+        max_workers: int = 4,
+        max_items: int = 10000,
+    ) -> Dict[str, int]:
+        """
+        Generate, ahead of time, the greetings whose birthday-month flag flips
+        on `boundary` (the 1st of a month).
+
+        Candidates are the known identities born in the boundary month (flag
+        turns on) or the month before (flag turns off). Each is resolved as of
+        `boundary`; variants already cached are skipped, the rest are generated
+        with at most `max_workers` concurrent LLM calls in the background
+        scheduler class. Entries are written with their soft TTL starting at
+        the boundary. Returns counts for logging.
+        """
+        previous = boundary - timedelta(days=1)
+        candidates = []
+        for identity in self._known_identities((previous.month, boundary.month), max_items):
+            is_birthday_month, provider_str, cache_key = self._resolve(identity, today=boundary)
+            candidates.append((identity, provider_str, is_birthday_month, cache_key))
+
+        try:
+            pipe = self._cache.pipeline()
+            for _, _, _, cache_key in candidates:
+                pipe.exists(cache_key)
+            cached = [bool(n) for n in pipe.execute()]
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Greeting pre-warm EXISTS check failed: %s", exc)
+            cached = [False] * len(candidates)
+        todo = [c for c, hit in zip(candidates, cached) if not hit]
+
+        def warm(candidate: Tuple[GreetingRequest, str, bool, str]) -> bool:
+            identity, provider_str, is_birthday_month, cache_key = candidate
+            try:
+                self._generate_and_store(
+                    identity,
+                    provider_str,
+                    is_birthday_month,
+                    cache_key,
+                    today=boundary,
+                    workload=self.PREWARM_WORKLOAD,
+                )
+                return True
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Greeting pre-warm failed for key=%s: %s", cache_key, exc)
+                return False
+
+        generated = 0
+        if todo:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="greeting-prewarm") as pool:
+                generated = sum(pool.map(warm, todo))
+        return {
+            "candidates": len(candidates),
+            "skipped": len(candidates) - len(todo),
+            "generated": generated,
+            "failed": len(todo) - generated,
+        }
+
+    def invalidate(self, request: GreetingRequest) -> int:
+        """
+        Drop both cached variants (birthday month or not) for `request` and forget the
+        identity for pre-warming; returns cache keys removed.
+        """
+        _, provider_str, _ = self._resolve(request)
+        key = self._known_key(request)
+        try:
+            self._cache.client.zrem(key, self._known_member(request))
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Redis ZREM failed for key=%s: %s", key, exc)
+        return sum(
+            self._cache.delete(
+                self._build_cache_key(
+                    name=request.name,
+                    dob=request.date_of_birth,
+                    provider=provider_str,
+                    is_birthday_month=flag,
+                )
+            )
+            for flag in (True, False)
+        )
+
+    # Internal helpers
+    # ----------------
+
+    def _known_key(self, request: GreetingRequest) -> str:
+        return f"{self.KNOWN_KEY_PREFIX}{request.date_of_birth.month:02d}"
+
+    @staticmethod
+    def _known_member(request: GreetingRequest) -> str:
+        """Stable member for an identity; the name is normalized the same way as the cache key."""
+        return json.dumps(
+            {
+                "name": request.name.strip().lower(),
+                "dob": request.date_of_birth.isoformat(),
+                "provider": request.provider.value if request.provider is not None else None,
+            },
+            sort_keys=True,
+        )
+
+    def _remember(self, request: GreetingRequest) -> None:
+        """
+        Record the identity under its birth month so pre-warming knows whom to generate for.
+
+        Each member is scored by last-seen time; members older than the greeting hard TTL are
+        trimmed on every write (their cached greetings have expired anyway), so the set only
+        holds people who are still being greeted.
+        """
+        key = self._known_key(request)
+        now = self._now().timestamp()
+        horizon = self._freshness.hard_ttl_seconds
+        try:
+            pipe = self._cache.pipeline()
+            pipe.zadd(key, {self._known_member(request): now})
+            pipe.zremrangebyscore(key, "-inf", f"({now - horizon}")
+            pipe.expire(key, horizon)
+            pipe.execute()
+        except Exception as exc:  # pragma: no cover - network/infra
+            logger.warning("Redis ZADD failed for key=%s: %s", key, exc)
+
+    def _known_identities(self, months: Tuple[int, ...], max_items: int) -> List[GreetingRequest]:
+        identities: List[GreetingRequest] = []
+        cutoff = self._now().timestamp() - self._freshness.hard_ttl_seconds
+        for month in months:
+            key = f"{self.KNOWN_KEY_PREFIX}{month:02d}"
+            remaining = max_items - len(identities)
+            try:
+                # Fetch one extra member to tell "exactly max_items" from "capped".
+                members = self._cache.client.zrangebyscore(key, cutoff, "+inf", start=0, num=remaining + 1)
+            except Exception as exc:  # pragma: no cover - network/infra
+                logger.warning("Redis ZRANGEBYSCORE failed for key=%s: %s", key, exc)
+                continue
+            for member in members:
+                if len(identities) >= max_items:
+                    logger.warning("Greeting pre-warm capped at %d identities.", max_items)
+                    return identities
+                data = json.loads(member)
+                identities.append(
+                    GreetingRequest(name=data["name"], date_of_birth=data["dob"], provider=data.get("provider"))
+                )
+        return identities
+
+    def _resolve(self, request: GreetingRequest, today: Optional[date] = None) -> Tuple[bool, str, str]:
+        """Return (is_birthday_month, provider_str, cache_key) for a request (as of `today`)."""
+        is_birthday_month = self._is_birthday_month(request.date_of_birth, today)
         provider_enum = request.provider
         provider_str = (
             provider_enum.value
@@ -301,43 +1348,133 @@ class GreetingService:
             provider=provider_str,
             is_birthday_month=is_birthday_month,
         )
+        return is_birthday_month, provider_str, cache_key
 
-        cached = self._cache.get_json(cache_key)
-        provider_override = request.provider is not None
-        if cached is not None:
-            if provider_override and str(cached.get("provider", "")).startswith("mock"):
-                logger.info(
-                    "GreetingService cache bypass (mock cached but provider override requested). key=%s",
-                    cache_key,
-                )
-            else:
-                logger.info("GreetingService cache HIT. key=%s", cache_key)
-                cached["cached"] = True  # mark cache hits explicitly
-                return GreetingResponse(**cached)
+    def _lookup_cache(
+        self,
+        cache_key: str,
+        provider_override: bool,
+        refresh: Optional[Callable[[], Any]] = None,
+    ) -> Optional[GreetingResponse]:
+        return self._from_cached(self._cache.get_json(cache_key), cache_key, provider_override, refresh)
 
-        logger.info("GreetingService cache MISS. key=%s", cache_key)
+    def _from_cached(
+        self,
+        cached: Optional[Dict[str, Any]],
+        cache_key: str,
+        provider_override: bool,
+        refresh: Optional[Callable[[], Any]] = None,
+    ) -> Optional[GreetingResponse]:
+        if cached is None:
+            return None
+        cached, meta = unwrap(cached)
+        if self._cache_policy.bypass(cached, provider_override):
+            logger.info(
+                "GreetingService cache bypass (mock cached but provider override requested). key=%s",
+                cache_key,
+            )
+            self._cache.stats.record(cache_key, "bypasses")
+            return None
+        if refresh is not None:
+            _maybe_schedule_refresh(self._freshness, self._refresher, cache_key, meta, refresh)
+        cached["cached"] = True  # mark cache hits explicitly
+        return GreetingResponse(**cached)
 
-        prompt = self._build_prompt(
-            name=request.name,
-            dob=request.date_of_birth,
-            is_birthday_month=is_birthday_month,
+    def _generate_and_store(
+        self,
+        request: GreetingRequest,
+        provider_str: str,
+        is_birthday_month: bool,
+        cache_key: str,
+        today: Optional[date] = None,
+        workload: Optional[str] = None,
+        refreshing: bool = False,
+    ) -> GreetingResponse:
+        """Run the LLM and cache the greeting (`refreshing`: see ReleaseNotesService._generate_and_store)."""
+        started = time.monotonic()
+        llm_result = self._llm_client.generate_text(
+            self._build_prompt(
+                name=request.name,
+                dob=request.date_of_birth,
+                is_birthday_month=is_birthday_month,
+            ),
+            provider=self._provider_for_llm(request, provider_str),
+            workload=workload or (self.REFRESH_WORKLOAD if refreshing else self.WORKLOAD),
         )
+        response = self._build_response(llm_result, is_birthday_month)
+
+        # Store in Redis cache (best-effort); CachePolicy decides whether (mock / failure results) and how long.
+        decision = self._cache_policy.decide(response.provider, response.model, self._freshness)
+        if decision.negative and refreshing:
+            logger.info("Refresh hit a provider failure; keeping the cached greeting. key=%s", cache_key)
+        elif decision.cache:
+            ttl_seconds, valid_from = self._ttl_until_boundary(
+                request.date_of_birth, today or self._now().date(), decision.freshness
+            )
+            _store(
+                self._cache,
+                decision.freshness,
+                cache_key,
+                response.dict(),
+                time.monotonic() - started,
+                ttl_seconds=ttl_seconds,
+                valid_from=valid_from,
+            )
+            if not decision.negative:
+                self._remember(request)
 
-        # Choose provider for LLMClient (use enum when possible)
-        provider_for_llm: Optional[ModelProvider] = None
-        if provider_enum is not None:
-            provider_for_llm = provider_enum
-        elif provider_str == ModelProvider.OPENAI.value:
-            provider_for_llm = ModelProvider.OPENAI
-        elif provider_str == ModelProvider.OSS.value:
-            provider_for_llm = ModelProvider.OSS
+        return response
 
-        llm_result = self._llm_client.generate_text(
-            prompt,
-            provider=provider_for_llm,
+    async def _agenerate_and_store(
+        self,
+        request: GreetingRequest,
+        provider_str: str,
+        is_birthday_month: bool,
+        cache_key: str,
+    ) -> GreetingResponse:
+        started = time.monotonic()
+        llm_result = await self._llm_client.agenerate_text(
+            self._build_prompt(
+                name=request.name,
+                dob=request.date_of_birth,
+                is_birthday_month=is_birthday_month,
+            ),
+            provider=self._provider_for_llm(request, provider_str),
+            workload=self.WORKLOAD,
         )
+        response = self._build_response(llm_result, is_birthday_month)
+
+        decision = self._cache_policy.decide(response.provider, response.model, self._freshness)
+        if decision.cache:
+            ttl_seconds, _ = self._ttl_until_boundary(request.date_of_birth, self._now().date(), decision.freshness)
+            await _astore(
+                self._async_cache,
+                self._cache,
+                decision.freshness,
+                cache_key,
+                response.dict(),
+                time.monotonic() - started,
+                ttl_seconds=ttl_seconds,
+            )
+            if not decision.negative:
+                await anyio.to_thread.run_sync(self._remember, request)
 
-        response = GreetingResponse(
+        return response
+
+    @staticmethod
+    def _provider_for_llm(request: GreetingRequest, provider_str: str) -> Optional[ModelProvider]:
+        """Choose provider for LLMClient (use enum when possible)."""
+        if request.provider is not None:
+            return request.provider
+        if provider_str == ModelProvider.OPENAI.value:
+            return ModelProvider.OPENAI
+        if provider_str == ModelProvider.OSS.value:
+            return ModelProvider.OSS
+        return None
+
+    @staticmethod
+    def _build_response(llm_result: LLMGenerationResult, is_birthday_month: bool) -> GreetingResponse:
+        return GreetingResponse(
             greeting_message=llm_result.text,
             is_birthday_month=is_birthday_month,
             provider=llm_result.provider,
@@ -345,23 +1482,34 @@ class GreetingService:
             cached=False,
         )
 
-        # Store in Redis cache (best-effort). Do not cache mock responses so they do not mask real provider calls later.
-        if not response.provider.startswith("mock"):
-            self._cache.set_json(cache_key, response.dict(), self._cache_ttl_seconds)
-
-        return response
-
-    # Internal helpers
-    # ----------------
-
-    def _is_birthday_month(self, dob: date) -> bool:
+    def _is_birthday_month(self, dob: date, today: Optional[date] = None) -> bool:
         """
         Returns True if the person's birth month equals the current month
-        (according to the system date).
+        (according to the system date, or `today` when given).
         """
-        today = date.today()
+        today = today or self._now().date()
         return dob.month == today.month
 
+    def _now(self) -> datetime:
+        return self._clock()
+
+    def _ttl_until_boundary(self, dob: date, as_of: date, freshness: FreshnessPolicy) -> Tuple[int, float]:
+        """
+        Redis TTL and soft-TTL start for a greeting computed for the month of `as_of`.
+
+        - Valid from the start of that month (now, unless pre-warming ahead of it).
+        - If the person's flag flips at the end of that month (born in that
+          month or the next), the entry expires exactly at the boundary so the
+          old variant does not linger; otherwise the usual hard TTL applies.
+        """
+        now = self._now()
+        valid_from = max(now, datetime(as_of.year, as_of.month, 1))
+        boundary = _next_month_start(as_of)
+        ttl = (valid_from - now).total_seconds() + freshness.hard_ttl_seconds
+        if dob.month in (as_of.month, boundary.month):
+            ttl = min(ttl, (datetime(boundary.year, boundary.month, 1) - now).total_seconds())
+        return max(1, int(ttl)), time.time() + (valid_from - now).total_seconds()
+
     def _build_cache_key(
         self,
         name: str,
@@ -375,7 +1523,7 @@ class GreetingService:
             "provider": provider,
             "is_birthday_month": is_birthday_month,
         }
-        digest = _hash_dict(payload)
+        digest = _hash_dict(payload, self._settings.cache_key_hash)
         return f"d32-release:greeting:{digest}"
 
     def _build_prompt(
@@ -0,0 +1,244 @@
+# src/core/single_flight.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Generic, Optional, TypeVar
+
+if TYPE_CHECKING:  # pragma: no cover
+    from core.services import AsyncRedisCache, RedisCache
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """One in-flight computation that followers in this process can wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Request coalescing for concurrent cache misses, keyed on the cache key.
+
+    Two layers:
+    - In-process: the first thread to miss on a key becomes the local leader;
+      other threads in the same pod wait on an Event and reuse its result
+      (or its exception).
+    - Cross-pod: the local leader then takes a Redis lease lock
+      (`SET <key>:lock <token> NX PX <lease>`). Only the pod holding the lock
+      calls the LLM; other pods poll the cache until the value lands.
+
+    Fallbacks (we never wait forever for someone else's LLM call):
+    - If the lock disappears without a cached value (leader died, its lease
+      expired, or it produced an uncacheable mock response), a waiter retries
+      the lock and becomes the leader itself.
+    - After `wait_timeout_seconds` a waiter stops waiting and calls the LLM
+      directly.
+    - If Redis is down, acquiring the lock fails open (compute locally).
+    """
+
+    def __init__(
+        self,
+        cache: Optional["RedisCache"] = None,
+        lock_ttl_ms: int = 15000,
+        wait_timeout_seconds: float = 12.0,
+        poll_interval_seconds: float = 0.05,
+    ) -> None:
+        self._cache = cache
+        self._lock_ttl_ms = lock_ttl_ms
+        self._wait_timeout_seconds = wait_timeout_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: str,
+        compute: Callable[[], T],
+        load_cached: Callable[[], Optional[T]],
+    ) -> T:
+        """
+        Return the result for `key`, running `compute` at most once across callers.
+
+        - compute():     does the expensive work AND stores it in the cache.
+        - load_cached(): returns the cached result, or None if not there yet.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            if call.done.wait(self._wait_timeout_seconds):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+            logger.warning("SingleFlight local wait timed out, computing directly. key=%s", key)
+            return compute()
+
+        try:
+            call.result = self._do_cross_pod(key, compute, load_cached)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed by this process."""
+        with self._lock:
+            return len(self._calls)
+
+    # Internal helpers
+    # ----------------
+
+    def _do_cross_pod(
+        self,
+        key: str,
+        compute: Callable[[], T],
+        load_cached: Callable[[], Optional[T]],
+    ) -> T:
+        if self._cache is None:
+            return compute()
+
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self._wait_timeout_seconds
+
+        while time.monotonic() < deadline:
+            if self._cache.acquire_lock(lock_key, token, self._lock_ttl_ms):
+                try:
+                    # Another pod may have finished between our miss and the lock.
+                    cached = load_cached()
+                    if cached is not None:
+                        return cached
+                    return compute()
+                finally:
+                    self._cache.release_lock(lock_key, token)
+
+            logger.info("SingleFlight waiting for another pod. key=%s", key)
+            while time.monotonic() < deadline:
+                time.sleep(self._poll_interval_seconds)
+                cached = load_cached()
+                if cached is not None:
+                    return cached
+                if not self._cache.lock_exists(lock_key):
+                    # Leader finished without caching or died: try to take over.
+                    break
+
+        logger.warning("SingleFlight cross-pod wait timed out, computing directly. key=%s", key)
+        return compute()
+
+
+class AsyncSingleFlight:
+    """
+    asyncio version of SingleFlight, for async endpoints.
+
+    Same algorithm and fallbacks; in-process followers await an asyncio
+    Future instead of a threading.Event, and the cross-pod lock goes through
+    AsyncRedisCache. Use one instance per event loop.
+    """
+
+    def __init__(
+        self,
+        cache: Optional["AsyncRedisCache"] = None,
+        lock_ttl_ms: int = 15000,
+        wait_timeout_seconds: float = 12.0,
+        poll_interval_seconds: float = 0.05,
+    ) -> None:
+        self._cache = cache
+        self._lock_ttl_ms = lock_ttl_ms
+        self._wait_timeout_seconds = wait_timeout_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        load_cached: Callable[[], Awaitable[Optional[T]]],
+    ) -> T:
+        call = self._calls.get(key)
+        if call is not None:
+            try:
+                # shield: a follower timing out must not cancel the leader's result.
+                return await asyncio.wait_for(asyncio.shield(call), self._wait_timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning("AsyncSingleFlight local wait timed out, computing directly. key=%s", key)
+                return await compute()
+            except asyncio.CancelledError:
+                # The leader was cancelled (e.g. its client disconnected), not us: compute ourselves.
+                if call.cancelled() and not asyncio.current_task().cancelling():
+                    return await compute()
+                raise
+
+        call = asyncio.get_running_loop().create_future()
+        # Mark exceptions as retrieved even when nobody else was waiting.
+        call.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = call
+        try:
+            result = await self._do_cross_pod(key, compute, load_cached)
+            call.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except BaseException as exc:
+            call.set_exception(exc)
+            raise
+        finally:
+            self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def _do_cross_pod(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        load_cached: Callable[[], Awaitable[Optional[T]]],
+    ) -> T:
+        if self._cache is None:
+            return await compute()
+
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._wait_timeout_seconds
+
+        while loop.time() < deadline:
+            if await self._cache.acquire_lock(lock_key, token, self._lock_ttl_ms):
+                try:
+                    cached = await load_cached()
+                    if cached is not None:
+                        return cached
+                    return await compute()
+                finally:
+                    await self._cache.release_lock(lock_key, token)
+
+            logger.info("AsyncSingleFlight waiting for another pod. key=%s", key)
+            while loop.time() < deadline:
+                await asyncio.sleep(self._poll_interval_seconds)
+                cached = await load_cached()
+                if cached is not None:
+                    return cached
+                if not await self._cache.lock_exists(lock_key):
+                    break
+
+        logger.warning("AsyncSingleFlight cross-pod wait timed out, computing directly. key=%s", key)
+        return await compute()
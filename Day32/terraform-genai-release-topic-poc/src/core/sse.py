@@ -0,0 +1,33 @@
+# src/core/sse.py
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterator, Dict, Tuple
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """One Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def aiter_sse(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Parse an SSE stream (e.g. httpx `Response.aiter_lines()`) into (event, data).
+
+    Only the subset we emit is supported: `event:` + one JSON `data:` line per
+    event; comments and unknown fields are ignored.
+    """
+    event, data = "message", None
+    async for line in lines:
+        if not line:
+            if data is not None:
+                yield event, json.loads(data)
+            event, data = "message", None
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data = line[5:].strip()
+    if data is not None:
+        yield event, json.loads(data)
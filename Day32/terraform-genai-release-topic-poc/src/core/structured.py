@@ -0,0 +1,197 @@
+# src/core/structured.py
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Requested from providers that support constrained decoding (OpenAI
+# response_format, llama.cpp grammars); see LLMClient(response_schema=...).
+RELEASE_NOTE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "release_note": {"type": "string"},
+        "test_scenarios": {"type": "array", "items": {"type": "string"}, "minItems": 1, "maxItems": 5},
+    },
+    "required": ["release_note", "test_scenarios"],
+    "additionalProperties": False,
+}
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def parse_structured(text: str, schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Parse a JSON object answer and check it against `schema` (required
+    properties and their string / array-of-strings types, which is all our
+    schemas use). Tolerates a ```json fence. Returns None if the text is not
+    a matching object, so callers can fall back to heuristics.
+    """
+    try:
+        value = json.loads(_FENCE.sub("", (text or "").strip()))
+    except ValueError:
+        return None
+    if not isinstance(value, dict):
+        return None
+    properties = schema.get("properties", {})
+    for name in schema.get("required", []):
+        if name not in value or not _matches(value[name], properties.get(name, {})):
+            return None
+    return value
+
+
+def _matches(value: Any, spec: Dict[str, Any]) -> bool:
+    kind = spec.get("type")
+    if kind == "string":
+        return isinstance(value, str) and bool(value.strip())
+    if kind == "array":
+        return isinstance(value, list) and len(value) >= spec.get("minItems", 0) and all(
+            _matches(item, spec.get("items", {})) for item in value
+        )
+    return True
+
+
+# ------------------------
+# Incremental JSON parser
+# ------------------------
+
+
+@dataclass
+class FieldEvent:
+    """
+    A value of the streamed object that just became complete.
+
+    - name: top-level property name.
+    - value: the decoded value.
+    - index: position for an item of a top-level array (the whole array is
+      reported once more with index=None when it closes).
+    """
+
+    name: str
+    value: Any
+    index: Optional[int] = None
+
+
+class StreamingJSONParser:
+    """
+    Incremental parser for one JSON object that arrives in chunks (LLM
+    token deltas).
+
+    feed() returns the FieldEvents completed by the chunk: each top-level
+    property as soon as its value closes, and each item of a top-level
+    array as soon as that item closes. So the release note can be shown
+    before the scenarios are written, and each scenario as it finishes.
+
+    Text before the first "{" (e.g. a ```json fence) is skipped. The parser
+    only tracks structure (strings, escapes, nesting) and decodes each
+    finished value with json.loads. It does not validate the whole
+    document, and parse_structured() remains the final check.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0  # offset of the next character to scan
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._key: Optional[str] = None
+        self._expect_key = False
+        self._value_start: Optional[int] = None  # depth-1 value
+        self._item_start: Optional[int] = None  # depth-2 array item
+        self._item_index = 0
+        self._in_array = False
+        self.done = False
+
+    def feed(self, chunk: str) -> List[FieldEvent]:
+        events: List[FieldEvent] = []
+        self._text += chunk
+        text = self._text
+        while self._pos < len(text) and not self.done:
+            i, ch = self._pos, text[self._pos]
+            self._pos += 1
+            if not self._started:
+                if ch == "{":
+                    self._started, self._depth, self._expect_key = True, 1, True
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_scalar(i + 1, events)
+                continue
+            if ch.isspace():
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._open_value(i)
+            elif ch in "{[":
+                self._open_value(i)
+                self._depth += 1
+                if self._depth == 2 and ch == "[":
+                    self._in_array, self._item_index = True, 0
+            elif ch in "}]":
+                self._close_scalar(i, events, before_delimiter=True)
+                self._depth -= 1
+                if self._depth == 0:
+                    self.done = True
+                elif self._depth == 1:
+                    self._emit_value(i + 1, events)
+                    self._in_array = False
+                elif self._depth == 2 and self._in_array:
+                    self._emit_item(i + 1, events)
+            elif ch == ",":
+                self._close_scalar(i, events, before_delimiter=True)
+                if self._depth == 1:
+                    self._expect_key = True
+            elif ch == ":":
+                continue
+            else:
+                self._open_value(i)  # number / true / false / null
+        return events
+
+    # Internal helpers
+    # ----------------
+
+    def _open_value(self, i: int) -> None:
+        if self._depth == 1:
+            if self._expect_key:
+                self._value_start = i  # key string; decoded when it closes
+            elif self._value_start is None:
+                self._value_start = i
+        elif self._depth == 2 and self._in_array and self._item_start is None:
+            self._item_start = i
+
+    def _close_scalar(self, end: int, events: List[FieldEvent], before_delimiter: bool = False) -> None:
+        """A string just closed (end = after the quote), or a delimiter ends a bare number/literal."""
+        text = self._text
+        if self._depth == 1 and self._value_start is not None:
+            raw = text[self._value_start : end].strip()
+            if before_delimiter and (not raw or raw[0] in '"{['):
+                return  # string/container values are emitted when they close
+            if self._expect_key:
+                self._key, self._value_start, self._expect_key = json.loads(raw), None, False
+            else:
+                self._emit_value(end, events)
+        elif self._depth == 2 and self._in_array and self._item_start is not None:
+            raw = text[self._item_start : end].strip()
+            if before_delimiter and (not raw or raw[0] in '"{['):
+                return
+            self._emit_item(end, events)
+
+    def _emit_value(self, end: int, events: List[FieldEvent]) -> None:
+        if self._value_start is None or self._key is None:
+            return
+        events.append(FieldEvent(self._key, json.loads(self._text[self._value_start : end])))
+        self._value_start, self._key = None, None
+
+    def _emit_item(self, end: int, events: List[FieldEvent]) -> None:
+        if self._item_start is None or self._key is None:
+            return
+        events.append(FieldEvent(self._key, json.loads(self._text[self._item_start : end]), self._item_index))
+        self._item_start = None
+        self._item_index += 1
@@ -0,0 +1,93 @@
+# src/model_service/batcher.py
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Callable, Generic, List, Optional, Set, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Server-side micro-batching for concurrent single requests.
+
+    Each `submit(item)` joins the pending batch. The batch is flushed when it
+    reaches `max_batch_size` items or `max_wait_ms` after its first item
+    arrived, whichever comes first. `run_batch(items)` (blocking, runs in a
+    worker thread) must return one result per item in the same order; results
+    are scattered back to the waiting callers. If it raises, every caller in
+    that batch gets the exception.
+
+    Trade-off: a lone request waits up to `max_wait_ms` extra; under load the
+    model runs fewer, larger batches and throughput goes up.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[T]], List[R]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1.")
+        self._run_batch = run_batch
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max_wait_ms / 1000
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches_run = 0
+        self.items_run = 0
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # New event loop (e.g. app restarted in tests): drop state tied to the old one.
+            self._loop, self._pending, self._timer = loop, [], None
+
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_wait_seconds, self._flush)
+        return await future
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items_run / self.batches_run if self.batches_run else 0.0
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = self._loop.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = await self._loop.run_in_executor(None, self._run_batch, items)
+            if len(results) != len(items):
+                raise RuntimeError(f"run_batch returned {len(results)} results for {len(items)} items.")
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Micro-batch of %d failed: %s", len(items), exc)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.batches_run += 1
+        self.items_run += len(items)
+        for (_, future), result in zip(batch, results):
+            if not future.done():  # caller may have gone away (cancelled)
+                future.set_result(result)
@@ -0,0 +1,413 @@
+# src/model_service/generator.py
+from __future__ import annotations
+
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.settings import Settings
+from model_service.prefix_cache import PrefixCache
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ("stub", "llama_cpp")
+
+
+@dataclass
+class Generation:
+    text: str
+    model: str
+    tokens: int = 0
+
+
+# ------------------------
+# Engine abstraction
+# ------------------------
+
+
+class Engine(ABC):
+    """
+    A text generation backend, loaded once per process.
+
+    `generate_batch` is the unit of work (one model call over several
+    prompts). Engines are not assumed to be thread-safe: the base class runs
+    one batch at a time (`_model_lock`) and keeps the counters `/health`
+    reports (load time, tokens/s, memory).
+
+    Engines that can snapshot their prefilled state (`supports_prefix_cache`)
+    reuse it for prompts that start with a cached prefix; see
+    `_apply_prefix_cache`.
+
+    `json_schema` (optional, one per batch) asks for output that is a JSON
+    document matching the schema; engines constrain decoding where they can.
+    """
+
+    name = "engine"
+    supports_prefix_cache = False
+
+    def __init__(self) -> None:
+        self.prefix_cache: Optional[PrefixCache] = None
+        self._model_lock = threading.Lock()
+        self.load_seconds = 0.0
+        self.tokens_generated = 0
+        self.generation_seconds = 0.0
+        self.batches = 0
+
+    def generate(self, prompt: str, json_schema: Optional[Dict[str, Any]] = None) -> Generation:
+        return self.generate_batch([prompt], json_schema)[0]
+
+    def generate_batch(self, prompts: List[str], json_schema: Optional[Dict[str, Any]] = None) -> List[Generation]:
+        with self._model_lock:
+            started = time.perf_counter()
+            results = self._generate_batch(prompts, json_schema)
+            self.generation_seconds += time.perf_counter() - started
+            self.tokens_generated += sum(r.tokens for r in results)
+            self.batches += 1
+        return results
+
+    def stream(self, prompt: str, json_schema: Optional[Dict[str, Any]] = None) -> Iterator[Generation]:
+        """
+        Yield the generation for one prompt as it is produced (each chunk's
+        `text` is a delta). Holds the model for the whole stream.
+        """
+        with self._model_lock:
+            started = time.perf_counter()
+            tokens = 0
+            try:
+                for chunk in self._stream(prompt, json_schema):
+                    tokens += chunk.tokens
+                    yield chunk
+            finally:
+                self.generation_seconds += time.perf_counter() - started
+                self.tokens_generated += tokens
+                self.batches += 1
+
+    @abstractmethod
+    def _generate_batch(self, prompts: List[str], json_schema: Optional[Dict[str, Any]] = None) -> List[Generation]:
+        ...
+
+    def _stream(self, prompt: str, json_schema: Optional[Dict[str, Any]] = None) -> Iterator[Generation]:
+        # Engines without incremental decoding send the whole text as one chunk.
+        yield from self._generate_batch([prompt], json_schema)
+
+    def _apply_prefix_cache(self, prompt: str) -> int:
+        """
+        Call before decoding `prompt` (under the model lock).
+
+        Restores the state of the longest cached prefix, or, once a prefix is
+        common enough, prefills it and caches the state. Returns how many
+        leading characters of `prompt` are already prefilled.
+        """
+        if self.prefix_cache is None:
+            return 0
+        entry = self.prefix_cache.lookup(prompt)
+        if entry is not None:
+            self._restore_prefix(entry.state)
+            return len(entry.prefix)
+        prefix = self.prefix_cache.admit(prompt)
+        if prefix is None:
+            return 0
+        started = time.perf_counter()
+        state, nbytes = self._prefill_prefix(prefix)
+        self.prefix_cache.put(prefix, state, nbytes, time.perf_counter() - started)
+        return len(prefix)
+
+    def _prefill_prefix(self, prefix: str) -> Tuple[Any, int]:
+        """Process `prefix` and return (state snapshot, snapshot size in bytes)."""
+        raise NotImplementedError
+
+    def _restore_prefix(self, state: Any) -> None:
+        raise NotImplementedError
+
+    def model_bytes(self) -> int:
+        """Size of the model weights (0 if there are none)."""
+        return 0
+
+    def stats(self) -> Dict[str, Any]:
+        tokens_per_second = self.tokens_generated / self.generation_seconds if self.generation_seconds else 0.0
+        return {
+            "engine": self.name,
+            "load_seconds": round(self.load_seconds, 3),
+            "batches": self.batches,
+            "tokens_generated": self.tokens_generated,
+            "tokens_per_second": round(tokens_per_second, 1),
+            "model_bytes": self.model_bytes(),
+            "rss_bytes": _rss_bytes(),
+            "prefix_cache": self.prefix_cache.stats() if self.prefix_cache is not None else None,
+        }
+
+
+class StubGenerator(Engine):
+    """
+    Deterministic stand-in for a small OSS model (default engine; tests).
+
+    To make batching and prefix caching measurable without a model, the stub
+    can simulate the cost of a forward pass:
+
+        cost(batch) = batch_overhead_ms + per_item_ms * len(batch)
+                      + prefill_ms_per_kchar * (prompt chars not covered by a cached prefix) / 1000
+                      + latency_ms()
+
+    `latency_ms` samples extra per-call latency from a distribution (load
+    tests, see scripts/load_test.py). All costs default to 0.
+
+    With a `json_schema` (and use_mock=False) the canned answer is returned
+    as a JSON document shaped by the schema, like a constrained model would.
+    """
+
+    name = "stub"
+    supports_prefix_cache = True
+
+    def __init__(
+        self,
+        use_mock: bool = True,
+        batch_overhead_ms: float = 0.0,
+        per_item_ms: float = 0.0,
+        prefill_ms_per_kchar: float = 0.0,
+        latency_ms: Optional[Callable[[], float]] = None,
+    ) -> None:
+        super().__init__()
+        self.use_mock = use_mock
+        self.batch_overhead_ms = batch_overhead_ms
+        self.per_item_ms = per_item_ms
+        self.prefill_ms_per_kchar = prefill_ms_per_kchar
+        self.latency_ms = latency_ms
+
+    def _generate_batch(self, prompts: List[str], json_schema: Optional[Dict[str, Any]] = None) -> List[Generation]:
+        cost_ms = self.batch_overhead_ms + self.per_item_ms * len(prompts) + self._sampled_latency_ms()
+        for prompt in prompts:
+            cost_ms += self._prefill_ms(len(prompt) - self._apply_prefix_cache(prompt))
+        if cost_ms > 0:
+            time.sleep(cost_ms / 1000)
+        results = []
+        for prompt in prompts:
+            text, model = self._respond(prompt, json_schema)
+            results.append(Generation(text=text, model=model, tokens=len(text.split())))
+        return results
+
+    def _prefill_prefix(self, prefix: str) -> Tuple[Any, int]:
+        if self.prefill_ms_per_kchar > 0:
+            time.sleep(self._prefill_ms(len(prefix)) / 1000)
+        state = prefix.encode("utf-8")
+        return state, len(state)
+
+    def _restore_prefix(self, state: Any) -> None:
+        pass  # nothing to restore: the stub keeps no model state
+
+    def _prefill_ms(self, chars: int) -> float:
+        return self.prefill_ms_per_kchar * chars / 1000
+
+    def _sampled_latency_ms(self) -> float:
+        return max(0.0, self.latency_ms()) if self.latency_ms is not None else 0.0
+
+    def _stream(self, prompt: str, json_schema: Optional[Dict[str, Any]] = None) -> Iterator[Generation]:
+        prefill_ms = self._prefill_ms(len(prompt) - self._apply_prefix_cache(prompt)) + self._sampled_latency_ms()
+        if prefill_ms > 0:
+            time.sleep(prefill_ms / 1000)
+        text, model = self._respond(prompt, json_schema)
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            if self.per_item_ms > 0:
+                time.sleep(self.per_item_ms / 1000)
+            yield Generation(text=word if i == 0 else f" {word}", model=model, tokens=1)
+
+    def _respond(self, prompt: str, json_schema: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        cleaned_prompt = (prompt or "").strip()
+        lower_prompt = cleaned_prompt.lower()
+
+        if self.use_mock:
+            return f"[oss-mock] Response for prompt: {cleaned_prompt[:300]}", "oss-mock"
+        if "birthday" in lower_prompt or "greeting" in lower_prompt:
+            text, model = (
+                "Happy birthday month! Wishing you a joyful year ahead filled with good surprises. "
+                "Thanks for trying the OSS model path.",
+                "oss-greeter-mini",
+            )
+        else:
+            text, model = (
+                f"Release note summary: {cleaned_prompt[:220]} ... (generated by OSS model stub)",
+                "oss-mini",
+            )
+        if json_schema is not None:
+            return json.dumps(_fill_schema(json_schema, text)), model
+        return text, model
+
+
+class LlamaCppEngine(Engine):
+    """
+    Small GGUF model on CPU via llama.cpp (pip install '.[local-llm]').
+
+    The GGUF file is memory-mapped read-only (`use_mmap=True`), so the
+    weights live in the OS page cache: every uvicorn worker / process on the
+    node maps the same pages instead of holding its own copy, and a restart
+    does not re-read the file from disk. RSS only grows by the KV cache and
+    scratch buffers (sized by `n_ctx`).
+
+    llama-cpp-python evaluates one sequence per call, so a batch runs its
+    prompts back to back under the model lock.
+
+    Prefix cache: a cached prefix's KV state is loaded with `load_state()`;
+    `create_completion` then only evaluates the tokens after the longest
+    common token prefix.
+    """
+
+    name = "llama_cpp"
+    supports_prefix_cache = True
+
+    def __init__(
+        self,
+        model_path: str,
+        n_ctx: int = 2048,
+        n_threads: Optional[int] = None,
+        max_tokens: int = 256,
+        temperature: float = 0.2,
+    ) -> None:
+        super().__init__()
+        try:
+            from llama_cpp import Llama
+        except ImportError as exc:
+            raise ValueError(
+                "MODEL_SERVICE_ENGINE=llama_cpp requires llama-cpp-python "
+                "(pip install 'day32-terraform-genai-release-topic-poc[local-llm]')."
+            ) from exc
+        if not os.path.isfile(model_path):
+            raise ValueError(f"MODEL_SERVICE_MODEL_PATH does not point to a GGUF file: {model_path!r}")
+
+        self.model_path = model_path
+        self.model_name = os.path.splitext(os.path.basename(model_path))[0]
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self._grammars: Dict[str, Any] = {}
+
+        started = time.perf_counter()
+        self._llm = Llama(
+            model_path=model_path,
+            n_ctx=n_ctx,
+            n_threads=n_threads or os.cpu_count(),
+            use_mmap=True,
+            use_mlock=False,
+            verbose=False,
+        )
+        self.load_seconds = time.perf_counter() - started
+        logger.info("Loaded %s in %.2fs (%d bytes, mmap).", model_path, self.load_seconds, self.model_bytes())
+
+    def _generate_batch(self, prompts: List[str], json_schema: Optional[Dict[str, Any]] = None) -> List[Generation]:
+        results = []
+        for prompt in prompts:
+            self._apply_prefix_cache(prompt)
+            out = self._llm.create_completion(
+                prompt,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                grammar=self._grammar(json_schema),
+            )
+            results.append(
+                Generation(
+                    text=out["choices"][0]["text"].strip(),
+                    model=self.model_name,
+                    tokens=int(out.get("usage", {}).get("completion_tokens", 0)),
+                )
+            )
+        return results
+
+    def _stream(self, prompt: str, json_schema: Optional[Dict[str, Any]] = None) -> Iterator[Generation]:
+        self._apply_prefix_cache(prompt)
+        chunks = self._llm.create_completion(
+            prompt,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            grammar=self._grammar(json_schema),
+            stream=True,
+        )
+        for chunk in chunks:
+            text = chunk["choices"][0]["text"]
+            if text:
+                yield Generation(text=text, model=self.model_name, tokens=1)
+
+    def _grammar(self, json_schema: Optional[Dict[str, Any]]) -> Any:
+        """GBNF grammar for the schema (compiled once per distinct schema), or None."""
+        if json_schema is None:
+            return None
+        key = json.dumps(json_schema, sort_keys=True)
+        grammar = self._grammars.get(key)
+        if grammar is None:
+            from llama_cpp import LlamaGrammar
+
+            grammar = self._grammars[key] = LlamaGrammar.from_json_schema(key, verbose=False)
+        return grammar
+
+    def _prefill_prefix(self, prefix: str) -> Tuple[Any, int]:
+        self._llm.reset()
+        self._llm.eval(self._llm.tokenize(prefix.encode("utf-8")))
+        state = self._llm.save_state()
+        return state, int(state.llama_state_size)
+
+    def _restore_prefix(self, state: Any) -> None:
+        self._llm.load_state(state)
+
+    def model_bytes(self) -> int:
+        return os.path.getsize(self.model_path)
+
+
+# ------------------------
+# Factory
+# ------------------------
+
+
+def build_engine(settings: Settings) -> Engine:
+    """Create the engine selected by MODEL_SERVICE_ENGINE (once per process)."""
+    name = settings.model_service_engine.lower()
+    engine: Engine
+    if name == "stub":
+        engine = StubGenerator(use_mock=settings.use_mock_llm)
+    elif name == "llama_cpp":
+        engine = LlamaCppEngine(
+            model_path=settings.model_service_model_path or "",
+            n_ctx=settings.model_service_n_ctx,
+            n_threads=settings.model_service_n_threads,
+            max_tokens=settings.model_service_max_tokens,
+        )
+    else:
+        raise ValueError(f"Unknown model service engine '{name}'. Expected one of: {', '.join(ENGINES)}.")
+
+    if settings.model_service_prefix_cache_enabled and engine.supports_prefix_cache:
+        engine.prefix_cache = PrefixCache(
+            max_bytes=settings.model_service_prefix_cache_max_mb * 1024 * 1024,
+            admit_after=settings.model_service_prefix_cache_admit_after,
+        )
+    return engine
+
+
+def _fill_schema(schema: Dict[str, Any], text: str) -> Any:
+    """A value matching `schema` (object / array / string subset) built from `text`."""
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: _fill_schema(spec, text) for name, spec in schema.get("properties", {}).items()}
+    if kind == "array":
+        count = max(1, schema.get("minItems", 0), min(3, schema.get("maxItems", 3)))
+        item = schema.get("items", {"type": "string"})
+        if item.get("type") == "string":
+            return [f"Scenario {i + 1}: verify {text[:80]}" for i in range(count)]
+        return [_fill_schema(item, text) for _ in range(count)]
+    if kind in ("integer", "number"):
+        return 0
+    if kind == "boolean":
+        return False
+    return text
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (includes touched mmap'd weight pages)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
@@ -1,8 +1,16 @@
 # src/model_service/main.py
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
 from config.settings import get_settings
+from core.sse import SSE_MEDIA_TYPE, format_sse
+from model_service.batcher import MicroBatcher
+from model_service.generator import Generation, build_engine
 
 settings = get_settings()
 
@@ -15,12 +23,45 @@ app = FastAPI(
     ),
 )
 
+# Loaded once per process; see MODEL_SERVICE_ENGINE.
+engine = build_engine(settings)
+
+
+def _run_batch(items: List[Tuple[str, Optional[str]]]) -> List[Generation]:
+    """
+    Micro-batch items are (prompt, JSON schema as canonical JSON or None).
+    Prompts are grouped by schema (one engine call per group) and results
+    are returned in item order.
+    """
+    groups: Dict[Optional[str], List[int]] = {}
+    for i, (_, schema) in enumerate(items):
+        groups.setdefault(schema, []).append(i)
+    results: List[Optional[Generation]] = [None] * len(items)
+    for schema, indexes in groups.items():
+        generated = engine.generate_batch(
+            [items[i][0] for i in indexes], json.loads(schema) if schema is not None else None
+        )
+        for i, result in zip(indexes, generated):
+            results[i] = result
+    return results  # type: ignore[return-value]
+
+
+batcher: MicroBatcher[Tuple[str, Optional[str]], Generation] = MicroBatcher(
+    _run_batch,
+    max_batch_size=settings.model_service_batch_max_size,
+    max_wait_ms=settings.model_service_batch_max_wait_ms,
+)
+
 
 class GenerateRequest(BaseModel):
     prompt: str = Field(
         ...,
         description="Prompt text to send to the OSS model.",
     )
+    json_schema: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="If set, constrain the output to a JSON document matching this JSON schema.",
+    )
 
 
 class GenerateResponse(BaseModel):
@@ -28,36 +69,81 @@ class GenerateResponse(BaseModel):
     model: str = Field(..., description="Model identifier.")
 
 
+class BatchGenerateRequest(BaseModel):
+    prompts: List[str] = Field(
+        ...,
+        min_items=1,
+        description="Prompts to generate in one call; results keep the same order.",
+    )
+
+
+class BatchGenerateResponse(BaseModel):
+    results: List[GenerateResponse] = Field(..., description="One result per prompt, in request order.")
+
+
 @app.post("/api/v1/generate", response_model=GenerateResponse)
-def generate_text(body: GenerateRequest) -> GenerateResponse:
+async def generate_text(body: GenerateRequest) -> GenerateResponse:
     """
     Minimal OSS text generation endpoint.
 
-    This stub makes the `oss` provider path usable even without a real model.
+    Runs the configured engine (MODEL_SERVICE_ENGINE). The default `stub`
+    engine makes the `oss` provider path usable even without a real model:
     - If USE_MOCK_LLM=true, returns a deterministic mock string.
     - Otherwise, returns a simple synthesized response tagged with a faux model name.
-    """
-    cleaned_prompt = (body.prompt or "").strip()
-    lower_prompt = cleaned_prompt.lower()
 
-    if settings.use_mock_llm:
-        text = f"[oss-mock] Response for prompt: {cleaned_prompt[:300]}"
-        model = "oss-mock"
+    With MODEL_SERVICE_BATCH_ENABLED=true, concurrent calls are micro-batched
+    (see model_service/batcher.py) and each caller gets its own result back.
+    With `json_schema`, the output is constrained to that schema (llama.cpp
+    grammar; the stub shapes its canned answer).
+    """
+    if settings.model_service_batch_enabled:
+        schema = json.dumps(body.json_schema, sort_keys=True) if body.json_schema is not None else None
+        result = await batcher.submit((body.prompt, schema))
     else:
-        if "birthday" in lower_prompt or "greeting" in lower_prompt:
-            text = (
-                "Happy birthday month! Wishing you a joyful year ahead filled with good surprises. "
-                "Thanks for trying the OSS model path."
-            )
-            model = "oss-greeter-mini"
-        else:
-            text = (
-                "Release note summary: "
-                f"{cleaned_prompt[:220]} ... (generated by OSS model stub)"
-            )
-            model = "oss-mini"
-
-    return GenerateResponse(text=text, model=model)
+        result = await run_in_threadpool(engine.generate, body.prompt, body.json_schema)
+    return GenerateResponse(text=result.text, model=result.model)
+
+
+@app.post("/api/v1/generate/batch", response_model=BatchGenerateResponse)
+async def generate_batch(body: BatchGenerateRequest) -> BatchGenerateResponse:
+    """
+    Generate for several prompts in one request (client-side batching).
+
+    Prompts run in chunks of MODEL_SERVICE_BATCH_MAX_SIZE, so one large
+    request cannot build a batch bigger than the model is sized for.
+    """
+    size = settings.model_service_batch_max_size
+    results: List[Generation] = []
+    for start in range(0, len(body.prompts), size):
+        results.extend(await run_in_threadpool(engine.generate_batch, body.prompts[start : start + size]))
+    return BatchGenerateResponse(results=[GenerateResponse(text=r.text, model=r.model) for r in results])
+
+
+@app.post("/api/v1/generate/stream")
+def generate_stream(body: GenerateRequest) -> StreamingResponse:
+    """
+    Stream generated text as Server-Sent Events (not micro-batched).
+
+        event: token   data: {"text": "<delta>"}        (repeated)
+        event: done    data: {"model": "...", "tokens": N}
+        event: error   data: {"detail": "..."}          (instead of done)
+
+    Time-to-first-token is one model step instead of the whole generation.
+    """
+
+    def events() -> Iterator[str]:
+        model, tokens = None, 0
+        try:
+            for chunk in engine.stream(body.prompt, body.json_schema):
+                model, tokens = chunk.model, tokens + chunk.tokens
+                yield format_sse("token", {"text": chunk.text})
+        except Exception as exc:  # noqa: BLE001 - headers are already sent; report in-band
+            yield format_sse("error", {"detail": str(exc)})
+            return
+        yield format_sse("done", {"model": model, "tokens": tokens})
+
+    # Sync iterator: Starlette pulls it in a worker thread, so the event loop is not blocked.
+    return StreamingResponse(events(), media_type=SSE_MEDIA_TYPE, headers={"Cache-Control": "no-cache"})
 
 
 @app.get("/health")
@@ -76,5 +162,13 @@ def health() -> dict:
         "env": settings.app_env,
         "llm_default_provider": settings.llm_default_provider,
         "use_mock_llm": settings.use_mock_llm,
+        "engine": engine.stats(),
+        "batching": {
+            "enabled": settings.model_service_batch_enabled,
+            "max_batch_size": settings.model_service_batch_max_size,
+            "max_wait_ms": settings.model_service_batch_max_wait_ms,
+            "batches_run": batcher.batches_run,
+            "mean_batch_size": round(batcher.mean_batch_size, 2),
+        },
         "part": 4,
     }
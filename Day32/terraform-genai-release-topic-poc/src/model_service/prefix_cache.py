@@ -0,0 +1,128 @@
+# src/model_service/prefix_cache.py
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+PREFIX_BOUNDARY = "\n\n"
+
+
+@dataclass
+class PrefixEntry:
+    prefix: str
+    state: Any  # engine-specific prefilled state (e.g. llama.cpp KV state)
+    nbytes: int
+    prefill_seconds: float
+
+
+class PrefixCache:
+    """
+    LRU cache of prefilled model state for common prompt prefixes.
+
+    Prefixes are cut at paragraph boundaries ("\\n\\n"): Day32 prompts start
+    with a fixed instruction preamble and only then the request-specific
+    fields, so every request of one kind shares its leading paragraphs.
+
+    - lookup(prompt): longest cached prefix of `prompt` (counts hit/miss and
+      the prefill time the hit avoided).
+    - admit(prompt): which prefix to prefill and cache after a miss. A prefix
+      is only admitted once it has been seen `admit_after` times, so one-off
+      prompts do not churn the cache.
+    - put(): store a state; least recently used entries are evicted until the
+      total state size fits in `max_bytes`.
+
+    Thread-safe; the engine calls it under its model lock anyway.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        admit_after: int = 2,
+        min_prefix_chars: int = 24,
+        max_tracked: int = 4096,
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._admit_after = max(1, admit_after)
+        self._min_prefix_chars = min_prefix_chars
+        self._max_tracked = max_tracked
+        self._entries: "OrderedDict[str, PrefixEntry]" = OrderedDict()
+        self._seen: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+        self.prefill_seconds_saved = 0.0
+
+    def candidates(self, prompt: str) -> List[str]:
+        """Prefixes of `prompt` ending at a paragraph boundary, longest first (never the whole prompt)."""
+        prefixes = []
+        end = prompt.find(PREFIX_BOUNDARY)
+        while end != -1:
+            end += len(PREFIX_BOUNDARY)
+            if self._min_prefix_chars <= end < len(prompt):
+                prefixes.append(prompt[:end])
+            end = prompt.find(PREFIX_BOUNDARY, end)
+        return prefixes[::-1]
+
+    def lookup(self, prompt: str) -> Optional[PrefixEntry]:
+        with self._lock:
+            self.lookups += 1
+            for prefix in self.candidates(prompt):
+                entry = self._entries.get(_key(prefix))
+                if entry is not None and entry.prefix == prefix:
+                    self._entries.move_to_end(_key(prefix))
+                    self.hits += 1
+                    self.prefill_seconds_saved += entry.prefill_seconds
+                    return entry
+            return None
+
+    def admit(self, prompt: str) -> Optional[str]:
+        """Record the prompt's prefixes; return the longest one that is now common enough to cache."""
+        admitted = None
+        with self._lock:
+            for prefix in self.candidates(prompt):
+                key = _key(prefix)
+                count = self._seen.pop(key, 0) + 1
+                self._seen[key] = count
+                if admitted is None and count >= self._admit_after:
+                    admitted = prefix
+            while len(self._seen) > self._max_tracked:
+                self._seen.popitem(last=False)
+        return admitted
+
+    def put(self, prefix: str, state: Any, nbytes: int, prefill_seconds: float) -> bool:
+        if nbytes > self._max_bytes:
+            return False
+        key = _key(prefix)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old.nbytes
+            self._entries[key] = PrefixEntry(prefix, state, nbytes, prefill_seconds)
+            self.bytes += nbytes
+            while self.bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.nbytes
+                self.evictions += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self._max_bytes,
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_ratio": round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+                "prefill_seconds_saved": round(self.prefill_seconds_saved, 3),
+                "evictions": self.evictions,
+            }
+
+
+def _key(prefix: str) -> str:
+    return hashlib.blake2b(prefix.encode("utf-8"), digest_size=16).hexdigest()
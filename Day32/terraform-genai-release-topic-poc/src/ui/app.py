@@ -1,6 +1,8 @@
 import os
+import time
 import datetime as dt
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 import httpx
 import streamlit as st
@@ -10,6 +12,12 @@ import streamlit as st
 # -------------------------------------------------------------------
 
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+# Streamlit re-runs this script on every interaction: keep backend calls off that path.
+HEALTH_TTL_SECONDS = float(os.getenv("UI_HEALTH_TTL_SECONDS", "15"))
+GREETING_MEMO_TTL_SECONDS = float(os.getenv("UI_GREETING_MEMO_TTL_SECONDS", "300"))
+GREETING_MEMO_MAX_ENTRIES = int(os.getenv("UI_GREETING_MEMO_MAX_ENTRIES", "32"))
+# Every UI user reaches the API from this pod: identify as the UI for rate limiting, not as one shared IP.
+UI_API_KEY = os.getenv("UI_API_KEY", "")
 
 st.set_page_config(
     page_title="Day32 – GenAI Greeting PoC",
@@ -87,6 +95,21 @@ st.markdown(
 # -------------------------------------------------------------------
 
 
+@st.cache_resource
+def get_http_client() -> httpx.Client:
+    """
+    One pooled httpx.Client per UI process, shared by all sessions and
+    reruns, so calls reuse keep-alive connections to the backend instead of
+    opening a new one (TCP + TLS) each time.
+    """
+    return httpx.Client(
+        base_url=API_BASE_URL.rstrip("/"),
+        headers={"X-API-Key": UI_API_KEY} if UI_API_KEY else None,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    )
+
+
 def call_greeting_api(
     name: str,
     dob: dt.date,
@@ -99,8 +122,6 @@ def call_greeting_api(
     (provider optional) and returns JSON with fields:
     greeting_message, provider, model, is_birthday_month, cached.
     """
-    url = f"{API_BASE_URL.rstrip('/')}/api/v1/greeting/generate"
-
     payload = {
         "name": name,
         "date_of_birth": dob.isoformat(),  # YYYY-MM-DD
@@ -108,19 +129,53 @@ def call_greeting_api(
     if provider:
         payload["provider"] = provider  # "openai" | "oss"
 
-    resp = httpx.post(url, json=payload, timeout=30.0)
+    resp = get_http_client().post("/api/v1/greeting/generate", json=payload)
     resp.raise_for_status()
     return resp.json()
 
 
+def get_greeting(
+    name: str,
+    dob: dt.date,
+    provider: Optional[str],
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    call_greeting_api() behind a small per-session memo of recent results.
+
+    Returns (result, from_memo). Asking again for the same person / provider
+    within UI_GREETING_MEMO_TTL_SECONDS reuses the answer without a backend
+    call. Today's date is part of the key, so a new day (and month) always
+    asks the backend again. Errors are not memoized.
+    """
+    memo: "OrderedDict[Tuple[str, str, str, str], Tuple[float, Dict[str, Any]]]" = st.session_state.setdefault(
+        "greeting_memo", OrderedDict()
+    )
+    key = (name.lower(), dob.isoformat(), provider or "", dt.date.today().isoformat())
+    now = time.monotonic()
+    hit = memo.get(key)
+    if hit is not None and hit[0] > now:
+        memo.move_to_end(key)
+        return hit[1], True
+
+    result = call_greeting_api(name=name, dob=dob, provider=provider)
+    memo[key] = (now + GREETING_MEMO_TTL_SECONDS, result)
+    memo.move_to_end(key)
+    while len(memo) > GREETING_MEMO_MAX_ENTRIES:
+        memo.popitem(last=False)
+    return result, False
+
+
+@st.cache_data(ttl=HEALTH_TTL_SECONDS, show_spinner=False)
 def call_healthcheck() -> Optional[Dict[str, Any]]:
     """
     Optional: call a simple /health endpoint if you have one.
     Safe to ignore errors.
+
+    Memoized for UI_HEALTH_TTL_SECONDS across sessions: repeated clicks
+    and reruns do not hit the backend again.
     """
-    url = f"{API_BASE_URL.rstrip('/')}/health"
     try:
-        resp = httpx.get(url, timeout=5.0)
+        resp = get_http_client().get("/health", timeout=5.0)
         resp.raise_for_status()
         return resp.json()
     except Exception:
@@ -189,7 +244,7 @@ with greeting_tab:
         else:
             try:
                 with st.spinner("Talking to the GenAI backend…"):
-                    result = call_greeting_api(name=name.strip(), dob=dob, provider=provider_value)
+                    result, from_memo = get_greeting(name=name.strip(), dob=dob, provider=provider_value)
             except httpx.HTTPError as http_exc:
                 st.error(f"Error calling API: {http_exc}")
             except Exception as exc:
@@ -222,8 +277,8 @@ with greeting_tab:
                         <span class="pill pill-provider">
                           Provider: {used_provider}
                         </span>
-                        <span class="pill {'pill-cache-hit' if from_cache else 'pill-cache-miss'}">
-                          Cache: {"hit (Redis)" if from_cache else "miss (fresh LLM call)"}
+                        <span class="pill {'pill-cache-hit' if from_cache or from_memo else 'pill-cache-miss'}">
+                          Cache: {"hit (UI memo)" if from_memo else "hit (Redis)" if from_cache else "miss (fresh LLM call)"}
                         </span>
                         {"<span class='pill pill-provider'>Model: " + model_used + "</span>" if model_used else ""}
                         <span class="pill {'pill-birthday-yes' if is_birthday_month else 'pill-birthday-no'}">
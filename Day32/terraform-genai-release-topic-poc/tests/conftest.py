@@ -0,0 +1,122 @@
+# tests/conftest.py
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import fakeredis
+import pytest
+
+from config.settings import Settings
+from core.models import LLMGenerationResult, ModelProvider
+from core.services import GreetingService, RedisCache, ReleaseNotesService
+
+
+class FakeLLM:
+    """
+    LLMClient stand-in with the same generate_text / agenerate_text signatures.
+
+    Counts calls and records the workload of each one. `text` may contain "{n}"
+    (the 1-based call number); `delay` keeps calls in flight so misses overlap.
+    Attributes can be changed mid-test (e.g. `model` to simulate an outage).
+    """
+
+    def __init__(
+        self,
+        text: str = "Note.\n- Scenario",
+        provider: str = "openai",
+        model: str = "gpt-test",
+        delay: float = 0.0,
+    ) -> None:
+        self.text, self.provider, self.model, self.delay = text, provider, model, delay
+        self.calls = 0
+        self.workloads = []
+        self._lock = threading.Lock()
+
+    def generate_text(
+        self,
+        prompt: str,
+        provider: Optional[ModelProvider] = None,
+        workload: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+    ) -> LLMGenerationResult:
+        n = self._record(workload)
+        if self.delay:
+            time.sleep(self.delay)
+        return self._result(n)
+
+    async def agenerate_text(
+        self,
+        prompt: str,
+        provider: Optional[ModelProvider] = None,
+        timeout: Optional[float] = None,
+        workload: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None,
+    ) -> LLMGenerationResult:
+        n = self._record(workload)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self._result(n)
+
+    def _record(self, workload: Optional[str]) -> int:
+        with self._lock:
+            self.calls += 1
+            self.workloads.append(workload)
+            return self.calls
+
+    def _result(self, n: int) -> LLMGenerationResult:
+        text = self.text.replace("{n}", str(n))
+        return LLMGenerationResult(text=text, provider=self.provider, model=self.model)
+
+
+@pytest.fixture
+def llm() -> FakeLLM:
+    return FakeLLM()
+
+
+@pytest.fixture
+def redis_server() -> fakeredis.FakeServer:
+    """One Redis "server"; caches built with make_cache share it like pods sharing Redis."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def make_cache(redis_server):
+    def factory() -> RedisCache:
+        return RedisCache(
+            settings=Settings(redis_l1_max_entries=0),
+            client=fakeredis.FakeRedis(server=redis_server),
+        )
+
+    return factory
+
+
+@pytest.fixture
+def cache(make_cache) -> RedisCache:
+    return make_cache()
+
+
+@pytest.fixture
+def make_release_service(cache, llm):
+    """ReleaseNotesService over the shared `cache` and `llm`; keyword arguments are passed through."""
+
+    def factory(**kwargs) -> ReleaseNotesService:
+        kwargs.setdefault("settings", Settings())
+        kwargs.setdefault("llm_client", llm)
+        kwargs.setdefault("cache", cache)
+        return ReleaseNotesService(**kwargs)
+
+    return factory
+
+
+@pytest.fixture
+def make_greeting_service(cache, llm):
+    """GreetingService over the shared `cache` and `llm`; keyword arguments are passed through."""
+
+    def factory(**kwargs) -> GreetingService:
+        kwargs.setdefault("settings", Settings(llm_default_provider="openai"))
+        kwargs.setdefault("llm_client", llm)
+        kwargs.setdefault("cache", cache)
+        return GreetingService(**kwargs)
+
+    return factory
@@ -95,23 +95,34 @@ def test_release_notes_oss_provider(monkeypatch):
     # Disable mock mode so the OSS path is exercised
     monkeypatch.setattr(api_main.settings, "use_mock_llm", False, raising=False)
     monkeypatch.setattr(api_main.llm_client._settings, "use_mock_llm", False, raising=False)
-    monkeypatch.setattr(api_main.redis_cache, "get_json", lambda key: None, raising=False)
-    monkeypatch.setattr(api_main.redis_cache, "set_json", lambda key, value, ttl: None, raising=False)
 
-    def fake_post(url, json, timeout):
-        class Resp:
-            def raise_for_status(self):
-                return None
+    async def cache_miss(key):
+        return None
 
-            def json(self):
-                return {
-                    "text": "Release note generated line\n- scenario A\n- scenario B",
-                    "model": "oss-test-model",
-                }
+    async def cache_set(key, value, ttl):
+        return None
 
-        return Resp()
+    monkeypatch.setattr(api_main.async_redis_cache, "get_json", cache_miss, raising=False)
+    monkeypatch.setattr(api_main.async_redis_cache, "set_json", cache_set, raising=False)
 
-    monkeypatch.setattr(llm_client_module.httpx, "post", fake_post)
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(request)
+        return llm_client_module.httpx.Response(
+            200,
+            json={
+                "text": "Release note generated line\n- scenario A\n- scenario B",
+                "model": "oss-test-model",
+            },
+        )
+
+    # The async path reuses one pooled AsyncClient; swap its transport for a fake model_service.
+    fake_model_service = llm_client_module.httpx.AsyncClient(
+        base_url=api_main.settings.model_service_base_url,
+        transport=llm_client_module.httpx.MockTransport(handler),
+    )
+    monkeypatch.setattr(api_main.llm_client, "_async_http_client", fake_model_service)
 
     payload = {
         "title": "Improve login error messages",
@@ -131,3 +142,4 @@ def test_release_notes_oss_provider(monkeypatch):
     assert body["provider"] == "oss"
     assert body["model"] == "oss-test-model"
     assert body["cached"] is False
+    assert [r.url.path for r in requests_seen] == ["/api/v1/generate"]
@@ -0,0 +1,121 @@
+# tests/test_cache.py
+import time
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+import redis
+
+from config.settings import Settings
+from core.local_cache import LocalTTLCache
+from core.redis_pool import build_redis_client
+from core.services import AsyncRedisCache, RedisCache
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _subscribers(cache: RedisCache) -> int:
+    counts = dict(cache.client.pubsub_numsub(RedisCache.INVALIDATION_CHANNEL))
+    return counts.get(RedisCache.INVALIDATION_CHANNEL.encode(), 0)
+
+
+def test_local_ttl_cache_lru_and_ttl_cap():
+    """L1 evicts least-recently-used entries and never outlives the given TTL."""
+    now = [0.0]
+    cache = LocalTTLCache(max_entries=2, ttl_seconds=30.0, clock=lambda: now[0])
+
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=5.0)  # capped by the (shorter) Redis TTL
+    cache.get("a")  # touch a so b becomes LRU
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("d", 4, ttl_seconds=5.0)
+    now[0] = 6.0
+    assert cache.get("d") is None
+    assert cache.get("a") == 1  # 30s L1 TTL not reached yet
+
+
+def test_redis_cache_serves_hot_keys_from_l1():
+    """Second read of a key must not touch Redis."""
+    client = fakeredis.FakeRedis()
+    cache = RedisCache(settings=Settings(), client=client)
+
+    client.set("k", '{"release_note": "hi"}', ex=60)
+    assert cache.get_json("k") == {"release_note": "hi"}
+
+    client.delete("k")  # L1 still has it (no invalidation configured)
+    assert cache.get_json("k") == {"release_note": "hi"}
+
+
+def test_pubsub_invalidation_keeps_l1_coherent_across_pods():
+    """A write on pod A evicts the stale L1 copy on pod B."""
+    server = fakeredis.FakeServer()
+    settings = Settings(redis_l1_invalidation="pubsub")
+    pod_a = RedisCache(settings=settings, client=fakeredis.FakeRedis(server=server))
+    pod_b = RedisCache(settings=settings, client=fakeredis.FakeRedis(server=server))
+    # Let both listeners subscribe before writing.
+    assert _wait_for(lambda: _subscribers(pod_a) >= 2)
+
+    pod_a.set_json("k", {"v": 1}, ttl_seconds=60)
+    assert pod_b.get_json("k") == {"v": 1}  # now cached in B's L1
+
+    pod_a.set_json("k", {"v": 2}, ttl_seconds=60)
+    assert _wait_for(lambda: pod_b.get_json("k") == {"v": 2})
+
+
+
+def test_build_redis_client_applies_pool_settings():
+    settings = Settings(redis_max_connections=7, redis_socket_timeout_seconds=0.25, redis_health_check_interval_seconds=15)
+    client = build_redis_client(settings)
+    pool = client.connection_pool
+    assert isinstance(pool, redis.BlockingConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.connection_kwargs["socket_timeout"] == 0.25
+    assert pool.connection_kwargs["health_check_interval"] == 15
+
+
+def test_mget_and_set_many_use_l1_and_one_round_trip():
+    client = fakeredis.FakeRedis()
+    cache = RedisCache(settings=Settings(), client=client)
+
+    cache.set_many_json({"a": {"v": 1}, "b": {"v": 2}}, ttl_seconds=60)
+    client.set("c", '{"v": 3}', ex=60)  # written by "another pod", not in L1
+    assert cache.mget_json(["a", "missing", "c", "b"]) == [{"v": 1}, None, {"v": 3}, {"v": 2}]
+    assert 0 < client.pttl("a") <= 60_000
+
+    client.delete("c")
+    assert cache.mget_json(["c"]) == [{"v": 3}]  # now served from L1
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_async_cache_round_trip_and_shared_l1():
+    server = fakeredis.FakeServer()
+    sync_cache = RedisCache(settings=Settings(), client=fakeredis.FakeRedis(server=server))
+    async_cache = AsyncRedisCache(
+        settings=Settings(),
+        client=fakeredis.aioredis.FakeRedis(server=server),
+        l1=sync_cache.l1,
+    )
+
+    await async_cache.set_json("k", {"v": 1}, ttl_seconds=60)
+    assert await async_cache.get_json("k") == {"v": 1}
+    assert sync_cache.get_json("k") == {"v": 1}  # same Redis + shared L1
+    assert await async_cache.mget_json(["k", "nope"]) == [{"v": 1}, None]
+
+    await async_cache.delete("k")
+    assert sync_cache.get_json("k") is None
+    await async_cache.aclose()
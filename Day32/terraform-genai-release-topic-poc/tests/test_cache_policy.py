@@ -0,0 +1,129 @@
+# tests/test_cache_policy.py
+import httpx
+from fastapi.testclient import TestClient
+
+import app.main as api_main
+from config.settings import Settings
+from core.cache_policy import CachePolicy, invalidate_matching
+from core.freshness import BackgroundRefresher, FreshnessPolicy
+from core.llm_client import LLMClient
+from core.models import GreetingRequest, ModelProvider, ReleaseNoteRequest
+from core.services import RedisCache
+
+FRESHNESS = FreshnessPolicy(soft_ttl_seconds=3600, stale_ttl_seconds=600, xfetch_beta=0)
+
+
+def _release_note_key(cache: RedisCache) -> str:
+    (key,) = cache.client.scan_iter("d32-release:release-notes:*")
+    return key.decode()
+
+
+def test_policy_decisions():
+    policy = CachePolicy(negative_ttl_seconds=20, ttl_overrides={"oss": 600, "oss/tiny": 0, "openai/gpt-x": 60})
+
+    failure = policy.decide("oss", "oss-fallback", FRESHNESS)
+    assert failure.negative and failure.freshness.hard_ttl_seconds == 20
+    assert not policy.decide("mock-openai", "mock", FRESHNESS).cache
+    assert policy.decide("mock-openai", "mock-fallback-error", FRESHNESS).negative
+    assert policy.decide("oss", "oss-mini", FRESHNESS).freshness.soft_ttl_seconds == 600
+    assert not policy.decide("oss", "tiny", FRESHNESS).cache  # most specific override wins
+    assert policy.decide("openai", "gpt-x", FRESHNESS).freshness.hard_ttl_seconds == 660
+    assert policy.decide("openai", "gpt-y", FRESHNESS).freshness is FRESHNESS
+    assert not CachePolicy(negative_ttl_seconds=0).decide("oss", "oss-fallback", FRESHNESS).cache
+
+
+def test_outage_fallback_is_negatively_cached_and_not_indexed(cache, llm, make_release_service):
+    llm.provider, llm.model = "oss", "oss-fallback"
+    service = make_release_service(
+        freshness=FRESHNESS,
+        cache_policy=CachePolicy(negative_ttl_seconds=20),
+    )
+    request = ReleaseNoteRequest(title="Bump RDS", description="Upgrade RDS instance class.")
+
+    assert not service.generate_release_notes(request, provider=ModelProvider.OSS).cached
+    assert service.generate_release_notes(request, provider=ModelProvider.OSS).cached
+    assert llm.calls == 1
+    assert 0 < cache.client.ttl(_release_note_key(cache)) <= 20
+
+    assert service.invalidate(request) == 1
+    service.generate_release_notes(request)
+    assert llm.calls == 2
+
+
+def test_failed_background_refresh_keeps_the_cached_answer(
+    cache, llm, make_release_service, make_greeting_service
+):
+    llm.provider, llm.model = "oss", "oss-mini"
+    refresher = BackgroundRefresher(cache=cache)
+    stale_at_once = FreshnessPolicy(soft_ttl_seconds=0, stale_ttl_seconds=600, xfetch_beta=0)
+    service = make_release_service(
+        freshness=stale_at_once,
+        refresher=refresher,
+        cache_policy=CachePolicy(negative_ttl_seconds=20),
+    )
+    request = ReleaseNoteRequest(title="Bump RDS", description="Upgrade RDS instance class.")
+    service.generate_release_notes(request)
+    key = _release_note_key(cache)
+    good = cache.get_json(key)
+
+    llm.model = "oss-fallback"  # outage: the stale hit below triggers a refresh that fails
+    assert service.generate_release_notes(request).cached
+    refresher.drain(timeout=2)
+    assert llm.calls == 2
+    assert cache.get_json(key) == good  # not replaced by a 20s negative entry
+    assert service.generate_release_notes(request).model == "oss-mini"
+
+    llm.model = "oss-mini"
+    greetings = make_greeting_service(
+        freshness=stale_at_once,
+        refresher=refresher,
+        cache_policy=CachePolicy(negative_ttl_seconds=20),
+    )
+    greeting = GreetingRequest(name="Asha", date_of_birth="1990-05-17", provider=ModelProvider.OSS)
+    greetings.generate_greeting(greeting)
+    llm.model = "oss-fallback"
+    assert greetings.generate_greeting(greeting).cached
+    refresher.drain(timeout=2)
+    assert greetings.generate_greeting(greeting).model == "oss-mini"
+
+
+def test_llm_client_skips_a_provider_that_just_failed():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("model_service down")
+
+    client = LLMClient(
+        Settings(use_mock_llm=False, llm_default_provider="oss", cache_negative_ttl_seconds=30),
+        http_client=httpx.Client(transport=httpx.MockTransport(handler), base_url="http://model-service"),
+    )
+    first = client.generate_text("Title: a\n\nbody")
+    second = client.generate_text("Title: b\n\nbody")
+    assert first.model == second.model == "oss-fallback"
+    assert len(calls) == 1
+
+
+def test_invalidation_endpoints(monkeypatch, cache, make_greeting_service):
+    for i, model in enumerate(["oss-mini", "oss-mini", "oss-fallback"]):
+        cache.set_json(f"d32-release:release-notes:{i}", {"provider": "oss", "model": model}, 60)
+    assert invalidate_matching(cache, "release-notes", model="oss-fallback") == {"scanned": 3, "deleted": 1}
+
+    greetings = make_greeting_service()
+    monkeypatch.setattr(api_main, "redis_cache", cache)
+    monkeypatch.setattr(api_main, "greeting_service", greetings)
+    person = {"name": "Asha", "date_of_birth": "1990-05-01", "provider": "openai"}
+    greetings.generate_greeting(GreetingRequest(**person))
+
+    client = TestClient(api_main.app)
+    assert client.post("/api/v1/greeting/cache/invalidate", json=person).json()["deleted"] == 1
+    bulk = {"namespace": "release-notes", "provider": "oss"}
+    keys = cache.client.dbsize()
+    assert client.post("/api/v1/cache/invalidate", json=bulk).status_code == 403  # no CACHE_ADMIN_KEY: disabled
+
+    monkeypatch.setattr(api_main.settings, "cache_admin_key", "ops-secret")
+    assert client.post("/api/v1/cache/invalidate", json=bulk).status_code == 401
+    assert client.post("/api/v1/cache/invalidate", json=bulk, headers={"X-Admin-Key": "guess"}).status_code == 401
+    assert cache.client.dbsize() == keys  # nothing was dropped by the rejected calls
+    body = client.post("/api/v1/cache/invalidate", json=bulk, headers={"X-Admin-Key": "ops-secret"}).json()
+    assert body == {"deleted": 2, "scanned": 2}
@@ -0,0 +1,54 @@
+# tests/test_cache_stats.py
+import fakeredis
+from fastapi.testclient import TestClient
+
+import app.main as api_main
+from core.cache_stats import namespace_of, sample_keyspace
+from core.models import GreetingRequest, ModelProvider
+
+
+def test_counters_are_kept_per_namespace_including_bypasses(cache, make_greeting_service):
+    service = make_greeting_service()
+    request = GreetingRequest(name="Asha", date_of_birth="1990-05-01", provider=ModelProvider.OPENAI)
+    service.generate_greeting(request)
+    (key,) = [k.decode() for k in cache.client.scan_iter("d32-release:greeting:*") if b":known:" not in k]
+    # Replace the stored greeting with a mock-mode one, then count from a clean slate.
+    cache.stats.reset()
+    cache.set_json(key, {"greeting_message": "x", "is_birthday_month": False, "provider": "mock-openai"}, 60)
+
+    assert not service.generate_greeting(request).cached  # mock entry bypassed, real one stored
+    assert service.generate_greeting(request).cached
+    cache.get_json("d32-release:release-notes:missing")
+
+    counters = cache.stats.snapshot()
+    assert counters["greeting"]["hits"] == 2 and counters["greeting"]["bypasses"] == 1
+    assert counters["greeting"]["sets"] == 2 and counters["greeting"]["hit_ratio"] == 0.5
+    assert counters["release-notes"]["misses"] == 1
+    assert namespace_of("other-app:key") == "other"
+
+
+def test_keyspace_sample_is_bounded_and_bucketed():
+    client = fakeredis.FakeRedis()
+    for i in range(30):
+        client.set(f"d32-release:greeting:{i}", "x" * 100, ex=120)
+    client.set("d32-release:job:1", "{}")
+    client.zadd("d32-release:greeting:known:05", {"a": 0})
+
+    full = sample_keyspace(client, max_keys=1000, scan_count=7)
+    assert full["complete"] and full["sampled_keys"] == 32
+    greeting = full["namespaces"]["greeting"]
+    assert greeting["keys"] == 31 and greeting["ttl"]["<1h"] == 30 and greeting["ttl"]["none"] == 1
+    assert greeting["max_bytes"] >= 100 and full["namespaces"]["job"]["keys"] == 1
+
+    partial = sample_keyspace(client, max_keys=10, scan_count=7)
+    assert partial["sampled_keys"] == 10 and not partial["complete"]
+
+
+def test_cache_stats_endpoint(monkeypatch, cache):
+    cache.set_json("d32-release:greeting:abc", {"greeting_message": "hi"}, 60)
+    monkeypatch.setattr(api_main, "redis_cache", cache)
+
+    body = TestClient(api_main.app).get("/api/v1/cache/stats").json()
+    assert body["counters"]["greeting"]["sets"] == 1
+    assert body["keyspace"]["namespaces"]["greeting"]["keys"] == 1
+    assert TestClient(api_main.app).get("/api/v1/cache/stats?sample_keys=0").json()["keyspace"] is None
@@ -0,0 +1,69 @@
+# tests/test_codecs.py
+import json
+
+import fakeredis
+import pytest
+
+from config.settings import Settings
+from core.codecs import MAGIC, ValueCodec, hash_bytes
+from core.services import RedisCache
+
+
+VALUE = {
+    "release_note": "Upgraded the RDS instance class. " * 80,
+    "test_scenarios": ["Verify failover", "Check connection pool limits"],
+    "provider": "openai",
+    "model": "gpt-4o-mini",
+    "cached": False,
+}
+
+
+def test_json_zlib_round_trip_compresses_only_large_values():
+    codec = ValueCodec(serializer="json", compression="zlib", compress_min_bytes=1024)
+
+    large = codec.encode(VALUE)
+    assert large[0] == MAGIC and large[2:3] == b"z"
+    assert len(large) < len(json.dumps(VALUE)) / 4
+    assert codec.decode(large) == VALUE
+
+    small = codec.encode({"v": 1})
+    assert small[2:3] == b"n"
+    assert codec.decode(small) == {"v": 1}
+
+
+def test_legacy_json_values_stay_readable():
+    codec = ValueCodec(serializer="json", compression="zlib")
+    legacy = json.dumps(VALUE)
+    assert codec.decode(legacy) == VALUE  # str from a decode_responses=True client
+    assert codec.decode(legacy.encode("utf-8")) == VALUE
+
+    client = fakeredis.FakeRedis()
+    client.set("old", legacy, ex=60)
+    cache = RedisCache(settings=Settings(), client=client, codec=codec)
+    assert cache.get_json("old") == VALUE
+
+
+def test_reader_decodes_values_written_with_other_settings():
+    """Mixed settings during a rollout: each value carries its own header."""
+    writer = ValueCodec(serializer="json", compression="none")
+    reader = ValueCodec(serializer="json", compression="zlib")
+    assert reader.decode(writer.encode(VALUE)) == VALUE
+
+    with pytest.raises(ValueError):
+        reader.decode(bytes([MAGIC]) + b"?n{}")
+
+
+def test_msgpack_codec_round_trip():
+    pytest.importorskip("msgpack")
+    codec = ValueCodec(serializer="msgpack", compression="zlib")
+    assert codec.decode(codec.encode(VALUE)) == VALUE
+    assert ValueCodec().decode(codec.encode(VALUE)) == VALUE
+
+
+def test_key_hashes_are_stable_and_distinct():
+    data = b'{"title":"Bump RDS"}'
+    assert hash_bytes(data, "blake2b") == hash_bytes(data, "blake2b")
+    assert len(hash_bytes(data, "blake2b")) == 32
+    assert len(hash_bytes(data, "sha256")) == 64
+    with pytest.raises(ValueError):
+        hash_bytes(data, "md5")
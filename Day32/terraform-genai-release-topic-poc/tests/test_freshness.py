@@ -0,0 +1,41 @@
+# tests/test_freshness.py
+from core.freshness import BackgroundRefresher, FreshnessPolicy
+from core.models import ReleaseNoteRequest
+
+
+def test_xfetch_refresh_probability_grows_towards_soft_expiry():
+    policy = FreshnessPolicy(soft_ttl_seconds=100, stale_ttl_seconds=50, xfetch_beta=1.0)
+    meta = policy.wrap({}, compute_seconds=2.0, now=0.0)["_swr"]
+
+    assert policy.hard_ttl_seconds == 150
+    assert policy.needs_refresh(meta, now=100.0)  # stale: always
+    assert not policy.needs_refresh(None, now=10_000.0)  # legacy entry: plain TTL
+    # rand=0.5 -> refresh window of 2 * ln(2) ~ 1.4s before soft expiry.
+    assert not policy.needs_refresh(meta, now=98.0, rand=lambda: 0.5)
+    assert policy.needs_refresh(meta, now=99.0, rand=lambda: 0.5)
+    # An unlucky draw can refresh much earlier; beta=0 never does.
+    assert policy.needs_refresh(meta, now=50.0, rand=lambda: 1e-20)
+    assert not FreshnessPolicy(xfetch_beta=0).needs_refresh(meta, now=99.9, rand=lambda: 1e-20)
+
+
+def test_stale_entry_is_served_while_refreshed_in_background(cache, llm, make_release_service):
+    llm.text = "Note v{n}.\n- Scenario"
+    refresher = BackgroundRefresher(cache=cache)
+    service = make_release_service(
+        # soft TTL 0: every cached entry is immediately stale but still servable for 60s.
+        freshness=FreshnessPolicy(soft_ttl_seconds=0, stale_ttl_seconds=60, xfetch_beta=0),
+        refresher=refresher,
+    )
+    request = ReleaseNoteRequest(title="Bump RDS", description="Upgrade RDS instance class.")
+
+    first = service.generate_release_notes(request)
+    assert first.release_note == "Note v1." and not first.cached
+
+    stale = service.generate_release_notes(request)
+    assert stale.cached and stale.release_note == "Note v1."  # no waiting on the LLM
+    refresher.drain(timeout=2)
+    assert llm.calls == 2
+    assert llm.workloads == ["release-notes", "background"]  # the refresh does not compete with live calls
+
+    refreshed = service.generate_release_notes(request)
+    assert refreshed.cached and refreshed.release_note == "Note v2."
@@ -0,0 +1,79 @@
+# tests/test_greeting_prewarm.py
+import json
+from datetime import date, datetime
+
+import pytest
+
+from core.freshness import FreshnessPolicy
+from core.models import GreetingRequest
+
+
+class _Clock:
+    """Settable wall clock for GreetingService(clock=...)."""
+
+    now = datetime(2025, 1, 31, 21, 0)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> _Clock:
+    return _Clock()
+
+
+@pytest.fixture
+def service(make_greeting_service, llm, clock):
+    llm.text = "Hello!"
+    return make_greeting_service(
+        freshness=FreshnessPolicy(soft_ttl_seconds=24 * 3600, stale_ttl_seconds=0, xfetch_beta=0),
+        clock=clock,
+    )
+
+
+def test_flag_flipping_entries_expire_at_the_month_boundary(service, cache, clock):
+    # 21:00 on 31 Jan: three hours left in the month.
+    clock.now = datetime(2025, 1, 31, 21, 0)
+
+    service.generate_greeting(GreetingRequest(name="Feb", date_of_birth="1990-02-10"))  # flag flips on 1 Feb
+    service.generate_greeting(GreetingRequest(name="Jun", date_of_birth="1990-06-10"))  # unaffected
+
+    keys = [k for k in cache.client.scan_iter("d32-release:greeting:*") if b":known:" not in k]
+    ttls = {cache.client.ttl(key) for key in keys}
+    assert ttls == {3 * 3600, 24 * 3600}
+
+
+def test_prewarm_generates_flipped_variants_once(service, llm, clock):
+    clock.now = datetime(2025, 1, 31, 21, 0)
+    for name, dob in [("Jan", "1990-01-05"), ("Feb", "1991-02-10"), ("Jun", "1992-06-10")]:
+        service.generate_greeting(GreetingRequest(name=name, date_of_birth=dob))
+    assert llm.calls == 3
+
+    counts = service.prewarm_month_boundary(date(2025, 2, 1), max_workers=2)
+    # Jan (birthday month ends) and Feb (begins) are warmed; Jun's flag does not change.
+    assert counts == {"candidates": 2, "skipped": 0, "generated": 2, "failed": 0}
+    assert llm.workloads[3:] == ["background", "background"]
+    assert service.prewarm_month_boundary(date(2025, 2, 1))["skipped"] == 2
+
+    # On the 1st the new variants are served from cache; Feb's expires on 1 Mar.
+    clock.now = datetime(2025, 2, 1, 0, 5)
+    greeting = service.generate_greeting(GreetingRequest(name="Feb", date_of_birth="1991-02-10"))
+    assert greeting.cached and greeting.is_birthday_month
+    assert llm.calls == 5
+
+
+def test_known_identities_are_normalized_trimmed_and_invalidated(service, cache, clock):
+    client = cache.client
+    clock.now = datetime(2025, 1, 10, 12, 0)
+    service.generate_greeting(GreetingRequest(name="Ann", date_of_birth="1990-02-10"))
+    service.generate_greeting(GreetingRequest(name="  ANN ", date_of_birth="1990-02-10"))
+    assert client.zcard("d32-release:greeting:known:02") == 1
+
+    # Someone not seen within the hard TTL is trimmed on the next write.
+    clock.now = datetime(2025, 1, 20, 12, 0)
+    service.generate_greeting(GreetingRequest(name="Bob", date_of_birth="1991-02-11"))
+    members = client.zrange("d32-release:greeting:known:02", 0, -1)
+    assert [json.loads(m)["name"] for m in members] == ["bob"]
+
+    service.invalidate(GreetingRequest(name="BOB", date_of_birth="1991-02-11"))
+    assert client.zcard("d32-release:greeting:known:02") == 0
@@ -0,0 +1,110 @@
+# tests/test_jobs.py
+import fakeredis
+import redis
+from fastapi.testclient import TestClient
+
+import app.main as api_main
+from core.jobs import JobQueue, JobWorkerPool
+
+
+def _queue(**kwargs) -> JobQueue:
+    return JobQueue(fakeredis.FakeRedis(), **kwargs)
+
+
+def test_job_runs_once_and_result_is_readable():
+    queue = _queue()
+    calls = []
+    pool = JobWorkerPool(queue, {"echo": lambda payload: calls.append(payload) or {"echo": payload["x"]}}, block_ms=10)
+
+    job = queue.submit("echo", {"x": 1})
+    assert queue.get(job["job_id"])["status"] == "queued"
+    assert queue.depth()["lag"] == 1
+
+    assert pool.run_once("w1")
+    assert not pool.run_once("w2")  # consumed exactly once
+    done = queue.get(job["job_id"])
+    assert done["status"] == "succeeded" and done["result"] == {"echo": 1}
+    assert done["attempts"] == 1 and done["finished_at"] >= done["started_at"]
+    assert calls == [{"x": 1}]
+    assert queue.depth() == {"pending": 0, "lag": 0}
+
+
+def test_handler_error_marks_job_failed():
+    queue = _queue()
+
+    def boom(payload):
+        raise RuntimeError("model timeout")
+
+    pool = JobWorkerPool(queue, {"gen": boom}, block_ms=10)
+    job = queue.submit("gen", {})
+    pool.run_once()
+    failed = queue.get(job["job_id"])
+    assert failed["status"] == "failed" and failed["error"] == "model timeout"
+
+
+def test_stuck_job_is_redelivered_then_given_up():
+    queue = _queue(visibility_timeout_seconds=0, max_attempts=2)
+    job = queue.submit("gen", {})
+
+    # Worker A claims the job and "dies" without finishing it.
+    _, claimed = queue.claim("worker-a", block_ms=10)
+    assert claimed["status"] == "running"
+
+    # Past the visibility timeout, worker B gets the same job.
+    entry_id, reclaimed = queue.claim("worker-b", block_ms=10)
+    assert reclaimed["job_id"] == job["job_id"] and reclaimed["attempts"] == 2
+
+    # B dies too: the third delivery exceeds max_attempts and fails the job.
+    assert queue.claim("worker-c", block_ms=10) is None
+    assert queue.get(job["job_id"])["status"] == "failed"
+
+
+def test_release_notes_job_endpoints(monkeypatch):
+    queue = _queue()
+    monkeypatch.setattr(api_main, "job_queue", queue)
+    client = TestClient(api_main.app)
+
+    payload = {"title": "Improve login error messages", "description": "Clarified wrong-password errors."}
+    submitted = client.post("/api/v1/release-notes/jobs", json=payload)
+    assert submitted.status_code == 202
+    job_id = submitted.json()["job_id"]
+    assert submitted.json()["status_url"] == f"/jobs/{job_id}"
+    assert client.get(f"/jobs/{job_id}").json()["status"] == "queued"
+
+    JobWorkerPool(queue, api_main.job_handlers, block_ms=10).run_once()
+
+    body = client.get(f"/jobs/{job_id}", params={"wait": 1}).json()
+    assert body["status"] == "succeeded"
+    assert "mock" in body["result"]["provider"] and body["result"]["release_note"]
+    assert client.get("/jobs/does-not-exist").status_code == 404
+
+
+def test_claim_block_stays_under_socket_timeout_and_idle_timeout_is_not_an_error():
+    client = fakeredis.FakeRedis(socket_timeout=0.5)
+    queue = JobQueue(client)
+    blocks = []
+    real_xreadgroup = client.xreadgroup
+
+    def spy(*args, **kwargs):
+        blocks.append(kwargs["block"])
+        return real_xreadgroup(*args, **kwargs)
+
+    client.xreadgroup = spy
+    assert queue.claim("w1", block_ms=1000) is None
+    assert blocks == [400]  # clamped below the 0.5s read timeout instead of tripping it
+
+    def timed_out(*args, **kwargs):
+        raise redis.exceptions.TimeoutError("Timeout reading from socket")
+
+    client.xreadgroup = timed_out
+    assert queue.claim("w1", block_ms=10) is None  # an idle poll, not a worker error
+
+
+def test_jobs_client_read_timeout_exceeds_claim_block():
+    from config.settings import Settings
+    from core.redis_pool import build_jobs_redis_client
+
+    settings = Settings(jobs_claim_block_ms=2000, redis_socket_timeout_seconds=0.5)
+    client = build_jobs_redis_client(settings)
+    assert client.connection_pool.connection_kwargs["socket_timeout"] == 2.5
+    assert JobQueue(client)._max_block_ms >= settings.jobs_claim_block_ms
@@ -1,12 +1,25 @@
 # tests/test_model_service.py
+import asyncio
+import time
+
+import pytest
 from fastapi.testclient import TestClient
 
+from config.settings import Settings
+from model_service.batcher import MicroBatcher
+from model_service.generator import StubGenerator, build_engine
+from model_service.prefix_cache import PrefixCache
 from model_service.main import app
 
 
 client = TestClient(app)
 
 
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
 def test_model_service_generate_mock_mode():
     """Model service /api/v1/generate should return text + model fields."""
     resp = client.post("/api/v1/generate", json={"prompt": "Summarize change"})
@@ -15,3 +28,110 @@ def test_model_service_generate_mock_mode():
     assert "text" in data
     assert "model" in data
     assert data["model"].startswith("oss")
+
+
+def test_model_service_generate_batch_keeps_order():
+    prompts = [f"Summarize change {i}" for i in range(20)]
+    resp = client.post("/api/v1/generate/batch", json={"prompts": prompts})
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert len(results) == 20
+    assert all(p in r["text"] for p, r in zip(prompts, results))
+
+    assert client.post("/api/v1/generate/batch", json={"prompts": []}).status_code == 422
+
+
+@pytest.mark.anyio
+async def test_micro_batcher_groups_concurrent_requests_and_scatters_results():
+    generator = StubGenerator(use_mock=True)
+    batch_sizes = []
+
+    def run_batch(prompts):
+        batch_sizes.append(len(prompts))
+        return generator.generate_batch(prompts)
+
+    batcher = MicroBatcher(run_batch, max_batch_size=4, max_wait_ms=50)
+    prompts = [f"p{i}" for i in range(10)]
+    results = await asyncio.gather(*(batcher.submit(p) for p in prompts))
+
+    assert [r.text for r in results] == [f"[oss-mock] Response for prompt: {p}" for p in prompts]
+    assert batch_sizes == [4, 4, 2]  # two full flushes + one on the timer
+    assert batcher.mean_batch_size == pytest.approx(10 / 3)
+
+
+@pytest.mark.anyio
+async def test_micro_batcher_failure_reaches_every_caller_in_the_batch():
+    def run_batch(prompts):
+        raise RuntimeError("model crashed")
+
+    batcher = MicroBatcher(run_batch, max_batch_size=8, max_wait_ms=1)
+    results = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_health_reports_engine_stats():
+    client.post("/api/v1/generate", json={"prompt": "Summarize change"})
+    engine = client.get("/health").json()["engine"]
+    assert engine["engine"] == "stub"
+    assert engine["tokens_generated"] > 0
+    assert engine["batches"] >= 1
+    assert engine["rss_bytes"] > 0
+    assert {"load_seconds", "tokens_per_second", "model_bytes"} <= engine.keys()
+
+
+def test_build_engine_validates_selection():
+    assert isinstance(build_engine(Settings()), StubGenerator)
+    with pytest.raises(ValueError):
+        build_engine(Settings(model_service_engine="tensorrt"))
+    # Without the [local-llm] extra or a model file, llama_cpp fails at startup with a clear error.
+    with pytest.raises(ValueError):
+        build_engine(Settings(model_service_engine="llama_cpp", model_service_model_path="/nonexistent.gguf"))
+
+
+PREAMBLE = "You are an assistant that writes release notes.\n\nPlease produce a short note.\n\n"
+
+
+def test_prefix_cache_admits_common_prefixes_and_evicts_lru_by_bytes():
+    cache = PrefixCache(max_bytes=100, admit_after=2)
+    prompt = PREAMBLE + "Title: A"
+    assert cache.candidates(prompt) == [PREAMBLE, "You are an assistant that writes release notes.\n\n"]
+
+    assert cache.lookup(prompt) is None and cache.admit(prompt) is None  # first sighting
+    assert cache.admit(PREAMBLE + "Title: B") == PREAMBLE  # second sighting: longest prefix admitted
+    cache.put(PREAMBLE, "state-1", nbytes=60, prefill_seconds=0.5)
+    assert cache.lookup(PREAMBLE + "Title: C").prefix == PREAMBLE
+
+    cache.put("Other preamble for greetings.\n\n", "state-2", nbytes=60, prefill_seconds=0.1)
+    assert cache.lookup(PREAMBLE + "Title: D") is None  # evicted: 60 + 60 > 100
+    stats = cache.stats()
+    assert stats["entries"] == 1 and stats["bytes"] == 60 and stats["evictions"] == 1
+    assert stats["hits"] == 1 and stats["prefill_seconds_saved"] == 0.5
+    assert not cache.put("huge\n\n", "state", nbytes=101, prefill_seconds=0.0)
+
+
+def test_stub_engine_skips_prefill_of_cached_prefix():
+    engine = StubGenerator(use_mock=True, prefill_ms_per_kchar=200.0)
+    engine.prefix_cache = PrefixCache(admit_after=1)
+    long_preamble = PREAMBLE * 10  # ~0.9k chars -> ~180 ms simulated prefill
+
+    engine.generate(long_preamble + "Title: A")  # admitted + prefilled
+    started = time.perf_counter()
+    result = engine.generate(long_preamble + "Title: B")
+    assert time.perf_counter() - started < 0.1  # only the suffix is prefilled
+    assert result.model == "oss-mock"
+
+    stats = engine.stats()["prefix_cache"]
+    assert stats["hits"] == 1 and stats["hit_ratio"] == 0.5
+    assert stats["prefill_seconds_saved"] > 0.1
+
+
+def test_stub_engine_adds_sampled_latency():
+    samples = iter([30.0, 0.0])
+    engine = StubGenerator(use_mock=True, latency_ms=lambda: next(samples))
+
+    started = time.perf_counter()
+    engine.generate("Title: A")
+    assert time.perf_counter() - started >= 0.03
+    started = time.perf_counter()
+    engine.generate("Title: B")
+    assert time.perf_counter() - started < 0.03
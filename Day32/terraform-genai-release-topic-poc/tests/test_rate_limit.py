@@ -0,0 +1,114 @@
+# tests/test_rate_limit.py
+import fakeredis
+from fastapi.testclient import TestClient
+
+import app.main as api_main
+from core.rate_limit import ANONYMOUS_CLIENT, RateLimit, TokenBucketLimiter, estimate_cost, resolve_client_id
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(server, clock, **limits) -> TokenBucketLimiter:
+    # fakeredis without lupa has no Lua: this exercises the WATCH/MULTI path.
+    return TokenBucketLimiter(
+        fakeredis.FakeRedis(server=server),
+        limits={name: RateLimit(capacity=c, refill_per_second=r) for name, (c, r) in limits.items()},
+        clock=clock,
+    )
+
+
+def test_bucket_allows_burst_then_rejects_and_refills():
+    clock = FakeClock()
+    limiter = _limiter(fakeredis.FakeServer(), clock, greeting=(3, 1.0))
+
+    results = [limiter.acquire("greeting", "key:a") for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert results[2].headers()["RateLimit-Remaining"] == "0"
+    denied = results[3].headers()
+    assert denied["RateLimit-Limit"] == "3" and denied["Retry-After"] == "1"
+
+    clock.now += 1.0
+    assert limiter.acquire("greeting", "key:a").allowed
+    # Other clients and endpoints have their own buckets; unknown endpoints are unlimited.
+    assert limiter.acquire("greeting", "key:b").allowed
+    assert limiter.acquire("jobs", "key:a") is None
+
+
+def test_local_precheck_rejects_without_redis_and_buckets_are_shared_across_pods():
+    clock, server = FakeClock(), fakeredis.FakeServer()
+    pod_a = _limiter(server, clock, greeting=(2, 0.5))
+    pod_b = _limiter(server, clock, greeting=(2, 0.5))
+
+    assert pod_a.acquire("greeting", "key:a").allowed
+    assert pod_b.acquire("greeting", "key:a").allowed
+    assert not pod_a.acquire("greeting", "key:a").allowed  # pod_b took the second token
+
+    calls = pod_a.stats()["redis_calls"]
+    assert not pod_a.acquire("greeting", "key:a").allowed
+    assert pod_a.stats()["redis_calls"] == calls and pod_a.stats()["local_rejections"] == 1
+
+    clock.now += 2.0  # one token refilled: the pre-check defers to Redis again
+    assert pod_a.acquire("greeting", "key:a").allowed
+
+
+def test_cost_weighting_by_description_length():
+    assert estimate_cost("short change", tokens_per_unit=500) == 1.0
+    assert estimate_cost("x" * 4 * 1000, tokens_per_unit=500) == 3.0
+    assert estimate_cost("x" * 10000, tokens_per_unit=0) == 1.0
+
+    limiter = _limiter(fakeredis.FakeServer(), FakeClock(), **{"release-notes": (4, 0.1)})
+    assert limiter.acquire("release-notes", "key:a", cost=3).allowed
+    assert not limiter.acquire("release-notes", "key:a", cost=3).allowed
+    assert limiter.acquire("release-notes", "key:a", cost=1).allowed
+    # A request costing more than the burst still runs on a full bucket.
+    assert limiter.acquire("release-notes", "key:b", cost=50).allowed
+
+
+def test_api_returns_rate_limit_headers_and_429(monkeypatch):
+    limiter = _limiter(fakeredis.FakeServer(), FakeClock(), greeting=(2, 0.01), **{"release-notes": (2, 0.01)})
+    monkeypatch.setattr(api_main, "rate_limiter", limiter)
+    monkeypatch.setattr(api_main.settings, "rate_limit_api_keys", ["k1", "k2"])
+    client = TestClient(api_main.app)
+    greeting = {"name": "Asha", "date_of_birth": "1990-05-17"}
+
+    first = client.post("/api/v1/greeting/generate", json=greeting, headers={"X-API-Key": "k1"})
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == "2" and first.headers["RateLimit-Remaining"] == "1"
+    assert client.post("/api/v1/greeting/generate", json=greeting, headers={"X-API-Key": "k1"}).status_code == 200
+    limited = client.post("/api/v1/greeting/generate", json=greeting, headers={"X-API-Key": "k1"})
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) >= 1 and limited.headers["RateLimit-Remaining"] == "0"
+    assert client.post("/api/v1/greeting/generate", json=greeting, headers={"X-API-Key": "k2"}).status_code == 200
+    # Made-up keys do not get fresh buckets: they all share one.
+    assert client.post("/api/v1/greeting/generate", json=greeting, headers={"X-API-Key": "x1"}).status_code == 200
+    assert client.post("/api/v1/greeting/generate", json=greeting, headers={"X-API-Key": "x2"}).status_code == 200
+    assert client.post("/api/v1/greeting/generate", json=greeting, headers={"X-API-Key": "x3"}).status_code == 429
+
+    stream = client.post("/api/v1/release-notes/generate/stream", json={"title": "t", "description": "d"})
+    assert stream.status_code == 200 and stream.headers["RateLimit-Remaining"] == "1"
+
+    # A long description costs the whole release-notes burst.
+    note = {"title": "Big change", "description": "x" * 4 * 600}
+    assert client.post("/api/v1/release-notes/generate", json=note, headers={"X-API-Key": "k1"}).status_code == 200
+    assert client.post("/api/v1/release-notes/generate", json=note, headers={"X-API-Key": "k1"}).status_code == 429
+
+
+def test_client_identity_ignores_unknown_keys_and_untrusted_forwarded_hops():
+    keys = ["ui-key", "partner-key"]
+    assert resolve_client_id("ui-key", "10.0.0.9", None, keys) == "key:ui-key"
+    assert resolve_client_id("rotated-123", "10.0.0.9", None, keys) == ANONYMOUS_CLIENT
+    assert resolve_client_id("rotated-456", "10.0.0.7", None, keys) == ANONYMOUS_CLIENT
+
+    # Behind one proxy (the ALB) the client is the last X-Forwarded-For entry; a spoofed prefix is ignored.
+    xff = "6.6.6.6, 203.0.113.7"
+    assert resolve_client_id(None, "10.0.0.2", xff, keys, trusted_proxy_hops=1) == "ip:203.0.113.7"
+    assert resolve_client_id(None, "10.0.0.2", xff, keys, trusted_proxy_hops=2) == "ip:6.6.6.6"
+    # Without trusted hops (or with a short header) the header is not believed.
+    assert resolve_client_id(None, "10.0.0.2", xff, keys) == "ip:10.0.0.2"
+    assert resolve_client_id(None, "10.0.0.2", "203.0.113.7", keys, trusted_proxy_hops=2) == "ip:10.0.0.2"
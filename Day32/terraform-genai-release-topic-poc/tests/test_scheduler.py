@@ -0,0 +1,111 @@
+# tests/test_scheduler.py
+import asyncio
+import threading
+
+import pytest
+
+from core.scheduler import DeadlineExceeded, LLMScheduler, PriorityClass
+
+
+def _scheduler(**kwargs) -> LLMScheduler:
+    return LLMScheduler(
+        classes=[
+            PriorityClass("greeting", priority=0, deadline_seconds=5.0, cost=1.0),
+            PriorityClass("release-notes", priority=1, deadline_seconds=5.0, cost=4.0),
+        ],
+        max_concurrency=1,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+async def _run_queued(scheduler, calls):
+    """Hold the only slot, queue `calls` (workload, tenant) in order, then return the grant order."""
+    order = []
+    gate = asyncio.Event()
+
+    async def call(workload, tenant, label):
+        async with scheduler.aslot(workload, tenant):
+            order.append(label)
+
+    async def holder():
+        async with scheduler.aslot("greeting"):
+            await gate.wait()
+
+    tasks = [asyncio.create_task(holder())]
+    await asyncio.sleep(0)
+    for i, (workload, tenant) in enumerate(calls):
+        tasks.append(asyncio.create_task(call(workload, tenant, f"{workload}:{tenant}:{i}")))
+        await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(*tasks)
+    return order
+
+
+@pytest.mark.anyio
+async def test_greetings_jump_ahead_of_queued_release_notes():
+    order = await _run_queued(_scheduler(), [("release-notes", "t")] * 3 + [("greeting", "t")])
+    assert order[0] == "greeting:t:3"
+
+
+@pytest.mark.anyio
+async def test_fair_queueing_interleaves_tenants_by_weight():
+    scheduler = _scheduler(tenant_weights={"bulk": 1, "small": 1})
+    burst = [("release-notes", "bulk")] * 6 + [("release-notes", "small")] * 2
+    order = [label.split(":")[1] for label in await _run_queued(scheduler, burst)]
+    # "small" arrived after a 6-call burst but is not stuck behind all of it.
+    assert order.index("small") <= 1 and order[:4].count("small") == 2
+
+    weighted = [("greeting", "gold")] * 6 + [("greeting", "basic")] * 2
+    scheduler = _scheduler(tenant_weights={"gold": 3, "basic": 1})
+    order = [label.split(":")[1] for label in await _run_queued(scheduler, weighted)]
+    assert order[:4].count("gold") == 3  # weight 3: three gold calls per basic call
+
+
+def test_waiting_past_deadline_drops_the_call():
+    scheduler = LLMScheduler(
+        classes=[PriorityClass("greeting", priority=0, deadline_seconds=0.05)],
+        max_concurrency=1,
+    )
+    release = threading.Event()
+
+    def hold():
+        with scheduler.slot("greeting"):
+            release.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    try:
+        with pytest.raises(DeadlineExceeded):
+            with scheduler.slot("greeting"):
+                pass
+    finally:
+        release.set()
+        holder.join()
+
+    stats = scheduler.stats()
+    assert stats["classes"]["greeting"]["dropped"] == 1
+    assert stats["classes"]["greeting"]["granted"] == 1
+    assert stats["in_flight"] == 0
+
+    with scheduler.slot("greeting"):  # capacity is back
+        assert scheduler.stats()["in_flight"] == 1
+    with pytest.raises(ValueError):
+        with scheduler.slot("unknown"):
+            pass
+
+
+@pytest.mark.anyio
+async def test_unknown_tenants_share_default_and_idle_tenants_are_forgotten():
+    scheduler = _scheduler(tenant_weights={"gold": 3})
+    calls = [("release-notes", f"rotating-{i}") for i in range(50)] + [("release-notes", "gold")]
+    await _run_queued(scheduler, calls)
+
+    queue = scheduler._classes["release-notes"]
+    # Fifty made-up tenant ids did not get fifty fair-queueing slots (or fifty entries).
+    assert set(queue.last_finish) <= {"default", "gold"}
+    assert all(finish > queue.virtual_time for finish in queue.last_finish.values())
@@ -0,0 +1,73 @@
+# tests/test_semantic_cache.py
+import pytest
+
+from core.models import ReleaseNoteRequest
+from core.semantic_cache import MinHasher, SemanticIndex, normalize_key_text, normalize_text
+
+DESCRIPTION = (
+    "Upgrade the production RDS instance class from db.t3.small to db.t3.medium "
+    "to handle higher connection counts during the nightly reporting jobs."
+)
+
+
+@pytest.fixture
+def semantic_service(cache, llm, make_release_service):
+    llm.text = "Note {n}.\n- Scenario"
+    return make_release_service(semantic_index=SemanticIndex(cache=cache, threshold=0.8))
+
+
+def test_normalization_ignores_case_whitespace_and_sentence_punctuation():
+    assert normalize_text("Upgrade  RDS to t3.small!") == normalize_text("upgrade rds to t3.small")
+    assert normalize_text("t3.small") != normalize_text("t3.medium")
+
+
+def test_exact_key_normalization_keeps_meaningful_punctuation(llm, make_release_service):
+    pairs = [("+10%", "-10%"), ("x > 5", "x < 5"), ("C++", "C"), ("timeout -1", "timeout 1"), ("$HOME", "HOME")]
+    for a, b in pairs:
+        assert normalize_key_text(f"Set {a} in config") != normalize_key_text(f"Set {b} in config"), (a, b)
+    assert normalize_key_text("  Upgrade RDS\tto t3.small!! ") == normalize_key_text("upgrade rds to t3.small")
+
+    service = make_release_service()
+    service.generate_release_notes(ReleaseNoteRequest(title="Scale", description="Raise the pool size by +10%."))
+    other = service.generate_release_notes(ReleaseNoteRequest(title="Scale", description="Raise the pool size by -10%."))
+    assert not other.cached and llm.calls == 2
+
+
+def test_trivial_edits_hit_the_exact_cache_key(llm, make_release_service):
+    service = make_release_service()
+    service.generate_release_notes(ReleaseNoteRequest(title="Bump RDS", description=DESCRIPTION))
+    hit = service.generate_release_notes(
+        ReleaseNoteRequest(title="bump rds", description="  " + DESCRIPTION.upper().rstrip(".") + "!! ")
+    )
+    assert hit.cached and hit.similarity is None
+    assert llm.calls == 1
+
+
+def test_near_duplicate_is_served_with_similarity_score(semantic_service, llm):
+    service = semantic_service
+    service.generate_release_notes(ReleaseNoteRequest(title="Bump RDS", description=DESCRIPTION))
+
+    reworded = DESCRIPTION.replace("nightly reporting jobs", "nightly report jobs")
+    hit = service.generate_release_notes(ReleaseNoteRequest(title="Bump RDS", description=reworded))
+    assert hit.cached and hit.release_note == "Note 1."
+    assert 0.8 <= hit.similarity < 1.0
+    assert llm.calls == 1
+
+    different = service.generate_release_notes(
+        ReleaseNoteRequest(title="Rotate IAM keys", description="Rotate the CI deploy user's IAM access keys.")
+    )
+    assert not different.cached
+    # Same text but another impact area never matches.
+    scoped = service.generate_release_notes(
+        ReleaseNoteRequest(title="Bump RDS", description=reworded, impact_area="billing")
+    )
+    assert not scoped.cached
+    assert llm.calls == 3
+
+
+def test_minhash_similarity_tracks_jaccard():
+    hasher = MinHasher(num_perm=128)
+    a = hasher.signature(normalize_text(DESCRIPTION))
+    assert MinHasher.similarity(a, a) == 1.0
+    assert MinHasher.similarity(a, hasher.signature("rotate iam access keys for ci")) < 0.2
+    assert MinHasher.unpack(MinHasher.pack(a)) == a
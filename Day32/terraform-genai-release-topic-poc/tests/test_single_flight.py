@@ -0,0 +1,92 @@
+# tests/test_single_flight.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis.aioredis
+import pytest
+
+from config.settings import Settings
+from core.models import ReleaseNoteRequest
+from core.services import AsyncRedisCache
+from core.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_misses_make_one_llm_call(cache, llm, make_release_service):
+    """20 identical requests at once -> exactly one LLM call, same answer for all."""
+    llm.delay = 0.2  # long enough for the misses to overlap
+    service = make_release_service(
+        single_flight=SingleFlight(cache=cache, poll_interval_seconds=0.01),
+    )
+    request = ReleaseNoteRequest(title="Bump RDS", description="Upgrade RDS instance class to db.t3.small.")
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        responses = list(pool.map(lambda _: service.generate_release_notes(request), range(20)))
+
+    assert llm.calls == 1
+    assert {r.release_note for r in responses} == {"Note."}
+
+
+def test_follower_pod_waits_for_leader_pod_result(make_cache):
+    """Pod B does not compute while pod A holds the lock; it picks up A's cached value."""
+    pod_a, pod_b = make_cache(), make_cache()
+    release_leader = threading.Event()
+    computed = []
+
+    def leader_compute():
+        release_leader.wait(2)
+        computed.append("a")
+        pod_a.set_json("k", {"v": "from-a"}, ttl_seconds=60)
+        return {"v": "from-a"}
+
+    def follower_compute():
+        computed.append("b")
+        return {"v": "from-b"}
+
+    flight_a = SingleFlight(cache=pod_a, poll_interval_seconds=0.01)
+    flight_b = SingleFlight(cache=pod_b, poll_interval_seconds=0.01)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight_a.do, "k", leader_compute, lambda: pod_a.get_json("k"))
+        time.sleep(0.05)  # let A take the lock first
+        follower = pool.submit(flight_b.do, "k", follower_compute, lambda: pod_b.get_json("k"))
+        time.sleep(0.05)
+        release_leader.set()
+        assert follower.result(2) == {"v": "from-a"}
+        assert leader.result(2) == {"v": "from-a"}
+
+    assert computed == ["a"]
+    assert not pod_a.lock_exists("k:lock")
+
+
+def test_takes_over_when_leader_lease_expires(cache):
+    """A lock left behind by a dead pod expires and the waiter computes itself."""
+    assert cache.acquire_lock("k:lock", "dead-pod", ttl_ms=100)
+
+    flight = SingleFlight(cache=cache, wait_timeout_seconds=2.0, poll_interval_seconds=0.01)
+    started = time.monotonic()
+    assert flight.do("k", lambda: "fresh", lambda: None) == "fresh"
+    assert 0.05 < time.monotonic() - started < 1.5
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_async_path_coalesces_concurrent_misses(redis_server, llm, make_release_service):
+    """Async endpoints: 20 concurrent identical requests -> one awaited LLM call."""
+    async_cache = AsyncRedisCache(settings=Settings(), client=fakeredis.aioredis.FakeRedis(server=redis_server))
+    llm.delay = 0.1
+    service = make_release_service(
+        async_cache=async_cache,
+        async_single_flight=AsyncSingleFlight(cache=async_cache, poll_interval_seconds=0.01),
+    )
+    request = ReleaseNoteRequest(title="Bump RDS", description="Upgrade RDS instance class to db.t3.small.")
+
+    responses = await asyncio.gather(*(service.agenerate_release_notes(request) for _ in range(20)))
+
+    assert llm.calls == 1
+    assert {r.release_note for r in responses} == {"Note."}
+    assert (await service.agenerate_release_notes(request)).cached
@@ -0,0 +1,103 @@
+# tests/test_streaming.py
+import anyio
+import fakeredis
+import fakeredis.aioredis
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from config.settings import Settings
+from core.llm_client import LLMClient
+from core.models import ModelProvider, ReleaseNoteRequest
+from core.services import AsyncRedisCache, RedisCache, ReleaseNotesService
+from core.sse import aiter_sse
+from app.main import app as api_app
+from model_service.main import app as model_app
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+async def _lines(text):
+    for line in text.splitlines():
+        yield line
+
+
+def _llm_client_for_model_service() -> LLMClient:
+    # Real SSE round trip against the model_service app, in-process.
+    transport = httpx.ASGITransport(app=model_app)
+    return LLMClient(
+        Settings(),
+        async_http_client=httpx.AsyncClient(transport=transport, base_url="http://model-service"),
+    )
+
+
+def test_model_service_stream_matches_non_streamed_text():
+    client = TestClient(model_app)
+    prompt = "Summarize change: bump RDS"
+    full = client.post("/api/v1/generate", json={"prompt": prompt}).json()
+
+    resp = client.post("/api/v1/generate/stream", json={"prompt": prompt})
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = [e for e in resp.text.split("\n\n") if e]
+    assert len(events) > 2 and events[-1].startswith("event: done")
+
+    async def parse():
+        return [item async for item in aiter_sse(_lines(resp.text))]
+
+    parsed = anyio.run(parse)
+    assert "".join(d["text"] for e, d in parsed if e == "token") == full["text"]
+    assert parsed[-1] == ("done", {"model": full["model"], "tokens": len(parsed) - 1})
+
+
+@pytest.mark.anyio
+async def test_llm_client_streams_oss_deltas_then_result():
+    llm = _llm_client_for_model_service()
+    chunks = [c async for c in llm.astream_text("Summarize change", provider=ModelProvider.OSS)]
+    await llm.aclose()
+
+    deltas = [c.delta for c in chunks[:-1]]
+    assert len(deltas) > 1
+    final = chunks[-1].result
+    assert final.provider == "oss" and final.model == "oss-mock"
+    assert final.text == "".join(deltas)
+    assert chunks[-1].complete
+
+
+@pytest.mark.anyio
+async def test_streamed_release_notes_are_cached_as_final_result():
+    server = fakeredis.FakeServer()
+    service = ReleaseNotesService(
+        settings=Settings(),
+        llm_client=_llm_client_for_model_service(),
+        cache=RedisCache(settings=Settings(), client=fakeredis.FakeRedis(server=server)),
+        async_cache=AsyncRedisCache(settings=Settings(), client=fakeredis.aioredis.FakeRedis(server=server)),
+    )
+    request = ReleaseNoteRequest(title="Bump RDS", description="Upgrade RDS instance class.")
+
+    events = [e async for e in service.astream_release_notes(request, provider=ModelProvider.OSS)]
+    assert [name for name, _ in events[:-1]] == ["delta"] * (len(events) - 1)
+    name, result = events[-1]
+    assert name == "result" and result["provider"] == "oss" and not result["cached"]
+    assert "".join(d["text"] for _, d in events[:-1]).startswith(result["release_note"][:20])
+
+    again = [e async for e in service.astream_release_notes(request, provider=ModelProvider.OSS)]
+    assert len(again) == 1 and again[0][1]["cached"] is True
+    assert again[0][1]["release_note"] == result["release_note"]
+
+
+def test_release_notes_stream_endpoint_ends_with_result_event():
+    payload = {"title": "Improve login error messages", "description": "Clarified wrong-password errors."}
+    resp = TestClient(api_app).post("/api/v1/release-notes/generate/stream", json=payload)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+
+    async def parse():
+        return [item async for item in aiter_sse(_lines(resp.text))]
+
+    events = anyio.run(parse)
+    name, result = events[-1]
+    assert name == "result"
+    assert "mock" in result["provider"] and "release_note" in result
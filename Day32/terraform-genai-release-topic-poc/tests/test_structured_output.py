@@ -0,0 +1,117 @@
+# tests/test_structured_output.py
+import json
+
+import fakeredis
+import fakeredis.aioredis
+import httpx
+import pytest
+
+import model_service.main as model_main
+from config.settings import Settings
+from core.llm_client import LLMClient
+from core.models import ModelProvider, ReleaseNoteRequest
+from core.services import AsyncRedisCache, RedisCache, ReleaseNotesService
+from core.structured import RELEASE_NOTE_SCHEMA, FieldEvent, StreamingJSONParser, parse_structured
+from model_service.generator import StubGenerator
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+ANSWER = {
+    "release_note": 'Login errors now say "wrong password" {clearly}.',
+    "test_scenarios": ["Enter a wrong password", "Lock after 5 tries, then \\ unlock"],
+}
+
+
+def test_streaming_parser_emits_each_field_and_item_once_complete():
+    text = "```json\n" + json.dumps(ANSWER, indent=1) + "\n```"
+    parser = StreamingJSONParser()
+    events, emitted_at = [], []
+    for i, ch in enumerate(text):  # one character per chunk: worst case for state tracking
+        for event in parser.feed(ch):
+            events.append(event)
+            emitted_at.append(i)
+
+    assert events == [
+        FieldEvent("release_note", ANSWER["release_note"]),
+        FieldEvent("test_scenarios", "Enter a wrong password", 0),
+        FieldEvent("test_scenarios", ANSWER["test_scenarios"][1], 1),
+        FieldEvent("test_scenarios", ANSWER["test_scenarios"]),
+    ]
+    # The release note is available long before the document is complete.
+    assert emitted_at[0] < text.index("test_scenarios")
+    assert parser.done
+
+
+def test_streaming_parser_handles_numbers_and_nested_values():
+    parser = StreamingJSONParser()
+    events = parser.feed('{"n": 12, "ok": true, "meta": {"a": [1, 2]}, "xs": [3, {"b": 4}]')
+    events += parser.feed("}")
+    assert events == [
+        FieldEvent("n", 12),
+        FieldEvent("ok", True),
+        FieldEvent("meta", {"a": [1, 2]}),
+        FieldEvent("xs", 3, 0),
+        FieldEvent("xs", {"b": 4}, 1),
+        FieldEvent("xs", [3, {"b": 4}]),
+    ]
+
+
+def test_parse_structured_validates_against_schema():
+    assert parse_structured(json.dumps(ANSWER), RELEASE_NOTE_SCHEMA) == ANSWER
+    assert parse_structured("```json\n" + json.dumps(ANSWER) + "\n```", RELEASE_NOTE_SCHEMA) == ANSWER
+    assert parse_structured('{"release_note": "x"}', RELEASE_NOTE_SCHEMA) is None
+    assert parse_structured('{"release_note": "x", "test_scenarios": []}', RELEASE_NOTE_SCHEMA) is None
+    assert parse_structured("Plain text note\n- scenario", RELEASE_NOTE_SCHEMA) is None
+
+
+def test_release_note_parsing_prefers_json_and_falls_back_to_heuristics(llm, make_release_service):
+    service = make_release_service()
+    llm.text = json.dumps(ANSWER)
+    structured = service.generate_release_notes(ReleaseNoteRequest(title="Login", description="Clearer errors."))
+    assert (structured.release_note, structured.test_scenarios) == (ANSWER["release_note"], ANSWER["test_scenarios"])
+
+    llm.provider, llm.model, llm.text = "oss", "oss-mini", "Faster logins.\n- Log in twice"
+    plain = service.generate_release_notes(ReleaseNoteRequest(title="Login", description="Faster logins."))
+    assert (plain.release_note, plain.test_scenarios) == ("Faster logins.", ["Log in twice"])
+
+
+def test_openai_request_asks_for_schema_constrained_output():
+    request = LLMClient._openai_request("p", "gpt-4o-mini", RELEASE_NOTE_SCHEMA)
+    assert request["response_format"]["type"] == "json_schema"
+    assert request["response_format"]["json_schema"]["schema"] == RELEASE_NOTE_SCHEMA
+    assert request["response_format"]["json_schema"]["strict"] is True
+    assert "response_format" not in LLMClient._openai_request("p", "gpt-4o-mini")
+
+
+@pytest.mark.anyio
+async def test_streamed_release_notes_emit_field_events(monkeypatch):
+    # Non-mock stub engine: answers with JSON shaped by the schema it is sent.
+    monkeypatch.setattr(model_main, "engine", StubGenerator(use_mock=False))
+    llm = LLMClient(
+        Settings(),
+        async_http_client=httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=model_main.app), base_url="http://model-service"
+        ),
+    )
+    server = fakeredis.FakeServer()
+    service = ReleaseNotesService(
+        settings=Settings(),
+        llm_client=llm,
+        cache=RedisCache(settings=Settings(), client=fakeredis.FakeRedis(server=server)),
+        async_cache=AsyncRedisCache(settings=Settings(), client=fakeredis.aioredis.FakeRedis(server=server)),
+    )
+    request = ReleaseNoteRequest(title="Bump RDS", description="Upgrade RDS instance class.")
+
+    events = [e async for e in service.astream_release_notes(request, provider=ModelProvider.OSS)]
+    fields = [data for name, data in events if name == "field"]
+    name, result = events[-1]
+    assert name == "result"
+    assert fields[0] == {"name": "release_note", "value": result["release_note"], "index": None}
+    items = [f["value"] for f in fields if f["name"] == "test_scenarios" and f["index"] is not None]
+    assert items == result["test_scenarios"] and len(items) >= 1
+    # Field events arrive before the stream is over.
+    assert [n for n, _ in events].index("field") < len(events) - 1